@@ -2,118 +2,145 @@ import collections
 import random
 import time
 
+from event_trace import STEP, SUMMARY, EventType, tracer
+from message_bus import MessageBus
+
+# Agent.move() statuses, returned with the display text
+EXPLORING, FOUND, RECEIVED, DONE, IDLE = 'exploring', 'found', 'received', 'done', 'idle'
+
 class Agent:
-    def __init__(self, agent_id, start_pos, grid_size):
+    def __init__(self, agent_id, start_pos, grid_size, bus, expand_per_turn=1):
         self.agent_id = agent_id
         self.pos = start_pos
         self.grid_size = grid_size
+        self.bus = bus
+        self.expand_per_turn = expand_per_turn
         self.visited = set()
         self.visited.add(start_pos)
         self.queue = collections.deque([start_pos])
         self.found_treasure = False
         self.path_to_treasure = []
+        bus.register(agent_id)
 
-    def move(self, grid, messages):
-        if not self.queue and not self.found_treasure:
-            return "IDLE"
-
-        # Process messages
-        for msg in messages:
+    def move(self, grid):
+        # Returns (status, display text). Every message delivered since our
+        # last turn is processed before acting on any of them.
+        received = False
+        for msg in self.bus.drain(self.agent_id):
             if msg['type'] == 'TREASURE_FOUND':
+                received = True
                 self.found_treasure = True
                 self.path_to_treasure = msg['path']
-                return f"Agent {self.agent_id}: Received treasure location!"
             elif msg['type'] == 'VISITED':
-                self.visited.add(msg['pos'])
+                self.visited.update(map(tuple, msg['positions']))
+        if received:
+            return RECEIVED, f"Agent {self.agent_id}: Received treasure location!"
 
         if self.found_treasure:
-            return "DONE"
+            return DONE, "DONE"
 
-        # BFS Step
-        if self.queue:
+        # BFS Steps: expand up to expand_per_turn cells, then broadcast all
+        # discoveries in one batched send
+        batch = []
+        expanded = 0
+        while self.queue and expanded < self.expand_per_turn:
             current_pos = self.queue.popleft()
             r, c = current_pos
             
             # Check if treasure
             if grid[r][c] == 'T':
                 self.found_treasure = True
-                return {
+                self.path_to_treasure = [current_pos] # Simplified path for this demo
+                batch.append({
                     'type': 'TREASURE_FOUND',
                     'agent_id': self.agent_id,
-                    'path': [current_pos], # Simplified path for this demo
+                    'path': self.path_to_treasure,
                     'pos': current_pos
-                }
+                })
+                self.bus.send_batch(self.agent_id, batch)
+                return FOUND, f"Agent {self.agent_id} FOUND TREASURE at {current_pos}"
 
             # Explore neighbors
             neighbors = [
                 (r+1, c), (r-1, c), (r, c+1), (r, c-1)
             ]
             
+            discovered = []
             for nr, nc in neighbors:
                 if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
                     if (nr, nc) not in self.visited and grid[nr][nc] != '#':
                         self.visited.add((nr, nc))
                         self.queue.append((nr, nc))
-                        # Broadcast visited to avoid redundant exploration
-                        return {
-                            'type': 'VISITED',
-                            'agent_id': self.agent_id,
-                            'pos': (nr, nc)
-                        }
+                        discovered.append((nr, nc))
+
+            # Broadcast visited to avoid redundant exploration
+            if discovered:
+                batch.append({
+                    'type': 'VISITED',
+                    'agent_id': self.agent_id,
+                    'positions': discovered
+                })
             
             self.pos = current_pos # Teleport for BFS visualization simplicity
-            return f"Agent {self.agent_id} exploring {current_pos}"
+            expanded += 1
+
+        if batch:
+            self.bus.send_batch(self.agent_id, batch)
+        if expanded:
+            cells = sum(len(msg['positions']) for msg in batch)
+            return EXPLORING, f"Agent {self.agent_id} exploring {self.pos} (+{cells} cells)"
 
-        return "IDLE"
+        return IDLE, "IDLE"
 
-def run_maze_simulation():
-    GRID_SIZE = 10
+BFS_TREASURE = EventType('bfs_maze.treasure', "Treasure at: {pos}", SUMMARY)
+BFS_STEP = EventType('bfs_maze.step', "--- Step {step} ---", STEP)
+BFS_AGENT = EventType('bfs_maze.agent', "{status}")
+BFS_FOUND = EventType('bfs_maze.found', "*** TREASURE FOUND BY AGENT {agent} ***", SUMMARY)
+BFS_BUS = EventType('bfs_maze.bus', "Bus: {sent} msgs in {envelopes} envelopes, {bytes} bytes, {in_flight} in flight",
+                    STEP)
+
+def run_maze_simulation(grid_size=10, num_agents=2, latency=1, expand_per_turn=1, max_steps=100):
+    GRID_SIZE = grid_size
     grid = [['.' for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
     
     # Place obstacles
-    for _ in range(15):
+    for _ in range(15 * GRID_SIZE * GRID_SIZE // 100):
         r, c = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
         grid[r][c] = '#'
         
     # Place treasure
     tr, tc = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
     grid[tr][tc] = 'T'
-    print(f"Treasure at: {(tr, tc)}")
+    tracer.emit(BFS_TREASURE, (tr, tc))
 
-    agents = [
-        Agent(1, (0, 0), GRID_SIZE),
-        Agent(2, (GRID_SIZE-1, GRID_SIZE-1), GRID_SIZE)
-    ]
+    # Agents start spread over the four corners; broadcasts arrive `latency` steps later
+    # Envelope sizes are only measured when the bus stats are traced
+    bus = MessageBus(latency=latency, count_bytes=tracer.enabled(BFS_BUS.level))
+    corners = [(0, 0), (GRID_SIZE-1, GRID_SIZE-1), (0, GRID_SIZE-1), (GRID_SIZE-1, 0)]
+    agents = [Agent(i + 1, corners[i % 4], GRID_SIZE, bus, expand_per_turn) for i in range(num_agents)]
 
     step = 0
-    while step < 100:
-        print(f"--- Step {step} ---")
-        messages = []
+    while step < max_steps:
+        tracer.emit(BFS_STEP, step)
         all_done = True
         
         for agent in agents:
-            result = agent.move(grid, messages)
-            
-            if isinstance(result, dict):
-                messages.append(result)
-                print(f"Agent {agent.agent_id} broadcast: {result['type']} at {result.get('pos')}")
-                if result['type'] == 'TREASURE_FOUND':
-                    print(f"*** TREASURE FOUND BY AGENT {agent.agent_id} ***")
-                    return
-            else:
-                print(result)
-                if result != "DONE" and result != "IDLE":
-                    all_done = False
+            status, text = agent.move(grid)
+            tracer.emit(BFS_AGENT, text)
+            if status == FOUND:
+                tracer.emit(BFS_FOUND, agent.agent_id)
+                return step
+            if status not in (DONE, IDLE):
+                all_done = False
         
-        # Share messages for next turn (simulating broadcast delay or immediate receipt)
-        # In this loop, messages generated in this turn are available to others in next turn
-        # For simplicity, we can pass them in next call, but here we passed empty list first.
-        # Let's fix to pass messages generated in PREVIOUS turn or THIS turn depending on sync.
-        # Here we just print. Real logic would accumulate messages.
+        # Messages sent this step become readable after the bus latency
+        stats = bus.end_step()
+        tracer.emit(BFS_BUS, stats['messages_sent'], stats['envelopes'], stats['bytes_sent'], stats['in_flight'])
         
         if all_done:
             break
         step += 1
+    return None
 
 if __name__ == "__main__":
     run_maze_simulation()
@@ -1,5 +1,7 @@
 import random
 
+from event_trace import STEP, SUMMARY, EventType, tracer
+
 def calculate_utility(agent, resources=None):
     if resources is None:
         resources = agent["resources"]
@@ -56,6 +58,15 @@ def execute_trade(agent, offer, role):
         agent["resources"][offer["want"]] -= offer["amount"]
 
 
+TRADE_INITIAL = EventType('trade.initial', "Initial State:", SUMMARY)
+TRADE_HOLDINGS = EventType('trade.holdings', "Agent {agent}: {resources} (Util: {utility})", SUMMARY)
+TRADE_ROUND = EventType('trade.round', "\n--- Round {round} ---", STEP)
+TRADE_PROPOSE = EventType('trade.propose', "Agent {agent} proposes: Give {give}, Want {want}")
+TRADE_ACCEPT = EventType('trade.accept', "Agent {agent} ACCEPTS.")
+TRADE_REJECT = EventType('trade.reject', "Agent {agent} REJECTS.")
+TRADE_NONE = EventType('trade.none', "Agent {agent} has no trade to propose.")
+TRADE_FINAL = EventType('trade.final', "\nFinal State:", SUMMARY)
+
 def run_negotiation():
     a1 = {
         "id": 1,
@@ -71,12 +82,13 @@ def run_negotiation():
 
     agents = [a1, a2]
 
-    print("Initial State:")
-    for ag in agents:
-        print(f"Agent {ag['id']}: {ag['resources']} (Util: {calculate_utility(ag)})")
+    tracer.emit(TRADE_INITIAL)
+    if tracer.enabled(TRADE_HOLDINGS.level):
+        for ag in agents:
+            tracer.emit(TRADE_HOLDINGS, ag['id'], dict(ag['resources']), calculate_utility(ag))
 
     for round_num in range(5):
-        print(f"\n--- Round {round_num + 1} ---")
+        tracer.emit(TRADE_ROUND, round_num + 1)
 
         proposer = random.choice(agents)
         receiver = a2 if proposer is a1 else a1
@@ -84,21 +96,22 @@ def run_negotiation():
         offer = propose_trade(proposer, receiver)
 
         if offer:
-            print(f"Agent {proposer['id']} proposes: Give {offer['give']}, Want {offer['want']}")
+            tracer.emit(TRADE_PROPOSE, proposer['id'], offer['give'], offer['want'])
             accepted = evaluate_offer(receiver, offer)
 
             if accepted:
-                print(f"Agent {receiver['id']} ACCEPTS.")
+                tracer.emit(TRADE_ACCEPT, receiver['id'])
                 execute_trade(proposer, offer, "proposer")
                 execute_trade(receiver, offer, "receiver")
             else:
-                print(f"Agent {receiver['id']} REJECTS.")
+                tracer.emit(TRADE_REJECT, receiver['id'])
         else:
-            print(f"Agent {proposer['id']} has no trade to propose.")
+            tracer.emit(TRADE_NONE, proposer['id'])
 
-    print("\nFinal State:")
-    for ag in agents:
-        print(f"Agent {ag['id']}: {ag['resources']} (Util: {calculate_utility(ag)})")
+    tracer.emit(TRADE_FINAL)
+    if tracer.enabled(TRADE_HOLDINGS.level):
+        for ag in agents:
+            tracer.emit(TRADE_HOLDINGS, ag['id'], dict(ag['resources']), calculate_utility(ag))
 
 if __name__ == "__main__":
     run_negotiation()
@@ -1,5 +1,12 @@
 import random
 
+import numpy as np
+
+from assignment import assign_with_capacity, greedy_assignment, total_cost as assignment_cost
+from event_trace import STEP, SUMMARY, EventType, tracer
+
+DIVISION_ASSIGNED = EventType('division.assigned', "Agent {agent} assigned task {task} ({type})")
+
 class WorkerAgent:
     def __init__(self, agent_id, capabilities):
         self.agent_id = agent_id
@@ -15,9 +22,62 @@ class WorkerAgent:
 
     def assign_task(self, task):
         self.tasks.append(task)
-        print(f"Agent {self.agent_id} assigned task {task['id']} ({task['type']})")
+        tracer.emit(DIVISION_ASSIGNED, self.agent_id, task['id'], task['type'])
+
+DIVISION_START = EventType('division.start', "--- Task Auction Start ---", SUMMARY)
+DIVISION_TASK = EventType('division.task', "\nAuctioning Task {task}: {type} (Diff: {difficulty})", STEP)
+DIVISION_BID = EventType('division.bid', "  Agent {agent} bids: {bid:.2f}")
+DIVISION_WINNER = EventType('division.winner', "  -> Winner: Agent {agent} with bid {bid:.2f}", STEP)
+
+def run_sequential_auction(agents, tasks):
+    tracer.emit(DIVISION_START)
+    total_cost = 0
+    
+    for task in tasks:
+        tracer.emit(DIVISION_TASK, task['id'], task['type'], task['difficulty'])
+        bids = []
+        for agent in agents:
+            bid = agent.bid_for_task(task)
+            bids.append((bid, agent))
+            tracer.emit(DIVISION_BID, agent.agent_id, bid)
+            
+        # Winner is lowest bidder
+        winning_bid, winner = min(bids, key=lambda x: x[0])
+        tracer.emit(DIVISION_WINNER, winner.agent_id, winning_bid)
+        
+        winner.assign_task(task)
+        total_cost += winning_bid
+        
+    return total_cost
+
+DIVISION_BATCH = EventType('division.batch', "--- Batch Allocation (capacity {capacity} tasks per agent) ---", SUMMARY)
+DIVISION_GREEDY = EventType('division.greedy', "Greedy cost with the same capacity: {cost:.2f}", SUMMARY)
+
+def run_batch_allocation(agents, tasks, capacity=None):
+    # One cost matrix (agents x tasks) solved as min-cost flow with agent capacities
+    if capacity is None:
+        capacity = -(-len(tasks) // len(agents))
+    types = sorted({t['type'] for t in tasks})
+    multipliers = np.array([[agent.capabilities.get(t, 2.0) for t in types] for agent in agents])
+    type_idx = np.array([types.index(t['type']) for t in tasks])
+    difficulty = np.array([t['difficulty'] for t in tasks], dtype=np.float64)
+    cost = multipliers[:, type_idx] * difficulty
+
+    tracer.emit(DIVISION_BATCH, capacity)
+    owners = assign_with_capacity(cost, capacity)
+    for task, owner in zip(tasks, owners.tolist()):
+        agents[owner].assign_task(task)
+    if tracer.enabled(DIVISION_GREEDY.level):
+        # Baseline for comparison, only solved when it is reported
+        tracer.emit(DIVISION_GREEDY, assignment_cost(cost, greedy_assignment(cost, capacity)))
+    return assignment_cost(cost, owners)
+
+DIVISION_TOTAL = EventType('division.total', "\nTotal Efficiency Cost: {cost:.2f}", SUMMARY)
+DIVISION_COUNT = EventType('division.count', "Agent {agent} task count: {count}", SUMMARY)
 
-def run_task_division():
+def run_task_division(batch=False, capacity=None):
+    # batch=True assigns all tasks at once with the optimal allocator, each
+    # agent taking at most `capacity` tasks (default: an even share)
     task_types = ['coding', 'design', 'testing']
     
     # Create tasks
@@ -37,27 +97,14 @@ def run_task_division():
         WorkerAgent(3, {'coding': 1.2, 'design': 1.2, 'testing': 0.6})  # Tester
     ]
     
-    print("--- Task Auction Start ---")
-    total_cost = 0
-    
-    for task in tasks:
-        print(f"\nAuctioning Task {task['id']}: {task['type']} (Diff: {task['difficulty']})")
-        bids = []
-        for agent in agents:
-            bid = agent.bid_for_task(task)
-            bids.append((bid, agent))
-            print(f"  Agent {agent.agent_id} bids: {bid:.2f}")
-            
-        # Winner is lowest bidder
-        winning_bid, winner = min(bids, key=lambda x: x[0])
-        print(f"  -> Winner: Agent {winner.agent_id} with bid {winning_bid:.2f}")
-        
-        winner.assign_task(task)
-        total_cost += winning_bid
+    if batch:
+        total_cost = run_batch_allocation(agents, tasks, capacity)
+    else:
+        total_cost = run_sequential_auction(agents, tasks)
         
-    print(f"\nTotal Efficiency Cost: {total_cost:.2f}")
+    tracer.emit(DIVISION_TOTAL, total_cost)
     for agent in agents:
-        print(f"Agent {agent.agent_id} task count: {len(agent.tasks)}")
+        tracer.emit(DIVISION_COUNT, agent.agent_id, len(agent.tasks))
 
 if __name__ == "__main__":
     run_task_division()
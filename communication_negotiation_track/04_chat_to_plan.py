@@ -1,5 +1,9 @@
 import random
 
+from event_trace import STEP, SUMMARY, EventType, tracer
+from grid_search import get_search_core
+from windowed_planner import WindowedPlanner
+
 class NavAgent:
     def __init__(self, agent_id, start_pos, goal_pos):
         self.agent_id = agent_id
@@ -28,23 +32,49 @@ class NavAgent:
             return False # Veto if it hits me
         return True
 
-def run_chat_to_plan():
+CHAT_STEP = EventType('chat.step', "\n--- Step {step} ---", STEP)
+CHAT_POSITIONS = EventType('chat.positions', "Positions: {positions}", STEP)
+CHAT_BOTH_DONE = EventType('chat.both_done', "Both agents reached goals!", SUMMARY)
+CHAT_ALL_DONE = EventType('chat.all_done', "All agents reached goals!", SUMMARY)
+CHAT_PROPOSE = EventType('chat.propose', "Agent {agent} proposes move to {pos}")
+CHAT_SAME_CELL = EventType('chat.same_cell', "Conflict: Agents trying to move to same cell!", STEP)
+CHAT_SWAP = EventType('chat.swap', "Conflict: Agents trying to swap cells directly!", STEP)
+CHAT_RESOLVE = EventType('chat.resolve', "Resolving conflict: Agent {mover} moves, Agent {waiter} waits.", STEP)
+CHAT_APPROVED = EventType('chat.approved', "No conflict. Moves approved.", STEP)
+
+def trace_positions(agents):
+    if tracer.enabled(CHAT_POSITIONS.level):
+        tracer.emit(CHAT_POSITIONS, ", ".join(f"A{a.agent_id}{a.pos}" for a in agents))
+
+def run_chat_to_plan(agents=None, steps=10, planner='vote', grid_size=5, obstacles=(), window=8, replan_every=4):
     # 5x5 Grid
     # Agent 1: (0,0) -> (4,4)
     # Agent 2: (4,0) -> (0,4)
     # They will cross paths!
+    # Any number of NavAgents can be passed in. planner='whca' replaces the
+    # per-tick propose/vote with windowed cooperative planning.
+    # Returns {'steps', 'reached', 'waits', 'collisions'}: waits counts
+    # agent-ticks spent standing still away from the goal, collisions
+    # agent-ticks spent sharing a cell (the vote never checks the cells of
+    # agents that wait). obstacles only apply to 'whca'.
     
-    a1 = NavAgent(1, (0,0), (4,4))
-    a2 = NavAgent(2, (4,0), (0,4))
+    if planner not in ('vote', 'whca'):
+        raise ValueError(f"unknown planner {planner!r}")
+    if agents is None:
+        a1 = NavAgent(1, (0,0), (4,4))
+        a2 = NavAgent(2, (4,0), (0,4))
+        agents = [a1, a2]
     
-    agents = [a1, a2]
+    if planner == 'whca':
+        return run_windowed(agents, steps, grid_size, obstacles, window, replan_every)
     
-    for step in range(10):
-        print(f"\n--- Step {step} ---")
-        print(f"Positions: A1{a1.pos}, A2{a2.pos}")
+    waits = collisions = 0
+    for step in range(steps):
+        tracer.emit(CHAT_STEP, step)
+        trace_positions(agents)
         
-        if a1.pos == a1.goal and a2.pos == a2.goal:
-            print("Both agents reached goals!")
+        if all(a.pos == a.goal for a in agents):
+            tracer.emit(CHAT_BOTH_DONE if len(agents) == 2 else CHAT_ALL_DONE)
             break
             
         # Phase 1: Propose
@@ -53,7 +83,7 @@ def run_chat_to_plan():
             if a.pos != a.goal:
                 prop = a.propose_next_move()
                 proposals[a.agent_id] = prop
-                print(f"Agent {a.agent_id} proposes move to {prop}")
+                tracer.emit(CHAT_PROPOSE, a.agent_id, prop)
             else:
                 proposals[a.agent_id] = a.pos
                 
@@ -61,26 +91,72 @@ def run_chat_to_plan():
         # Check for conflicts (swapping positions or moving to same spot)
         move_map = {a.agent_id: proposals[a.agent_id] for a in agents}
         
-        conflict = False
-        # Check same cell collision
-        if move_map[1] == move_map[2]:
-            conflict = True
-            print("Conflict: Agents trying to move to same cell!")
+        conflicts = []
+        for i, a in enumerate(agents):
+            for b in agents[i + 1:]:
+                # Check same cell collision
+                if move_map[a.agent_id] == move_map[b.agent_id]:
+                    conflicts.append((a, b))
+                    tracer.emit(CHAT_SAME_CELL)
+                    
+                # Check swap collision
+                if move_map[a.agent_id] == b.pos and move_map[b.agent_id] == a.pos:
+                    conflicts.append((a, b))
+                    tracer.emit(CHAT_SWAP)
             
-        # Check swap collision
-        if move_map[1] == a2.pos and move_map[2] == a1.pos:
-            conflict = True
-            print("Conflict: Agents trying to swap cells directly!")
-            
-        if conflict:
-            # Resolution: Priority to Agent 1 this time (could be random or alternating)
-            print("Resolving conflict: Agent 1 moves, Agent 2 waits.")
-            a1.pos = move_map[1]
-            # Agent 2 stays
+        waiting = set()
+        if conflicts:
+            # Resolution: the earlier agent of each pair moves (could be random or alternating)
+            for a, b in conflicts:
+                tracer.emit(CHAT_RESOLVE, a.agent_id, b.agent_id)
+                waiting.add(b.agent_id)
         else:
-            print("No conflict. Moves approved.")
-            a1.pos = move_map[1]
-            a2.pos = move_map[2]
+            tracer.emit(CHAT_APPROVED)
+        for a in agents:
+            if a.agent_id in waiting or move_map[a.agent_id] == a.pos:
+                waits += a.pos != a.goal
+            else:
+                a.pos = move_map[a.agent_id]
+        collisions += len(agents) - len({a.pos for a in agents})
+    else:
+        step = steps
+    return {'steps': step, 'reached': sum(a.pos == a.goal for a in agents), 'waits': waits,
+            'collisions': collisions}
+
+CHAT_MOVE = EventType('chat.move', "Agent {agent} moves to {pos}")
+CHAT_COLLISION = EventType('chat.collision', "Collision: {count} agents share a cell!", STEP)
+CHAT_REPLANS = EventType('chat.replans', "Replans: {replans}, held moves: {held}", SUMMARY)
+
+def run_windowed(agents, steps, grid_size, obstacles, window, replan_every):
+    # WHCA*: agents follow windowed plans from a shared reservation table
+    core = get_search_core(grid_size, grid_size)
+    core.load_obstacles(obstacles)
+    plan = WindowedPlanner(core, [a.pos for a in agents], [a.goal for a in agents], window, replan_every)
+    waits = collisions = 0
+    for step in range(steps):
+        tracer.emit(CHAT_STEP, step)
+        trace_positions(agents)
+        
+        if plan.done():
+            tracer.emit(CHAT_ALL_DONE)
+            break
+        
+        moved = plan.step()
+        for a, pos, did_move in zip(agents, plan.positions(), moved):
+            if did_move:
+                tracer.emit(CHAT_MOVE, a.agent_id, pos)
+            elif a.pos != a.goal:
+                waits += 1
+            a.pos = pos
+        shared = len(agents) - len({a.pos for a in agents})
+        if shared:
+            tracer.emit(CHAT_COLLISION, shared)
+        collisions += shared
+    else:
+        step = steps
+    tracer.emit(CHAT_REPLANS, plan.replans, plan.held)
+    return {'steps': step, 'reached': sum(a.pos == a.goal for a in agents), 'waits': waits,
+            'collisions': collisions, 'replans': plan.replans, 'expansions': plan.expansions}
 
 if __name__ == "__main__":
     run_chat_to_plan()
@@ -1,5 +1,8 @@
 import random
 
+from auction_clearing import top_two
+from event_trace import STEP, SUMMARY, EventType, tracer
+
 class BidderAgent:
     def __init__(self, agent_id, valuation):
         self.agent_id = agent_id
@@ -9,36 +12,39 @@ class BidderAgent:
         # In Vickrey auction, dominant strategy is to bid your true valuation
         return self.valuation
 
+VICKREY_START = EventType('vickrey.start', "--- Multi-Agent Vickrey Auction ---", SUMMARY)
+VICKREY_AGENT = EventType('vickrey.agent', "Agent {agent} created (Private Valuation: {valuation})")
+VICKREY_BIDDING = EventType('vickrey.bidding', "\nBidding Phase:", STEP)
+VICKREY_BID = EventType('vickrey.bid', "Agent {agent} submits sealed bid.")
+VICKREY_RESULTS = EventType('vickrey.results', "\n--- Results ---\nWinner: Agent {agent}\n"
+                            "Winning Bid (Truthful): {bid}\nPrice Paid (Second Price): {price}\n"
+                            "Agent Profit (Value - Price): {profit}", SUMMARY)
+
 def run_auction():
-    print("--- Multi-Agent Vickrey Auction ---")
+    tracer.emit(VICKREY_START)
     
     # Setup agents with random valuations
     agents = []
     for i in range(5):
         val = random.randint(10, 100)
         agents.append(BidderAgent(i+1, val))
-        print(f"Agent {i+1} created (Private Valuation: {val})") # Hidden in real scenario
+        tracer.emit(VICKREY_AGENT, i+1, val) # Hidden in real scenario
         
     # Bidding Phase
     bids = []
-    print("\nBidding Phase:")
+    tracer.emit(VICKREY_BIDDING)
     for agent in agents:
         bid = agent.generate_bid()
         bids.append((bid, agent))
-        print(f"Agent {agent.agent_id} submits sealed bid.")
+        tracer.emit(VICKREY_BID, agent.agent_id)
         
     # Winner Determination
-    # Sort bids descending
-    bids.sort(key=lambda x: x[0], reverse=True)
-    
-    winner_bid, winner_agent = bids[0]
-    second_highest_bid = bids[1][0]
+    # Only the top two bids matter: one pass instead of sorting them all
+    winner_idx, winner_bid, second_highest_bid = top_two(bid for bid, _ in bids)
+    winner_agent = bids[winner_idx][1]
     
-    print("\n--- Results ---")
-    print(f"Winner: Agent {winner_agent.agent_id}")
-    print(f"Winning Bid (Truthful): {winner_bid}")
-    print(f"Price Paid (Second Price): {second_highest_bid}")
-    print(f"Agent Profit (Value - Price): {winner_agent.valuation - second_highest_bid}")
+    tracer.emit(VICKREY_RESULTS, winner_agent.agent_id, winner_bid, second_highest_bid,
+                winner_agent.valuation - second_highest_bid)
 
 if __name__ == "__main__":
     run_auction()
@@ -1,6 +1,8 @@
 import random
 import math
 
+from event_trace import STEP, SUMMARY, EventType, tracer
+
 class ReliefAgent:
     def __init__(self, agent_id, pos, capacity):
         self.agent_id = agent_id
@@ -28,6 +30,15 @@ class DisasterZone:
         self.pos = pos
         self.severity = severity # Resources needed
 
+ZONES_START = EventType('zones.start', "--- Disaster Relief Coordination ---\nZones: {zones}", SUMMARY)
+ZONES_ASSIGNED = EventType('zones.assigned', "Agent {agent} assigned to Zone {zone}", STEP)
+ZONES_STEP = EventType('zones.step', "\nStep {step}", STEP)
+ZONES_CLEAR = EventType('zones.clear', "Agent {agent}: Zone {zone} is clear.")
+ZONES_MOVE = EventType('zones.move', "Agent {agent} moving to {pos}")
+ZONES_DELIVER = EventType('zones.deliver', "Agent {agent} delivered {amount} to Zone {zone}. Remaining need: {need}")
+ZONES_EMPTY = EventType('zones.empty', "Agent {agent} out of resources! Needs resupply (not implemented).", STEP)
+ZONES_DONE = EventType('zones.done', "All disaster zones relieved!", SUMMARY)
+
 def run_disaster_relief():
     GRID_SIZE = 10
     zones = [
@@ -40,8 +51,8 @@ def run_disaster_relief():
         ReliefAgent(2, (9, 9), 5)
     ]
     
-    print("--- Disaster Relief Coordination ---")
-    print(f"Zones: {[f'Z{z.zone_id} at {z.pos} (Need {z.severity})' for z in zones]}")
+    if tracer.enabled(ZONES_START.level):
+        tracer.emit(ZONES_START, [f'Z{z.zone_id} at {z.pos} (Need {z.severity})' for z in zones])
     
     # Simple coordination: Assign closest agent to each zone
     assignments = {}
@@ -60,11 +71,11 @@ def run_disaster_relief():
         
         assignments[agent.agent_id] = best_zone
         unassigned_zones.remove(best_zone)
-        print(f"Agent {agent.agent_id} assigned to Zone {best_zone.zone_id}")
+        tracer.emit(ZONES_ASSIGNED, agent.agent_id, best_zone.zone_id)
 
     # Simulation Loop
     for step in range(15):
-        print(f"\nStep {step}")
+        tracer.emit(ZONES_STEP, step)
         all_cleared = True
         
         for agent in agents:
@@ -72,26 +83,26 @@ def run_disaster_relief():
                 target_zone = assignments[agent.agent_id]
                 
                 if target_zone.severity <= 0:
-                    print(f"Agent {agent.agent_id}: Zone {target_zone.zone_id} is clear.")
+                    tracer.emit(ZONES_CLEAR, agent.agent_id, target_zone.zone_id)
                     continue
                     
                 all_cleared = False
                 
                 if agent.pos != target_zone.pos:
                     agent.move_towards(target_zone.pos)
-                    print(f"Agent {agent.agent_id} moving to {agent.pos}")
+                    tracer.emit(ZONES_MOVE, agent.agent_id, agent.pos)
                 else:
                     # Deliver aid
                     amount = min(agent.carrying, target_zone.severity)
                     target_zone.severity -= amount
                     agent.carrying -= amount
-                    print(f"Agent {agent.agent_id} delivered {amount} to Zone {target_zone.zone_id}. Remaining need: {target_zone.severity}")
+                    tracer.emit(ZONES_DELIVER, agent.agent_id, amount, target_zone.zone_id, target_zone.severity)
                     
                     if agent.carrying == 0 and target_zone.severity > 0:
-                        print(f"Agent {agent.agent_id} out of resources! Needs resupply (not implemented).")
+                        tracer.emit(ZONES_EMPTY, agent.agent_id)
         
         if all_cleared:
-            print("All disaster zones relieved!")
+            tracer.emit(ZONES_DONE)
             break
 
 if __name__ == "__main__":
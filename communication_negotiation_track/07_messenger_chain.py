@@ -1,5 +1,7 @@
 import collections
 
+from event_trace import STEP, SUMMARY, EventType, tracer
+
 class NetworkAgent:
     def __init__(self, agent_id, neighbors):
         self.agent_id = agent_id
@@ -21,6 +23,11 @@ class NetworkAgent:
             return True # Propagate further
         return False
 
+CHAIN_START = EventType('chain.start', "--- Messenger Chain: {source} -> {target} ---", SUMMARY)
+CHAIN_RECEIVED = EventType('chain.received', "Agent {agent} received msg from {sender} (Hops: {hops})", STEP)
+CHAIN_TARGET = EventType('chain.target', "TARGET REACHED! Hops: {hops}", SUMMARY)
+CHAIN_PATH = EventType('chain.path', "Shortest Path: {path}", SUMMARY)
+
 def run_messenger_chain():
     # Define Graph Structure (Adjacency List)
     # 0 -> 1, 2
@@ -42,7 +49,7 @@ def run_messenger_chain():
     source_id = 0
     target_id = 5
     
-    print(f"--- Messenger Chain: {source_id} -> {target_id} ---")
+    tracer.emit(CHAIN_START, source_id, target_id)
     
     # BFS Queue for message propagation: (agent_id, message_packet, sender_id)
     queue = collections.deque([(source_id, {'content': 'SECRET', 'hops': 0}, -1)])
@@ -51,12 +58,12 @@ def run_messenger_chain():
         current_id, msg, sender_id = queue.popleft()
         agent = agents[current_id]
         
-        print(f"Agent {current_id} received msg from {sender_id} (Hops: {msg['hops']})")
+        tracer.emit(CHAIN_RECEIVED, current_id, sender_id, msg['hops'])
         
         should_propagate = agent.receive_message(msg, sender_id)
         
         if current_id == target_id:
-            print(f"TARGET REACHED! Hops: {msg['hops']}")
+            tracer.emit(CHAIN_TARGET, msg['hops'])
             # We don't stop immediately in flooding to find all paths, but for shortest path BFS we can stop if unweighted
             # Here we continue to show full propagation logic or break if we just want first arrival
             break 
@@ -74,7 +81,7 @@ def run_messenger_chain():
         curr = agents[curr].parent
         if curr == -1: break
         
-    print(f"Shortest Path: {path[::-1]}")
+    tracer.emit(CHAIN_PATH, path[::-1])
 
 if __name__ == "__main__":
     run_messenger_chain()
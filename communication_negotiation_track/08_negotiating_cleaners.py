@@ -1,5 +1,10 @@
 import random
 
+import numpy as np
+
+from assignment import linear_assignment
+from event_trace import STEP, SUMMARY, EventType, tracer
+
 class CleanerAgent:
     def __init__(self, agent_id, start_pos):
         self.agent_id = agent_id
@@ -14,24 +19,10 @@ class CleanerAgent:
             bids[z_id] = dist
         return bids
 
-def run_negotiating_cleaners():
-    # 10x10 Grid split into 4 zones
-    zones = {
-        'TopLeft': (2, 2),
-        'TopRight': (2, 7),
-        'BottomLeft': (7, 2),
-        'BottomRight': (7, 7)
-    }
-    
-    agents = [
-        CleanerAgent(1, (0, 0)),
-        CleanerAgent(2, (9, 9)),
-        CleanerAgent(3, (0, 9)),
-        CleanerAgent(4, (9, 0))
-    ]
-    
-    print("--- Zone Negotiation ---")
-    
+ZONE_BID_GREEDY = EventType('zone_bid.greedy', "Allocating Zones based on proximity bids:", STEP)
+ZONE_BID_ASSIGNED = EventType('zone_bid.assigned', "Agent {agent} assigned to {zone} (Distance: {cost})", STEP)
+
+def allocate_zones_greedy(agents, zones):
     # Collect all bids
     all_bids = [] # (cost, agent_id, zone_id)
     
@@ -46,17 +37,67 @@ def run_negotiating_cleaners():
     assigned_zones = set()
     assigned_agents = set()
     
-    print("Allocating Zones based on proximity bids:")
+    tracer.emit(ZONE_BID_GREEDY)
     
     for cost, ag_id, z_id in all_bids:
         if ag_id not in assigned_agents and z_id not in assigned_zones:
-            print(f"Agent {ag_id} assigned to {z_id} (Distance: {cost})")
+            tracer.emit(ZONE_BID_ASSIGNED, ag_id, z_id, cost)
             assigned_zones.add(z_id)
             assigned_agents.add(ag_id)
+    return assigned_agents
+
+ZONE_BID_OPTIMAL = EventType('zone_bid.optimal', "Allocating Zones by minimum total distance:", STEP)
+ZONE_BID_TOTAL = EventType('zone_bid.total', "Total distance: {total}", SUMMARY)
+
+def allocate_zones_optimal(agents, zones):
+    # Manhattan distances for every (agent, zone) pair at once, then the
+    # assignment with the least total distance
+    zone_ids = list(zones)
+    positions = np.array([agent.pos for agent in agents])
+    centers = np.array([zones[z] for z in zone_ids])
+    cost = np.abs(positions[:, None, :] - centers[None, :, :]).sum(axis=2)
+    
+    tracer.emit(ZONE_BID_OPTIMAL)
+    rows, cols = linear_assignment(cost)
+    assigned_agents = set()
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        agents[i].assigned_zone = zone_ids[j]
+        tracer.emit(ZONE_BID_ASSIGNED, agents[i].agent_id, zone_ids[j], cost[i, j])
+        assigned_agents.add(agents[i].agent_id)
+    tracer.emit(ZONE_BID_TOTAL, cost[rows, cols].sum())
+    return assigned_agents
+
+ZONE_BID_START = EventType('zone_bid.start', "--- Zone Negotiation ---", SUMMARY)
+ZONE_BID_UNASSIGNED = EventType('zone_bid.unassigned',
+                                "Warning: Some agents unassigned (should not happen in this symmetric setup)", SUMMARY)
+
+def run_negotiating_cleaners(batch=False):
+    # batch=True replaces the sorted-bid greedy with an optimal assignment
+    # 10x10 Grid split into 4 zones
+    zones = {
+        'TopLeft': (2, 2),
+        'TopRight': (2, 7),
+        'BottomLeft': (7, 2),
+        'BottomRight': (7, 7)
+    }
+    
+    agents = [
+        CleanerAgent(1, (0, 0)),
+        CleanerAgent(2, (9, 9)),
+        CleanerAgent(3, (0, 9)),
+        CleanerAgent(4, (9, 0))
+    ]
+    
+    tracer.emit(ZONE_BID_START)
+    
+    if batch:
+        assigned_agents = allocate_zones_optimal(agents, zones)
+    else:
+        assigned_agents = allocate_zones_greedy(agents, zones)
             
     # Check for unassigned
     if len(assigned_agents) < len(agents):
-        print("Warning: Some agents unassigned (should not happen in this symmetric setup)")
+        tracer.emit(ZONE_BID_UNASSIGNED)
 
 if __name__ == "__main__":
     run_negotiating_cleaners()
@@ -1,5 +1,7 @@
 import random
 
+from event_trace import STEP, SUMMARY, EventType, tracer
+
 class Agent:
     def __init__(self, agent_id):
         self.agent_id = agent_id
@@ -29,6 +31,12 @@ class Agent:
             else:
                 self.receiver_strategy[input_val] = random.choice(['Act1', 'Act2', 'Act3'])
 
+SIGNAL_START = EventType('signal.start', "--- Language Evolution Start ---", SUMMARY)
+SIGNAL_ROUND = EventType('signal.round', "Round {round}: State {state} -> Sym {symbol} -> Act {action} ({outcome})", STEP)
+SIGNAL_FINAL = EventType('signal.final', "\n--- Final Protocol ---\nSender (A1) Map: {sender}\nReceiver (A2) Map: {receiver}",
+                         SUMMARY)
+SIGNAL_SCORE = EventType('signal.score', "Agreement Score: {score}/{total}", SUMMARY)
+
 def run_language_evolution():
     # Lewis Signaling Game
     # States: S1, S2, S3
@@ -41,7 +49,7 @@ def run_language_evolution():
     a1 = Agent(1)
     a2 = Agent(2)
     
-    print("--- Language Evolution Start ---")
+    tracer.emit(SIGNAL_START)
     
     for round_num in range(100):
         state = random.choice(states)
@@ -56,11 +64,9 @@ def run_language_evolution():
         a2.update('receiver', symbol, action, success)
         
         if round_num % 20 == 0:
-            print(f"Round {round_num}: State {state} -> Sym {symbol} -> Act {action} ({'Success' if success else 'Fail'})")
+            tracer.emit(SIGNAL_ROUND, round_num, state, symbol, action, 'Success' if success else 'Fail')
 
-    print("\n--- Final Protocol ---")
-    print("Sender (A1) Map:", a1.sender_strategy)
-    print("Receiver (A2) Map:", a2.receiver_strategy)
+    tracer.emit(SIGNAL_FINAL, dict(a1.sender_strategy), dict(a2.receiver_strategy))
     
     # Verify
     score = 0
@@ -69,7 +75,7 @@ def run_language_evolution():
         act = a2.receiver_strategy[sym]
         if act == correct_mapping[s]:
             score += 1
-    print(f"Agreement Score: {score}/{len(states)}")
+    tracer.emit(SIGNAL_SCORE, score, len(states))
 
 if __name__ == "__main__":
     run_language_evolution()
@@ -1,5 +1,9 @@
 import random
 
+from event_trace import STEP, SUMMARY, EventType, tracer
+
+DISPATCH_ACCEPTED = EventType('dispatch.accepted', "Agent {agent} accepted task at {location}", STEP)
+
 class DeliveryAgent:
     def __init__(self, agent_id, location):
         self.agent_id = agent_id
@@ -14,10 +18,15 @@ class DeliveryAgent:
 
     def assign(self, task_location):
         self.available = False
-        print(f"Agent {self.agent_id} accepted task at {task_location}")
+        tracer.emit(DISPATCH_ACCEPTED, self.agent_id, task_location)
         self.location = task_location # Teleport for simplicity
         self.available = True
 
+DISPATCH_START = EventType('dispatch.start', "--- Delivery Coordination ---", SUMMARY)
+DISPATCH_TASK = EventType('dispatch.task', "\nNew Task at location {location}", STEP)
+DISPATCH_BID = EventType('dispatch.bid', "  Agent {agent} bids cost {cost}")
+DISPATCH_ASSIGNED = EventType('dispatch.assigned', "  -> Task assigned to Agent {agent}", STEP)
+
 def run_delivery_talkers():
     # 1D World
     agents = [
@@ -28,22 +37,22 @@ def run_delivery_talkers():
     
     tasks = [2, 9, 18, 5, 12]
     
-    print("--- Delivery Coordination ---")
+    tracer.emit(DISPATCH_START)
     
     for t in tasks:
-        print(f"\nNew Task at location {t}")
+        tracer.emit(DISPATCH_TASK, t)
         
         # Broadcast to all agents
         bids = []
         for a in agents:
             cost = a.receive_request(t)
             bids.append((cost, a))
-            print(f"  Agent {a.agent_id} bids cost {cost}")
+            tracer.emit(DISPATCH_BID, a.agent_id, cost)
             
         # Select best
         best_cost, best_agent = min(bids, key=lambda x: x[0])
         
-        print(f"  -> Task assigned to Agent {best_agent.agent_id}")
+        tracer.emit(DISPATCH_ASSIGNED, best_agent.agent_id)
         best_agent.assign(t)
 
 if __name__ == "__main__":
@@ -8,6 +8,23 @@ import logging
 from abc import ABC, abstractmethod
 from typing import List, Dict, Tuple, Any, Optional
 
+import numpy as np
+
+from agent_pool import AgentPool
+from auction_clearing import clear_english, english_rounds
+from batch_planning import plan_paths_batch
+from contract_net import BidIndex
+from event_trace import DETAIL, STEP, SUMMARY, EventType, tracer
+from frontier_exploration import FrontierExplorer
+from grid_search import get_search_core, jump_point_search
+from hierarchical_planner import HierarchicalPlanner
+from incremental_planner import DStarLite
+from knowledge_log import KnowledgeLog
+from landmarks import LandmarkIndex
+from order_book import Market
+from occupancy_grid import CELL_CODES, UNKNOWN, OccupancyGrid, make_world, merge_all
+from safe_interval_planner import ReservationTable, SafeIntervalPlanner
+
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger()
@@ -17,124 +34,288 @@ logger = logging.getLogger()
 # ==========================================
 
 class Agent(ABC):
+    __slots__ = ('agent_id',)
+
     def __init__(self, agent_id: int):
         self.agent_id = agent_id
 
     def __repr__(self):
         return f"Agent({self.agent_id})"
 
+# Simulation output goes through the shared event_trace.tracer. Lower its
+# level (or quiet() it) for large runs.
+
+TASK = EventType('task', "\n--- Task {number}: {title} ---", SUMMARY)
+
 # ==========================================
 # Task 1: Advanced Message Passing Maze (A*)
 # ==========================================
 
 class MazeAgent(Agent):
-    def __init__(self, agent_id: int, start_pos: Tuple[int, int], grid_size: int):
+    def __init__(self, agent_id: int, start_pos: Tuple[int, int], grid_size: int, search: str = 'astar'):
         super().__init__(agent_id)
         self.pos = start_pos
         self.grid_size = grid_size
+        # plan_path mode: 'astar', 'jps' (Jump Point Search), 'hpa' (hierarchical) or 'alt' (landmarks)
+        if search not in ('astar', 'jps', 'hpa', 'alt'):
+            raise ValueError(f"unknown search {search!r}")
+        self.search = search
+        self.expansions = 0  # Nodes expanded by the last plan_path call
         self.known_grid = {}  # (r, c) -> cell_type
         self.visited = set()
         self.path_to_target = []
         self.target_pos = None
+        self.planner = None  # Persistent D* Lite search towards target_pos
+        self.hpa = None  # Cached HPA* abstract graph over this agent's knowledge
+        self.landmarks = None  # Cached ALT landmark distance fields
+        self.pending_obstacles = set()  # Walls learned since the last replan
+        self.unshared = {}  # Own observations not yet published to the knowledge log
+        self.track_unshared = False  # Set when a KnowledgeLog will publish them
+        self.log_version = 0
 
     def update_knowledge(self, new_info: Dict[Tuple[int, int], str]):
-        self.known_grid.update(new_info)
+        known = self.known_grid
+        for p, t in new_info.items():
+            if t == '#' and known.get(p) != '#':
+                self.pending_obstacles.add(p)
+        known.update(new_info)
 
-    def plan_path(self, target: Tuple[int, int], obstacles: set):
-        # A* Algorithm
-        start = self.pos
-        frontier = [(0, start)]
-        came_from = {start: None}
-        cost_so_far = {start: 0}
+    def take_new_obstacles(self):
+        new_obstacles, self.pending_obstacles = self.pending_obstacles, set()
+        return new_obstacles
 
-        while frontier:
-            _, current = heapq.heappop(frontier)
+    def sense(self, grid) -> Optional[Tuple[int, int]]:
+        # Sense 3x3 area, returns treasure position if seen
+        r, c = self.pos
+        local_obs = {}
+        found_at = None
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                nr, nc = r+dr, c+dc
+                if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
+                    local_obs[(nr, nc)] = grid[nr][nc]
+                    if grid[nr][nc] == 'T':
+                        found_at = (nr, nc)
+        if self.track_unshared:
+            for p, t in local_obs.items():
+                if self.known_grid.get(p) != t:
+                    self.unshared[p] = t
+        self.update_knowledge(local_obs)
+        return found_at
 
-            if current == target:
-                break
+    def share(self, log: KnowledgeLog):
+        log.publish(self.agent_id, self.unshared.items())
+        self.unshared = {}
 
-            r, c = current
-            neighbors = [(r+1, c), (r-1, c), (r, c+1), (r, c-1)]
-            
-            for next_pos in neighbors:
-                nr, nc = next_pos
-                if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
-                    if next_pos in obstacles:
-                        continue
-                    
-                    new_cost = cost_so_far[current] + 1
-                    if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
-                        cost_so_far[next_pos] = new_cost
-                        priority = new_cost + abs(nr - target[0]) + abs(nc - target[1])
-                        heapq.heappush(frontier, (priority, next_pos))
-                        came_from[next_pos] = current
-        
-        # Reconstruct path
-        if target not in came_from:
-            return []
-            
-        path = []
-        curr = target
-        while curr != start:
-            path.append(curr)
-            curr = came_from[curr]
-        path.reverse()
+    def sync(self, log: KnowledgeLog):
+        entries, self.log_version = log.pull(self.agent_id, self.log_version)
+        if entries:
+            self.apply_observations(entries)
+
+    def apply_observations(self, entries: List[Tuple[Tuple[int, int], Any]]):
+        self.update_knowledge(dict(entries))
+
+    def is_blocked(self, pos: Tuple[int, int]) -> bool:
+        return self.known_grid.get(pos) == '#'
+
+    def known_obstacles(self):
+        return {p for p, t in self.known_grid.items() if t == '#'}
+
+    def known_count(self) -> int:
+        return len(self.known_grid)
+
+    def known_cells(self) -> np.ndarray:
+        # Dense int8 copy of the dict knowledge, in occupancy_grid codes
+        cells = np.full((self.grid_size, self.grid_size), UNKNOWN, dtype=np.int8)
+        if self.known_grid:
+            coords, kinds = zip(*self.known_grid.items())
+            rows, cols = zip(*coords)
+            cells[rows, cols] = [CELL_CODES[k] for k in kinds]
+        return cells
+
+    def plan_path(self, target: Tuple[int, int], obstacles):
+        # A* Algorithm. `obstacles` is a set of cells or a boolean (grid_size, grid_size) mask.
+        # Runs on the shared flat-array search core so repeated queries reuse its buffers.
+        if self.search == 'hpa':
+            self.sync_planners()
+            if self.hpa is None:
+                self.hpa = HierarchicalPlanner(self.grid_size, obstacles)
+            path = self.hpa.find_path(self.pos, target)
+            self.expansions = self.hpa.expansions
+            return path
+
+        heuristic = None
+        if self.search == 'alt':
+            self.sync_planners()
+            if self.landmarks is None:
+                self.landmarks = LandmarkIndex(self.grid_size, obstacles)
+            self.landmarks.refresh()
+            heuristic = self.landmarks.heuristic_to(target)
+
+        core = get_search_core(self.grid_size, self.grid_size)
+        core.load_obstacles(obstacles)
+        if self.search == 'jps':
+            path, self.expansions = jump_point_search(core.blocked, self.grid_size, self.pos, target)
+            return path
+        path = core.astar(self.pos, target, heuristic)
+        self.expansions = core.expansions
         return path
 
-def run_advanced_maze():
-    print("\n--- Task 1: Advanced Message Passing Maze (A*) ---")
-    GRID_SIZE = 10
-    grid = [['.' for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+    def sync_planners(self):
+        # Feed walls discovered since the last call to the incremental planners
+        new_obstacles = self.take_new_obstacles()
+        if new_obstacles:
+            if self.planner is not None:
+                self.planner.update_obstacles(new_obstacles)
+            if self.hpa is not None:
+                self.hpa.update_obstacles(new_obstacles)
+            if self.landmarks is not None:
+                self.landmarks.update_obstacles(new_obstacles)
+
+    def replan(self) -> List[Tuple[int, int]]:
+        # Incremental alternative to plan_path: repairs the previous search with
+        # only the walls discovered since the last call
+        self.sync_planners()
+        if self.planner is None or self.planner.goal != self.target_pos:
+            obstacles = self.known_obstacles()
+            if isinstance(obstacles, np.ndarray):
+                obstacles = map(tuple, np.argwhere(obstacles).tolist())
+            self.planner = DStarLite(self.grid_size, self.target_pos, obstacles)
+        self.path_to_target = self.planner.plan(self.pos)
+        return self.path_to_target
+
+class GridMazeAgent(MazeAgent):
+    # Same agent backed by a dense int8 occupancy grid instead of a dict
+    def __init__(self, agent_id: int, start_pos: Tuple[int, int], grid_size: int, search: str = 'astar'):
+        super().__init__(agent_id, start_pos, grid_size, search)
+        self.known = OccupancyGrid(grid_size)
+
+    def update_knowledge(self, new_info: np.ndarray):
+        self.known.merge(new_info)
+
+    def sense(self, grid: np.ndarray) -> Optional[Tuple[int, int]]:
+        if self.track_unshared:
+            # Unknown cells of the window and their true values, in one slice
+            area = self.known.window(self.pos)
+            rows, cols = np.nonzero(self.known.cells[area] == UNKNOWN)
+            values = grid[area][rows, cols]
+            cells = zip((rows + area[0].start).tolist(), (cols + area[1].start).tolist())
+            self.unshared.update(zip(cells, values.tolist()))
+        return self.known.sense(grid, self.pos)
+
+    def apply_observations(self, entries: List[Tuple[Tuple[int, int], Any]]):
+        cells, values = zip(*entries)
+        rows, cols = zip(*cells)
+        self.known.apply(np.array(rows), np.array(cols), np.array(values, dtype=np.int8))
+
+    def take_new_obstacles(self):
+        return self.known.take_fresh_walls()
+
+    def is_blocked(self, pos: Tuple[int, int]) -> bool:
+        return self.known.is_blocked(pos)
+
+    def known_obstacles(self) -> np.ndarray:
+        return self.known.obstacle_mask
+
+    def known_count(self) -> int:
+        return self.known.known_count()
+
+    def known_cells(self) -> np.ndarray:
+        return self.known.cells
+
+MAZE_TREASURE = EventType('maze.treasure', "Treasure located at {pos}", SUMMARY)
+MAZE_STEP = EventType('maze.step', "Step {step}:", STEP)
+MAZE_FOUND = EventType('maze.found', "  Agent {agent} FOUND TREASURE at {pos}!", SUMMARY)
+MAZE_SHARED = EventType('maze.shared', "  Shared {published} new cells; pulled {pulled} entries "
+                        "({bytes} bytes, log v{version})", STEP)
+MAZE_BLOCKED = EventType('maze.blocked', "  Agent {agent} cannot reach treasure (blocked).", STEP)
+MAZE_NAV_MOVE = EventType('maze.nav_move', "  Agent {agent} moved to {pos} ({left} steps left)")
+MAZE_NAV_DONE = EventType('maze.nav_done', "  Navigation finished.", SUMMARY)
+MAZE_PLANNING = EventType('maze.planning', "  Treasure location shared. Planning paths...", STEP)
+MAZE_PATH = EventType('maze.path', "  Agent {agent} path to treasure: {path}", STEP)
+MAZE_MOVE = EventType('maze.move', "  Agent {agent} moved to {pos}")
+
+def run_advanced_maze(grid_size: int = 10, num_obstacles: int = 20, num_agents: int = 2,
+                      max_steps: int = 20, use_grid: bool = False, navigate: bool = False,
+                      use_log: bool = False, search: str = 'astar', explore: str = 'random'):
+    # explore: 'random' walk or coordinated 'frontier' exploration.
+    # Returns {'found_step', 'steps', 'cells_known'} for benchmarking.
+    if explore not in ('random', 'frontier'):
+        raise ValueError(f"unknown explore {explore!r}")
+    tracer.emit(TASK, 1, "Advanced Message Passing Maze (A*)")
+    GRID_SIZE = grid_size
+    corners = [(0,0), (GRID_SIZE-1, GRID_SIZE-1)]
     
     # Obstacles
     obstacles = set()
-    for _ in range(20):
+    for _ in range(num_obstacles):
         r, c = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-        if (r, c) not in [(0,0), (GRID_SIZE-1, GRID_SIZE-1)]:
-            grid[r][c] = '#'
+        if (r, c) not in corners:
             obstacles.add((r, c))
             
     # Treasure
     while True:
         tr, tc = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-        if (tr, tc) not in obstacles and (tr, tc) not in [(0,0), (GRID_SIZE-1, GRID_SIZE-1)]:
-            grid[tr][tc] = 'T'
+        if (tr, tc) not in obstacles and (tr, tc) not in corners:
             treasure_pos = (tr, tc)
             break
             
-    print(f"Treasure located at {treasure_pos}")
+    tracer.emit(MAZE_TREASURE, treasure_pos)
+
+    if use_grid:
+        grid = make_world(GRID_SIZE, obstacles, treasure_pos)
+        agent_cls = GridMazeAgent
+    else:
+        grid = [['.' for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        for r, c in obstacles:
+            grid[r][c] = '#'
+        grid[tr][tc] = 'T'
+        agent_cls = MazeAgent
     
-    agents = [
-        MazeAgent(1, (0, 0), GRID_SIZE),
-        MazeAgent(2, (GRID_SIZE-1, GRID_SIZE-1), GRID_SIZE)
-    ]
+    # Agents alternate between the two free corners
+    agents = [agent_cls(i + 1, corners[i % 2], GRID_SIZE, search) for i in range(num_agents)]
     
+    log = KnowledgeLog() if use_log else None
+    for agent in agents:
+        agent.track_unshared = use_log
+    explorer = FrontierExplorer(GRID_SIZE) if explore == 'frontier' else None
     found = False
-    for step in range(20):
-        print(f"Step {step}:")
+    found_step = None
+    step = -1
+
+    def summary():
+        return {'found_step': found_step, 'steps': step + 1, 'cells_known': agents[0].known_count()}
+
+    for step in range(max_steps):
+        tracer.emit(MAZE_STEP, step)
         
         # 1. Sense
         for agent in agents:
-            # Simulate sensing local area
-            r, c = agent.pos
-            local_obs = {}
-            # Sense 3x3 area
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    nr, nc = r+dr, c+dc
-                    if 0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE:
-                        local_obs[(nr, nc)] = grid[nr][nc]
-                        if grid[nr][nc] == 'T':
-                            agent.target_pos = (nr, nc)
-                            print(f"  Agent {agent.agent_id} FOUND TREASURE at {(nr, nc)}!")
-                            found = True
-            agent.update_knowledge(local_obs)
+            seen = agent.sense(grid)
+            if seen and not agent.target_pos:
+                agent.target_pos = seen
+                tracer.emit(MAZE_FOUND, agent.agent_id, seen)
+                if not found:
+                    found_step = step
+                found = True
 
         # 2. Communicate (Share Knowledge)
         # In advanced version, they merge maps
-        merged_knowledge = {}
-        for agent in agents:
-            merged_knowledge.update(agent.known_grid)
+        if use_log:
+            # Publish only new observations, pull only entries past our version
+            for agent in agents:
+                agent.share(log)
+            for agent in agents:
+                agent.sync(log)
+            stats = log.end_step()
+            tracer.emit(MAZE_SHARED, stats['entries_published'], stats['entries_pulled'],
+                        stats['bytes_published'] + stats['bytes_pulled'], stats['version'])
+        elif use_grid:
+            merged_knowledge = merge_all((agent.known for agent in agents), GRID_SIZE)
+        else:
+            merged_knowledge = {}
+            for agent in agents:
+                merged_knowledge.update(agent.known_grid)
         
         shared_target = None
         for agent in agents:
@@ -143,28 +324,58 @@ def run_advanced_maze():
                 break
         
         for agent in agents:
-            agent.update_knowledge(merged_knowledge)
+            if not use_log:
+                agent.update_knowledge(merged_knowledge)
             if shared_target:
                 agent.target_pos = shared_target
 
-        if found:
-            print("  Treasure location shared. Planning paths...")
+        if found and navigate:
+            # Walk the incrementally repaired paths, discovering walls on the way
+            moved = False
             for agent in agents:
-                known_obstacles = {p for p, t in agent.known_grid.items() if t == '#'}
-                path = agent.plan_path(agent.target_pos, known_obstacles)
+                if agent.pos == agent.target_pos:
+                    continue
+                path = agent.replan()
+                if not path:
+                    tracer.emit(MAZE_BLOCKED, agent.agent_id)
+                    continue
+                agent.pos = path[0]
+                agent.visited.add(agent.pos)
+                moved = True
+                tracer.emit(MAZE_NAV_MOVE, agent.agent_id, agent.pos, len(path) - 1)
+            if not moved:
+                tracer.emit(MAZE_NAV_DONE)
+                return summary()
+            continue
+
+        if found:
+            tracer.emit(MAZE_PLANNING)
+            # Knowledge is fully shared by now, so one obstacle grid serves every query
+            paths = plan_paths_batch(agents, shared_target, agents[0].known_obstacles())
+            for agent, path in zip(agents, paths):
                 if path:
-                    print(f"  Agent {agent.agent_id} path to treasure: {path}")
+                    tracer.emit(MAZE_PATH, agent.agent_id, path)
                 else:
-                    print(f"  Agent {agent.agent_id} cannot reach treasure (blocked).")
-            return
+                    tracer.emit(MAZE_BLOCKED, agent.agent_id)
+            return summary()
 
         # 3. Move (Random exploration if no target)
+        if explorer:
+            # Knowledge is shared, so one map drives every agent's frontier target
+            moves = explorer.next_moves(agents[0].known_cells(), [agent.pos for agent in agents])
+            for agent, move in zip(agents, moves):
+                if move:
+                    agent.pos = move
+                    agent.visited.add(move)
+                    tracer.emit(MAZE_MOVE, agent.agent_id, move)
+            continue
+
         for agent in agents:
             possible_moves = []
             r, c = agent.pos
             for nr, nc in [(r+1, c), (r-1, c), (r, c+1), (r, c-1)]:
                 if 0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE:
-                    if agent.known_grid.get((nr, nc)) != '#':
+                    if not agent.is_blocked((nr, nc)):
                         possible_moves.append((nr, nc))
             
             if possible_moves:
@@ -176,103 +387,345 @@ def run_advanced_maze():
                     move = random.choice(possible_moves)
                 agent.pos = move
                 agent.visited.add(move)
-                print(f"  Agent {agent.agent_id} moved to {move}")
+                tracer.emit(MAZE_MOVE, agent.agent_id, move)
+
+    return summary()
 
 # ==========================================
 # Task 2: Advanced Resource Negotiators
 # ==========================================
 
+def _top_indices(values: np.ndarray, m: int) -> np.ndarray:
+    # Ascending indices of the m largest values, plus anything tied with the m-th
+    if len(values) <= m:
+        return np.arange(len(values))
+    threshold = np.partition(values, -m)[-m]
+    return np.flatnonzero(values >= threshold)
+
 class NegotiatorAgent(Agent):
-    def __init__(self, agent_id: int, resources: Dict[str, int], preferences: Dict[str, float]):
+    # Holdings and preference weights are arrays over a shared list of
+    # resource names, so trade evaluation is a handful of array ops
+    __slots__ = ('names', 'index', 'counts', 'weights')
+
+    def __init__(self, agent_id: int, resources: Dict[str, int], preferences: Dict[str, float],
+                 names: Optional[List[str]] = None):
         super().__init__(agent_id)
-        self.resources = resources
-        self.preferences = preferences
+        self.names = list(resources) if names is None else list(names)
+        self.index = {r: i for i, r in enumerate(self.names)}
+        self.counts = np.array([resources.get(r, 0) for r in self.names], dtype=np.int64)
+        self.weights = np.array([preferences.get(r, 1.0) for r in self.names], dtype=np.float64)
+
+    @property
+    def resources(self) -> Dict[str, int]:
+        return dict(zip(self.names, self.counts.tolist()))
+
+    @property
+    def preferences(self) -> Dict[str, float]:
+        return dict(zip(self.names, self.weights.tolist()))
 
     def utility(self, resources=None):
-        if resources is None: resources = self.resources
         # Diminishing marginal utility: utility = weight * log(count + 1)
-        u = 0
-        for r, count in resources.items():
-            weight = self.preferences.get(r, 1.0)
-            u += weight * math.log(count + 1)
-        return u
+        if resources is None:
+            counts = self.counts
+        elif isinstance(resources, dict):
+            counts = np.array([resources.get(r, 0) for r in self.names])
+        else:
+            counts = resources
+        return float(self.weights @ np.log1p(counts))
+
+    def trade_terms(self, amount: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        # Per resource: utility gained by receiving `amount` more, and utility
+        # lost by giving `amount` away (inf where we hold too few). Trading
+        # give for get changes utility by gain_in[get] - loss_out[give].
+        logs = np.log1p(self.counts)
+        gain_in = self.weights * (np.log1p(self.counts + amount) - logs)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            loss_out = np.where(self.counts >= amount,
+                                self.weights * (logs - np.log1p(self.counts - amount)), np.inf)
+        return gain_in, loss_out
+
+    def best_offers(self, limit: int = 1, amount: int = 1) -> List[Tuple[int, int, float]]:
+        # Up to `limit` (give, get, gain) trades with positive gain, best first,
+        # ties in give-major order. Only the limit+1 best gets and gives can
+        # appear in the top `limit` pairs, so the pair matrix stays small even
+        # with hundreds of resource types.
+        gain_in, loss_out = self.trade_terms(amount)
+        gets = _top_indices(gain_in, limit + 1)
+        gives = _top_indices(-loss_out, limit + 1)
+        gains = gain_in[gets][None, :] - loss_out[gives][:, None]
+        gains[gives[:, None] == gets[None, :]] = -np.inf
+        flat = gains.ravel()
+        order = np.argsort(-flat, kind='stable')[:limit]
+        n = len(gets)
+        return [(int(gives[k // n]), int(gets[k % n]), float(flat[k])) for k in order if flat[k] > 0]
+
+    def evaluate_offers(self, gives: np.ndarray, gets: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        # Responder side of many offers at once. The proposer gives `gives` and
+        # wants `gets`, so we receive gives and pay gets; -inf where we can't pay.
+        c_in = self.counts[gives]
+        c_out = self.counts[gets]
+        gain = self.weights[gives] * (np.log1p(c_in + amounts) - np.log1p(c_in))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            loss = self.weights[gets] * (np.log1p(c_out) - np.log1p(c_out - amounts))
+        return np.where(c_out >= amounts, gain - loss, -np.inf)
+
+    def trade(self, give: int, get: int, amount: int):
+        self.counts[give] -= amount
+        self.counts[get] += amount
+
+    def marginal_utilities(self) -> np.ndarray:
+        # d/dc of weight * log(count + 1)
+        return self.weights / (self.counts + 1)
+
+    def bundle_gain(self, delta: np.ndarray) -> float:
+        # Utility change from adding `delta` to our holdings (negative entries are given away)
+        changed = np.flatnonzero(delta)
+        new = self.counts[changed] + delta[changed]
+        if (new < 0).any():
+            return -math.inf
+        return float(self.weights[changed] @ (np.log1p(new) - np.log1p(self.counts[changed])))
 
-def run_advanced_negotiation():
-    print("\n--- Task 2: Advanced Resource Negotiators (Multi-Round) ---")
-    resources_list = ['Gold', 'Wood', 'Food']
+    def _swap_terms(self, counts: np.ndarray, units: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # [resource, units]: utility change from giving away / receiving that many units
+        c = counts[:, None]
+        w = self.weights[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = np.where(units <= c, w * (np.log1p(c - units) - np.log1p(c)), -np.inf)
+        return out, w * (np.log1p(c + units) - np.log1p(c))
+
+    def _swap_gains(self, other: 'NegotiatorAgent', mine: np.ndarray, theirs: np.ndarray,
+                    gives: np.ndarray, gets: np.ndarray, max_units: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Gains for us and for `other` over every "we give k of gives[i] for m
+        # of gets[j]" swap, as [i, j, k - 1, m - 1] grids
+        units = np.arange(1, max_units + 1)
+        a_out, a_in = self._swap_terms(mine, units)
+        b_out, b_in = other._swap_terms(theirs, units)
+        ours = a_out[gives][:, None, :, None] + a_in[gets][None, :, None, :]
+        their = b_in[gives][:, None, :, None] + b_out[gets][None, :, None, :]
+        ours[gives[:, None] == gets[None, :]] = -np.inf
+        return ours, their
+
+    def propose_bundle(self, other: 'NegotiatorAgent', max_pairs: int = 4, max_units: int = 16,
+                       max_candidates: int = 16) -> np.ndarray:
+        # Multi-unit, multi-resource offer to `other`, given its announced
+        # weights and holdings. Each step picks the k-for-m swap (k, m <=
+        # max_units) maximizing the product of both gains: the Nash bargaining
+        # point, which for concave log utility sits where the two agents'
+        # marginal rates of substitution meet. Up to max_pairs steps are
+        # chained on the updated holdings, so a single offer covers what
+        # 1-for-1 trading needs many rounds for. With many resource types only
+        # the max_candidates resources with the lowest (to give) and highest
+        # (to take) ratio of our marginal utility to theirs are searched.
+        # Returns our change in holdings (+ received, - given); zeros if no
+        # swap helps both sides.
+        mine = self.counts.copy()
+        theirs = other.counts.copy()
+        everything = np.arange(len(mine))
+        for _ in range(max_pairs):
+            gives = gets = everything
+            if len(everything) > 2 * max_candidates:
+                ratio = (self.weights / (mine + 1)) / (other.weights / (theirs + 1))
+                order = np.argsort(ratio, kind='stable')
+                gives = np.sort(order[:max_candidates])
+                gets = np.sort(order[-max_candidates:])
+            ours, their = self._swap_gains(other, mine, theirs, gives, gets, max_units)
+            with np.errstate(invalid='ignore'):
+                nash = np.where((ours > 0) & (their > 0), ours * their, -np.inf)
+            i, j, k, m = np.unravel_index(np.argmax(nash), nash.shape)
+            if not np.isfinite(nash[i, j, k, m]):
+                break
+            give, get = gives[i], gets[j]
+            mine[give] -= k + 1
+            theirs[give] += k + 1
+            mine[get] += m + 1
+            theirs[get] -= m + 1
+        return mine - self.counts
+
+    def has_mutual_trade(self, other: 'NegotiatorAgent', max_units: int = 8) -> bool:
+        # True if some "give k of one resource for m of another" swap (k, m <=
+        # max_units) would raise both agents' utility
+        everything = np.arange(len(self.counts))
+        ours, their = self._swap_gains(other, self.counts, other.counts, everything, everything, max_units)
+        return bool(((ours > 0) & (their > 0)).any())
+
+NEG_INITIAL = EventType('negotiation.initial', "Initial Utilities:", STEP)
+NEG_UTILITY = EventType('negotiation.utility', "  Agent {agent}: {utility:.2f}", STEP)
+NEG_ROUND = EventType('negotiation.round', "\nRound {round}", STEP)
+NEG_PROPOSE = EventType('negotiation.propose', "  Agent {agent} proposes: Give {amount} {give} for {amount} {want}")
+NEG_BUNDLE = EventType('negotiation.bundle', "  Agent {agent} proposes: Give {give} for {want}")
+NEG_ACCEPT = EventType('negotiation.accept', "  Agent {agent} ACCEPTS (Gain: {gain:.2f})")
+NEG_REJECT = EventType('negotiation.reject', "  Agent {agent} REJECTS (Loss: {gain:.2f})")
+NEG_UNAFFORDABLE = EventType('negotiation.unaffordable', "  Agent {agent} REJECTS (Insufficient funds)")
+NEG_SATISFIED = EventType('negotiation.satisfied', "  Agent {agent} is satisfied, no trade proposed.")
+NEG_EFFICIENT = EventType('negotiation.efficient', "  No mutually beneficial trade left (round {round}).", STEP)
+NEG_FINAL = EventType('negotiation.final', "\nFinal Utilities:", SUMMARY)
+NEG_FINAL_UTILITY = EventType('negotiation.final_utility', "  Agent {agent}: {utility:.2f} {resources}", SUMMARY)
+
+def pairwise_efficient(agents: List[NegotiatorAgent], max_units: int = 8) -> bool:
+    # No two ring neighbours (the only pairs that ever negotiate) have a
+    # two-resource k-for-m swap that helps both
+    n = len(agents)
+    links = n if n > 2 else n - 1
+    return not any(agents[i].has_mutual_trade(agents[(i + 1) % n], max_units) for i in range(links))
+
+def run_advanced_negotiation(num_agents: int = 2, rounds: int = 5, num_resources: int = 3,
+                             offers_per_round: int = 1, protocol: str = 'unit',
+                             max_pairs: int = 4, stop_when_efficient: bool = False):
+    # Agents beyond the first two, and resource types beyond Gold/Wood/Food,
+    # get random holdings and preferences. Each round a random proposer
+    # negotiates with the next agent in the ring:
+    #   'unit'   - the proposer sends its offers_per_round best 1-for-1 trades,
+    #              judged by its own utility alone; the responder evaluates them
+    #              together and accepts the first that gains it utility
+    #              (offer + reply: 2 messages).
+    #   'bundle' - the responder announces its weights and holdings, and the
+    #              proposer replies with one multi-unit offer over up to
+    #              max_pairs resource pairs (announce + offer + reply: 3).
+    # stop_when_efficient checks pairwise_efficient() after every round and
+    # stops once it holds.
+    # Returns {'trades', 'total_utility', 'rounds', 'messages', 'efficient_round'}.
+    if protocol not in ('unit', 'bundle'):
+        raise ValueError(f"unknown protocol {protocol!r}")
+    tracer.emit(TASK, 2, "Advanced Resource Negotiators (Multi-Round)")
+    resources_list = ['Gold', 'Wood', 'Food'] + [f'Resource{i + 1}' for i in range(3, num_resources)]
+    extra = resources_list[3:]
     
-    a1 = NegotiatorAgent(1, {'Gold': 10, 'Wood': 2, 'Food': 5}, {'Gold': 1.0, 'Wood': 5.0, 'Food': 2.0})
-    a2 = NegotiatorAgent(2, {'Gold': 2, 'Wood': 10, 'Food': 5}, {'Gold': 5.0, 'Wood': 1.0, 'Food': 2.0})
+    setups = [
+        ({'Gold': 10, 'Wood': 2, 'Food': 5}, {'Gold': 1.0, 'Wood': 5.0, 'Food': 2.0}),
+        ({'Gold': 2, 'Wood': 10, 'Food': 5}, {'Gold': 5.0, 'Wood': 1.0, 'Food': 2.0}),
+    ]
+    for held, prefs in setups:
+        held.update({r: random.randint(0, 10) for r in extra})
+        prefs.update({r: random.uniform(1.0, 5.0) for r in extra})
     
-    agents = [a1, a2]
+    agents = [NegotiatorAgent(i + 1, held, prefs, resources_list) for i, (held, prefs) in enumerate(setups)]
+    for i in range(2, num_agents):
+        agents.append(NegotiatorAgent(i + 1, {r: random.randint(0, 10) for r in resources_list},
+                                      {r: random.uniform(1.0, 5.0) for r in resources_list}, resources_list))
+    trades = 0
+    messages = 0
+    rounds_run = 0
+    efficient_round = None
+    if stop_when_efficient and pairwise_efficient(agents):
+        efficient_round = 0
+        rounds = 0
     
-    print("Initial Utilities:")
-    for a in agents:
-        print(f"  Agent {a.agent_id}: {a.utility():.2f}")
+    tracer.emit(NEG_INITIAL)
+    if tracer.enabled(NEG_UTILITY.level):
+        for a in agents:
+            tracer.emit(NEG_UTILITY, a.agent_id, a.utility())
 
     # Multi-round bargaining
-    for round_num in range(1, 6):
-        print(f"\nRound {round_num}")
+    amt = 1
+    for round_num in range(1, rounds + 1):
+        tracer.emit(NEG_ROUND, round_num)
+        rounds_run = round_num
         proposer = random.choice(agents)
-        responder = a2 if proposer == a1 else a1
-        
-        # Smart Proposal Generation
-        # Identify what I have excess of (low marginal gain) and what I want (high marginal gain)
-        best_offer = None
-        max_gain = 0
-        
-        # Try all 1-for-1 trades
-        for give_r in resources_list:
-            if proposer.resources[give_r] > 0:
-                for get_r in resources_list:
-                    if give_r == get_r: continue
-                    
-                    # Simulate my new utility
-                    my_new_res = proposer.resources.copy()
-                    my_new_res[give_r] -= 1
-                    my_new_res[get_r] += 1
-                    my_gain = proposer.utility(my_new_res) - proposer.utility()
-                    
-                    if my_gain > max_gain:
-                        max_gain = my_gain
-                        best_offer = (give_r, get_r, 1)
-
-        if best_offer:
-            give, want, amt = best_offer
-            print(f"  Agent {proposer.agent_id} proposes: Give {amt} {give} for {amt} {want}")
-            
-            # Responder Evaluation
-            if responder.resources.get(want, 0) >= amt: # Can I afford to give what they want?
-                # Note: Offer says "Proposer Gives X, Wants Y". So Responder Gets X, Gives Y.
-                resp_new_res = responder.resources.copy()
-                resp_new_res[give] += amt
-                resp_new_res[want] -= amt
-                
-                resp_gain = responder.utility(resp_new_res) - responder.utility()
-                
+        responder = agents[(agents.index(proposer) + 1) % len(agents)]
+
+        if protocol == 'bundle':
+            messages += 1
+            delta = proposer.propose_bundle(responder, max_pairs)
+            if not delta.any():
+                tracer.emit(NEG_SATISFIED, proposer.agent_id)
+            else:
+                messages += 2
+                if tracer.enabled(NEG_BUNDLE.level):
+                    give = {proposer.names[i]: int(-delta[i]) for i in np.flatnonzero(delta < 0)}
+                    want = {proposer.names[i]: int(delta[i]) for i in np.flatnonzero(delta > 0)}
+                    tracer.emit(NEG_BUNDLE, proposer.agent_id, give, want)
+                resp_gain = responder.bundle_gain(-delta)
                 if resp_gain > 0:
-                    print(f"  Agent {responder.agent_id} ACCEPTS (Gain: {resp_gain:.2f})")
-                    # Execute
-                    proposer.resources[give] -= amt
-                    proposer.resources[want] += amt
-                    responder.resources[give] += amt
-                    responder.resources[want] -= amt
+                    tracer.emit(NEG_ACCEPT, responder.agent_id, resp_gain)
+                    proposer.counts += delta
+                    responder.counts -= delta
+                    trades += 1
                 else:
-                    print(f"  Agent {responder.agent_id} REJECTS (Loss: {resp_gain:.2f})")
-            else:
-                print(f"  Agent {responder.agent_id} REJECTS (Insufficient funds)")
+                    tracer.emit(NEG_REJECT, responder.agent_id, resp_gain)
+            if stop_when_efficient and pairwise_efficient(agents):
+                efficient_round = round_num
+                tracer.emit(NEG_EFFICIENT, round_num)
+                break
+            continue
+        
+        # Smart Proposal Generation
+        # Identify what I have excess of (low marginal gain) and what I want (high marginal gain):
+        # the gain of every 1-for-1 trade comes out of one broadcast expression
+        offers = proposer.best_offers(offers_per_round, amt)
+
+        if not offers:
+            tracer.emit(NEG_SATISFIED, proposer.agent_id)
+            continue
+
+        messages += 2
+        for give, want, _ in offers:
+            tracer.emit(NEG_PROPOSE, proposer.agent_id, amt, proposer.names[give], proposer.names[want])
+
+        # Responder Evaluation
+        # Note: Offer says "Proposer Gives X, Wants Y". So Responder Gets X, Gives Y.
+        gives = np.array([o[0] for o in offers])
+        wants = np.array([o[1] for o in offers])
+        resp_gains = responder.evaluate_offers(gives, wants, np.full(len(offers), amt))
+        accepted = np.flatnonzero(resp_gains > 0)
+        if len(accepted):
+            k = int(accepted[0])
+            tracer.emit(NEG_ACCEPT, responder.agent_id, float(resp_gains[k]))
+            # Execute
+            proposer.trade(gives[k], wants[k], amt)
+            responder.trade(wants[k], gives[k], amt)
+            trades += 1
+        elif np.isfinite(resp_gains).any():
+            tracer.emit(NEG_REJECT, responder.agent_id, float(resp_gains[np.isfinite(resp_gains)].max()))
         else:
-            print(f"  Agent {proposer.agent_id} is satisfied, no trade proposed.")
+            tracer.emit(NEG_UNAFFORDABLE, responder.agent_id)
+
+        if stop_when_efficient and pairwise_efficient(agents):
+            efficient_round = round_num
+            tracer.emit(NEG_EFFICIENT, round_num)
+            break
 
-    print("\nFinal Utilities:")
-    for a in agents:
-        print(f"  Agent {a.agent_id}: {a.utility():.2f} {a.resources}")
+    tracer.emit(NEG_FINAL)
+    if tracer.enabled(NEG_FINAL_UTILITY.level):
+        for a in agents:
+            tracer.emit(NEG_FINAL_UTILITY, a.agent_id, a.utility(), a.resources)
+    return {'trades': trades, 'total_utility': sum(a.utility() for a in agents),
+            'rounds': rounds_run, 'messages': messages, 'efficient_round': efficient_round}
+
+MARKET_ROUND = EventType('market.round', "Round {round}: {orders} orders in {books} books, {fills} fills, "
+                         "welfare {welfare:.1f} ({round_ms:.1f} ms)", STEP)
+MARKET_DONE = EventType('market.done', "Welfare {start:.1f} -> {end:.1f}; mean round {mean_ms:.1f} ms, "
+                        "max {max_ms:.1f} ms", SUMMARY)
+
+def run_advanced_market(num_agents: int = 1000, num_goods: int = 8, rounds: int = 10,
+                        orders_per_agent: int = 4):
+    # Market mode: instead of pairwise bargaining, every agent posts bids and
+    # asks from its marginal utilities into per-good-pair order books that are
+    # cleared in one batch per round (see order_book.Market).
+    # Returns {'welfare_start', 'welfare', 'orders', 'fills', 'mean_round_ms', 'max_round_ms'}.
+    tracer.emit(TASK, 2, "Resource Negotiators (Order Book Market)")
+    rng = np.random.default_rng(random.randrange(2**32))
+    market = Market(rng.uniform(1.0, 5.0, (num_agents, num_goods)),
+                    rng.integers(0, 11, (num_agents, num_goods)))
+    start = market.welfare()
+    for round_num in range(1, rounds + 1):
+        stats = market.step(orders_per_agent)
+        tracer.emit(MARKET_ROUND, round_num, stats['orders'], stats['books'], stats['fills'],
+                    stats['welfare'], stats['round_ms'])
+
+    times = [h['round_ms'] for h in market.history] or [0.0]
+    tracer.emit(MARKET_DONE, start, market.welfare(), sum(times) / len(times), max(times))
+    return {'welfare_start': start, 'welfare': market.welfare(),
+            'orders': sum(h['orders'] for h in market.history),
+            'fills': sum(h['fills'] for h in market.history),
+            'mean_round_ms': sum(times) / len(times), 'max_round_ms': max(times)}
 
 # ==========================================
 # Task 3: Advanced Task Division (CNP)
 # ==========================================
 
 class CNPWorker(Agent):
+    __slots__ = ('skills', 'load')
+
     def __init__(self, agent_id: int, skills: Dict[str, float]):
         super().__init__(agent_id)
         self.skills = skills # Efficiency multiplier (lower is better)
@@ -287,216 +740,238 @@ class CNPWorker(Agent):
     def assign_task(self, cost: float):
         self.load += cost
 
-def run_advanced_task_division():
-    print("\n--- Task 3: Advanced Task Division (Contract Net Protocol) ---")
+CNP_ANNOUNCE = EventType('cnp.announce', "\nManager announces Task {task}: {type} (Diff: {difficulty})", STEP)
+CNP_BID = EventType('cnp.bid', "  Worker {worker} bids: {bid:.2f}")
+CNP_AWARD = EventType('cnp.award', "  -> Awarded to Worker {worker} at cost {cost:.2f}", STEP)
+
+def run_advanced_task_division(num_workers: int = 3, num_tasks: int = 5, indexed: Optional[bool] = None):
+    # Extra workers and tasks beyond the fixed scenario are drawn at random.
+    # indexed=True awards through a BidIndex (same winners as broadcasting
+    # the CFP; O(H log workers) per award for H distinct (type, difficulty)
+    # pairs, at most 3 x 16 here); by default it is used whenever the
+    # individual bids are not being traced.
+    # Returns {'total_cost', 'max_load'} for benchmarking.
+    tracer.emit(TASK, 3, "Advanced Task Division (Contract Net Protocol)")
     
     workers = [
         CNPWorker(1, {'coding': 0.5, 'testing': 1.5}),
         CNPWorker(2, {'coding': 1.5, 'testing': 0.5}),
         CNPWorker(3, {'coding': 1.0, 'testing': 1.0})
-    ]
+    ][:num_workers]
+    for i in range(len(workers), num_workers):
+        workers.append(CNPWorker(i + 1, {'coding': random.uniform(0.5, 1.5), 'testing': random.uniform(0.5, 1.5)}))
     
     tasks = [
         ('coding', 10), ('testing', 8), ('coding', 20), ('testing', 5), ('design', 10)
-    ]
+    ][:num_tasks]
+    for _ in range(len(tasks), num_tasks):
+        tasks.append((random.choice(['coding', 'testing', 'design']), random.randint(5, 20)))
+    total_cost = 0.0
+    if indexed is None:
+        indexed = not tracer.enabled(CNP_BID.level)
+    index = BidIndex([w.skills for w in workers], sorted({t for t, _ in tasks})) if indexed else None
     
     for i, (t_type, diff) in enumerate(tasks):
-        print(f"\nManager announces Task {i}: {t_type} (Diff: {diff})")
+        tracer.emit(CNP_ANNOUNCE, i, t_type, diff)
         
-        # 1. Announcement (CFP)
-        bids = []
-        for w in workers:
-            bid_price = w.evaluate_cfp(t_type, diff)
-            bids.append((bid_price, w))
-            print(f"  Worker {w.agent_id} bids: {bid_price:.2f}")
+        if index is not None:
+            # Ask the index instead of every worker
+            w, best_bid = index.best(t_type, diff)
+            winner = workers[w]
+            index.add_load(w, best_bid)
+        else:
+            # 1. Announcement (CFP)
+            bids = []
+            for w in workers:
+                bid_price = w.evaluate_cfp(t_type, diff)
+                bids.append((bid_price, w))
+                tracer.emit(CNP_BID, w.agent_id, bid_price)
             
-        # 2. Award
-        best_bid, winner = min(bids, key=lambda x: x[0])
-        print(f"  -> Awarded to Worker {winner.agent_id} at cost {best_bid:.2f}")
+            # 2. Award
+            best_bid, winner = min(bids, key=lambda x: x[0])
+        tracer.emit(CNP_AWARD, winner.agent_id, best_bid)
         winner.assign_task(best_bid)
+        total_cost += best_bid
+
+    return {'total_cost': total_cost, 'max_load': max(w.load for w in workers)}
 
 # ==========================================
 # Task 4: Advanced Chat to Plan (Prioritized)
 # ==========================================
 
-def run_advanced_chat_to_plan():
-    print("\n--- Task 4: Advanced Chat to Plan (Prioritized Planning) ---")
+PLAN_AGENT = EventType('plan.agent', "Planning for Agent {agent}...", STEP)
+PLAN_FOUND = EventType('plan.found', "  Path found: {path}", STEP)
+PLAN_NONE = EventType('plan.none', "  No path found!", STEP)
+
+def run_advanced_chat_to_plan(grid_len: int = 5, planner: str = 'space_time'):
+    tracer.emit(TASK, 4, "Advanced Chat to Plan (Prioritized Planning)")
     # Scenario: 2 agents in a narrow corridor swapping places
     # 0 1 2 3 4
     # A . . . B
     # Goal: A->4, B->0
+    # planner='sipp' plans with safe intervals, which also forbids swaps
+    # (so B cannot get past A here).
+    # Returns {'planned', 'makespan'} for benchmarking.
     
-    grid_len = 5
     agents = [
-        {'id': 'A', 'start': 0, 'goal': 4, 'prio': 1},
-        {'id': 'B', 'start': 4, 'goal': 0, 'prio': 2}
+        {'id': 'A', 'start': 0, 'goal': grid_len - 1, 'prio': 1},
+        {'id': 'B', 'start': grid_len - 1, 'goal': 0, 'prio': 2}
     ]
     
     # Prioritized Planning: Higher priority plans first, lower priority plans around them
     agents.sort(key=lambda x: x['prio'])
     
-    reservations = set() # (time, location)
+    # The corridor is a 1 x grid_len grid; A* with a time dimension runs on the flat search core
+    core = get_search_core(1, grid_len)
+    core.load_obstacles(set())
+    reservations = set() # space-time state ids of (time, location)
+    if planner == 'sipp':
+        table = ReservationTable()
+        sipp = SafeIntervalPlanner(core)
+    elif planner != 'space_time':
+        raise ValueError(f"unknown planner {planner!r}")
     
     full_plans = {}
     
     for agent in agents:
-        print(f"Planning for Agent {agent['id']}...")
-        # A* with time dimension
-        start_node = (0, agent['start']) # (time, pos)
-        goal_pos = agent['goal']
-        
-        frontier = [(0, start_node)]
-        came_from = {start_node: None}
-        cost_so_far = {start_node: 0}
-        
-        found_path = None
-        
-        while frontier:
-            _, current = heapq.heappop(frontier)
-            curr_time, curr_pos = current
-            
-            if curr_pos == goal_pos and curr_time > 8: # Wait a bit to ensure stability
-                 found_path = current
-                 break
-            
-            if curr_time > 15: # Timeout
-                break
-                
-            # Moves: Left, Right, Wait
-            next_moves = []
-            if curr_pos > 0: next_moves.append(curr_pos - 1)
-            if curr_pos < grid_len - 1: next_moves.append(curr_pos + 1)
-            next_moves.append(curr_pos) # Wait
-            
-            for next_pos in next_moves:
-                next_time = curr_time + 1
-                if (next_time, next_pos) in reservations:
-                    continue # Collision with higher priority agent
-                
-                # Vertex collision check is not enough, need edge collision (swapping) check?
-                # For 1D, swapping means: I go i->j, other went j->i at same time.
-                # Since we reserve (t, pos), if higher prio is at pos at time t, I can't be there.
-                # This handles vertex collisions.
-                
-                new_cost = cost_so_far[current] + 1
-                if (next_time, next_pos) not in cost_so_far or new_cost < cost_so_far[(next_time, next_pos)]:
-                    cost_so_far[(next_time, next_pos)] = new_cost
-                    prio = new_cost + abs(next_pos - goal_pos)
-                    heapq.heappush(frontier, (prio, (next_time, next_pos)))
-                    came_from[(next_time, next_pos)] = current
-
-        # Reconstruct
-        if found_path:
-            path = []
-            curr = found_path
-            while curr:
-                path.append(curr)
-                reservations.add(curr) # Reserve space-time
-                curr = came_from[curr]
-            path.reverse()
+        tracer.emit(PLAN_AGENT, agent['id'])
+        if planner == 'sipp':
+            path = sipp.plan((0, agent['start']), (0, agent['goal']), table)
+            if path:
+                table.reserve_path([(t, core.index(cell)) for t, cell in path])
+        else:
+            # Wait a bit at the goal to ensure stability (arrive after t=8 on the
+            # 5-cell corridor), give up past t=16
+            path = core.astar_space_time((0, agent['start']), (0, agent['goal']), reservations,
+                                         horizon=3 * grid_len + 1, min_arrival=2 * grid_len - 1)
+
+            # Vertex collisions are handled by reserving (t, pos): if a higher priority
+            # agent is at pos at time t, lower priority agents can't be there.
+            for t, cell in path:
+                reservations.add(core.state_id(t, cell)) # Reserve space-time
+        if path:
+            path = [(t, cell[1]) for t, cell in path]
             full_plans[agent['id']] = path
-            print(f"  Path found: {[(t, p) for t, p in path]}")
+            tracer.emit(PLAN_FOUND, path)
         else:
-            print("  No path found!")
+            tracer.emit(PLAN_NONE)
+
+    return {'planned': len(full_plans), 'makespan': max((p[-1][0] for p in full_plans.values()), default=0)}
 
 # ==========================================
 # Task 5: Advanced Multi-Agent Auction
 # ==========================================
 
-class AuctionAgent(Agent):
-    def __init__(self, agent_id: int, valuation: int):
-        super().__init__(agent_id)
-        self.valuation = valuation
-        self.active = True
+AUCTION_TYPE = EventType('auction.type', "Select Auction Type: 1. English (Ascending)  2. Vickrey (Sealed 2nd Price)\n"
+                         "Running {kind} Auction...", SUMMARY)
+AUCTION_VALUATION = EventType('auction.valuation', "  Agent {agent} Val: {valuation}")
+AUCTION_UNSOLD = EventType('auction.unsold', "No bidders left. Item unsold.", SUMMARY)
+AUCTION_WON = EventType('auction.won', "Auction ended! Winner: Agent {agent} at Price: {price}", SUMMARY)
+AUCTION_PROFIT = EventType('auction.profit', "  Agent Profit: {profit}", SUMMARY)
+AUCTION_OVERPAID = EventType('auction.overpaid', "  Winner overpaid (Winner's curse)!", SUMMARY)
+AUCTION_PRICE = EventType('auction.price', "Price raised to {price}", STEP)
+AUCTION_DROP = EventType('auction.drop', "  Agent {agent} drops out.")
+AUCTION_STAY = EventType('auction.stay', "  Agent {agent} stays in.")
 
-def run_advanced_auction():
-    print("\n--- Task 5: Advanced Multi-Agent Auction ---")
-    print("Select Auction Type: 1. English (Ascending)  2. Vickrey (Sealed 2nd Price)")
+def run_advanced_auction(num_bidders: int = 5):
+    # Returns {'winner', 'price'} for benchmarking.
+    tracer.emit(TASK, 5, "Advanced Multi-Agent Auction")
     # For demo, we'll run English
-    print("Running English Auction...")
+    tracer.emit(AUCTION_TYPE, "English")
     
-    agents = [AuctionAgent(i, random.randint(50, 150)) for i in range(5)]
-    for a in agents: print(f"  Agent {a.agent_id} Val: {a.valuation}")
+    valuation = np.array([random.randint(50, 150) for _ in range(num_bidders)])
+    if tracer.enabled(AUCTION_VALUATION.level):
+        for i in range(num_bidders): tracer.emit(AUCTION_VALUATION, i, valuation[i])
     
-    current_price = 0
     min_increment = 10
-    winner = None
+    # Closed form from the top two valuations; the price ticks are only
+    # replayed when they are traced
+    winner, current_price = clear_english(valuation.tolist(), min_increment)
+    if tracer.enabled(AUCTION_PRICE.level):
+        for price, bidders, dropping in english_rounds(valuation, min_increment):
+            tracer.emit(AUCTION_PRICE, price)
+            if tracer.enabled(AUCTION_DROP.level):
+                for i, dropped in zip(bidders.tolist(), dropping.tolist()):
+                    tracer.emit(AUCTION_DROP if dropped else AUCTION_STAY, i)
     
-    while True:
-        active_bidders = [a for a in agents if a.active]
-        if len(active_bidders) == 0:
-            print("No bidders left. Item unsold.")
-            break
-        if len(active_bidders) == 1:
-            winner = active_bidders[0]
-            print(f"Auction ended! Winner: Agent {winner.agent_id} at Price: {current_price}")
-            if winner.valuation >= current_price:
-                print(f"  Agent Profit: {winner.valuation - current_price}")
-            else:
-                print("  Winner overpaid (Winner's curse)!")
-            break
-            
-        # Bidding round
-        current_price += min_increment
-        print(f"Price raised to {current_price}")
-        
-        for a in active_bidders:
-            if a.valuation < current_price:
-                a.active = False
-                print(f"  Agent {a.agent_id} drops out.")
-            else:
-                print(f"  Agent {a.agent_id} stays in.")
+    if winner is None:
+        tracer.emit(AUCTION_UNSOLD)
+        return {'winner': None, 'price': current_price}
+    tracer.emit(AUCTION_WON, winner, current_price)
+    if valuation[winner] >= current_price:
+        tracer.emit(AUCTION_PROFIT, valuation[winner] - current_price)
+    else:
+        tracer.emit(AUCTION_OVERPAID)
+    return {'winner': winner, 'price': current_price}
 
 # ==========================================
 # Task 6: Advanced Disaster Relief
 # ==========================================
 
-def run_advanced_disaster_relief():
-    print("\n--- Task 6: Advanced Disaster Relief (Dynamic) ---")
+RELIEF_ZONE = EventType('relief.zone', "Time {time}: New Disaster at {pos}!", STEP)
+RELIEF_RESPOND = EventType('relief.respond', "  Agent {agent} responding to {pos} (Dist: {dist})")
+RELIEF_UNSERVED = EventType('relief.unserved', "  Zone at {pos} unserved (No fuel/agents)!")
+
+def run_advanced_disaster_relief(num_agents: int = 2, steps: int = 10, line_length: int = 10):
+    # Agents are spread evenly along a line of length line_length.
+    # Returns {'served', 'unserved'} for benchmarking.
+    tracer.emit(TASK, 6, "Advanced Disaster Relief (Dynamic)")
     # Agents have fuel. Zones appear dynamically.
     
     zones = []
-    agents = [{'id': 1, 'pos': 0, 'fuel': 20}, {'id': 2, 'pos': 10, 'fuel': 20}]
+    agents = AgentPool(num_agents, id=np.arange(1, num_agents + 1),
+                       pos=np.arange(num_agents) * line_length // max(1, num_agents - 1),
+                       fuel=np.full(num_agents, 20))
+    served = 0
     
-    for time_step in range(10):
+    for time_step in range(steps):
         # Random zone appearance
         if random.random() < 0.4:
-            z_pos = random.randint(0, 10)
+            z_pos = random.randint(0, line_length)
             zones.append({'pos': z_pos, 'severity': random.randint(3, 8)})
-            print(f"Time {time_step}: New Disaster at {z_pos}!")
+            tracer.emit(RELIEF_ZONE, time_step, z_pos)
             
         # Assignment (Greedy with Fuel Check)
         for z in zones[:]:
-            best_agent = None
-            min_dist = float('inf')
-            
-            for a in agents:
-                dist = abs(a['pos'] - z['pos'])
-                if dist <= a['fuel'] and dist < min_dist:
-                    min_dist = dist
-                    best_agent = a
+            # Nearest agent with enough fuel, over the whole pool at once (first on ties)
+            dist = np.abs(agents.pos - z['pos'])
+            dist[dist > agents.fuel] = np.iinfo(dist.dtype).max
+            k = int(np.argmin(dist))
+            best_agent = agents[k] if dist[k] <= agents.fuel[k] else None
+            min_dist = int(dist[k])
             
             if best_agent:
-                print(f"  Agent {best_agent['id']} responding to {z['pos']} (Dist: {min_dist})")
+                tracer.emit(RELIEF_RESPOND, best_agent['id'], z['pos'], min_dist)
                 best_agent['fuel'] -= min_dist
                 best_agent['pos'] = z['pos']
                 zones.remove(z) # Solved
+                served += 1
             else:
-                print(f"  Zone at {z['pos']} unserved (No fuel/agents)!")
+                tracer.emit(RELIEF_UNSERVED, z['pos'])
+
+    return {'served': served, 'unserved': len(zones)}
 
 # ==========================================
 # Task 7: Advanced Messenger Chain
 # ==========================================
 
-def run_advanced_messenger():
-    print("\n--- Task 7: Advanced Messenger Chain (Reliability) ---")
+MSG_SEND = EventType('messenger.send', "Node {node} sending to {next} (Attempt {attempt})...")
+MSG_ACK = EventType('messenger.ack', "  ACK received.")
+MSG_LOST = EventType('messenger.lost', "  Packet Lost/Timeout.")
+MSG_ABORT = EventType('messenger.abort', "Link failure! Transmission aborted.", SUMMARY)
+MSG_DELIVERED = EventType('messenger.delivered', "Message '{message}' delivered to Node {node}!", SUMMARY)
+
+def run_advanced_messenger(chain_length: int = 4):
+    # Returns {'delivered', 'attempts'} for benchmarking.
+    tracer.emit(TASK, 7, "Advanced Messenger Chain (Reliability)")
     # Simulating packet loss and retries
     
-    path = [0, 1, 2, 3] # Linear chain
+    path = list(range(chain_length)) # Linear chain
     message = "SECRET_CODE"
     
     current_node = 0
-    target_node = 3
+    target_node = chain_length - 1
+    total_attempts = 0
     
     while current_node != target_node:
         next_node = path[path.index(current_node) + 1]
@@ -505,58 +980,77 @@ def run_advanced_messenger():
         attempts = 0
         while not success and attempts < 3:
             attempts += 1
-            print(f"Node {current_node} sending to {next_node} (Attempt {attempts})...")
+            total_attempts += 1
+            tracer.emit(MSG_SEND, current_node, next_node, attempts)
             
             if random.random() > 0.3: # 70% success rate
-                print("  ACK received.")
+                tracer.emit(MSG_ACK)
                 success = True
                 current_node = next_node
             else:
-                print("  Packet Lost/Timeout.")
+                tracer.emit(MSG_LOST)
         
         if not success:
-            print("Link failure! Transmission aborted.")
-            return
+            tracer.emit(MSG_ABORT)
+            return {'delivered': False, 'attempts': total_attempts}
 
-    print(f"Message '{message}' delivered to Node {target_node}!")
+    tracer.emit(MSG_DELIVERED, message, target_node)
+    return {'delivered': True, 'attempts': total_attempts}
 
 # ==========================================
 # Task 8: Advanced Negotiating Cleaners
 # ==========================================
 
-def run_advanced_cleaners():
-    print("\n--- Task 8: Advanced Negotiating Cleaners (Market) ---")
+CLEAN_WON = EventType('cleaners.won', "Zone {zone} won by Agent {agent} for {cost}")
+CLEAN_FULL = EventType('cleaners.full', "Agent {agent} won {zone} but is at capacity! Subcontracting...")
+CLEAN_TRANSFER = EventType('cleaners.transfer', "  -> Transferred to Agent {agent}")
+
+def run_advanced_cleaners(num_agents: int = 2, num_zones: int = 4):
+    # Returns {'max_assigned'} for benchmarking.
+    tracer.emit(TASK, 8, "Advanced Negotiating Cleaners (Market)")
     # Agents bid for zones. If one agent wins too many, they can subcontract.
     
-    zones = ['Z1', 'Z2', 'Z3', 'Z4']
-    agents = [{'id': 1, 'cap': 2}, {'id': 2, 'cap': 2}] # Capacity limit
-    
-    assignments = {1: [], 2: []}
+    zones = [f'Z{i + 1}' for i in range(num_zones)]
+    cap = max(2, -(-num_zones // num_agents))
+    agents = AgentPool(num_agents, id=np.arange(1, num_agents + 1),
+                       cap=np.full(num_agents, cap), load=np.zeros(num_agents, dtype=np.int64)) # Capacity limit
     
     for z in zones:
         # Random bids
-        bids = [(random.randint(1, 10), a) for a in agents]
-        cost, winner = min(bids, key=lambda x: x[0])
+        bids = np.array([random.randint(1, 10) for _ in range(num_agents)])
+        winner = int(np.argmin(bids))
+        cost = int(bids[winner])
         
-        if len(assignments[winner['id']]) < winner['cap']:
-            assignments[winner['id']].append(z)
-            print(f"Zone {z} won by Agent {winner['id']} for {cost}")
+        if agents.load[winner] < agents.cap[winner]:
+            agents.load[winner] += 1
+            tracer.emit(CLEAN_WON, z, winner + 1, cost)
         else:
-            print(f"Agent {winner['id']} won {z} but is at capacity! Subcontracting...")
-            other = agents[1] if winner['id'] == 1 else agents[0]
-            assignments[other['id']].append(z)
-            print(f"  -> Transferred to Agent {other['id']}")
+            tracer.emit(CLEAN_FULL, winner + 1, z)
+            # Least loaded other agent takes it
+            others = agents.load.astype(np.float64)
+            others[winner] = np.inf
+            other = int(np.argmin(others))
+            agents.load[other] += 1
+            tracer.emit(CLEAN_TRANSFER, other + 1)
+
+    return {'max_assigned': int(agents.load.max())}
 
 # ==========================================
 # Task 9: Advanced Language Evolution
 # ==========================================
 
-def run_advanced_language():
-    print("\n--- Task 9: Advanced Language Evolution (RL) ---")
+LANG_ITER = EventType('language.iter', "Iter {iter}: Obj {object} -> Word {word} -> Guess {guess} (R: {reward})", STEP)
+LANG_FINAL = EventType('language.final', "Final Speaker Q: {q}", SUMMARY)
+
+def run_advanced_language(iterations: int = 20, num_objects: int = 2):
+    # The vocabulary has one word per object.
+    # Returns {'success_rate'} over all iterations for benchmarking.
+    tracer.emit(TASK, 9, "Advanced Language Evolution (RL)")
     # Q-Learning for Naming Game
     
-    objects = ['Apple', 'Banana']
-    vocab = ['Word1', 'Word2']
+    objects = ['Apple', 'Banana'] + [f'Object{i + 1}' for i in range(2, num_objects)]
+    objects = objects[:num_objects]
+    vocab = [f'Word{i + 1}' for i in range(num_objects)]
     
     # Q-Table: Agent -> Object -> Word -> Value
     q_table = {
@@ -574,7 +1068,8 @@ def run_advanced_language():
     epsilon = 0.5
     alpha = 0.1
     
-    for i in range(20):
+    successes = 0
+    for i in range(iterations):
         target_obj = random.choice(objects)
         
         # Speaker chooses word
@@ -590,29 +1085,40 @@ def run_advanced_language():
             guess = max(listener_q[word], key=listener_q[word].get)
             
         reward = 1 if guess == target_obj else -1
+        successes += reward > 0
         
         # Update
         speaker_q[target_obj][word] += alpha * (reward - speaker_q[target_obj][word])
         listener_q[word][guess] += alpha * (reward - listener_q[word][guess])
         
         if i % 5 == 0:
-            print(f"Iter {i}: Obj {target_obj} -> Word {word} -> Guess {guess} (R: {reward})")
+            tracer.emit(LANG_ITER, i, target_obj, word, guess, reward)
             
-    print("Final Speaker Q:", speaker_q)
+    tracer.emit(LANG_FINAL, speaker_q)
+    return {'success_rate': successes / max(1, iterations)}
 
 # ==========================================
 # Task 10: Advanced Delivery Talkers
 # ==========================================
 
-def run_advanced_delivery():
-    print("\n--- Task 10: Advanced Delivery Talkers (VRP Heuristic) ---")
+DELIVERY_START = EventType('delivery.start', "Start at {depot}. Deliveries: {deliveries}", SUMMARY)
+DELIVERY_STOP = EventType('delivery.stop', "  -> Going to {stop}")
+DELIVERY_DONE = EventType('delivery.done', "Route Complete.", SUMMARY)
+
+def run_advanced_delivery(num_deliveries: int = 4, area: int = 8):
+    # Deliveries beyond the fixed four are drawn at random inside area x area.
+    # Returns {'route_length'} (Manhattan, from the depot) for benchmarking.
+    tracer.emit(TASK, 10, "Advanced Delivery Talkers (VRP Heuristic)")
     # Nearest Neighbor Heuristic
     
     depot = (0,0)
     truck_pos = depot
-    deliveries = [(2,3), (5,1), (1,4), (6,6)]
+    deliveries = [(2,3), (5,1), (1,4), (6,6)][:num_deliveries]
+    for _ in range(len(deliveries), num_deliveries):
+        deliveries.append((random.randint(0, area - 1), random.randint(0, area - 1)))
+    route_length = 0
     
-    print(f"Start at {depot}. Deliveries: {deliveries}")
+    tracer.emit(DELIVERY_START, depot, list(deliveries))
     
     route = []
     current = truck_pos
@@ -621,11 +1127,13 @@ def run_advanced_delivery():
         # Find nearest
         nearest = min(deliveries, key=lambda p: abs(p[0]-current[0]) + abs(p[1]-current[1]))
         route.append(nearest)
-        print(f"  -> Going to {nearest}")
+        route_length += abs(nearest[0]-current[0]) + abs(nearest[1]-current[1])
+        tracer.emit(DELIVERY_STOP, nearest)
         current = nearest
         deliveries.remove(nearest)
         
-    print("Route Complete.")
+    tracer.emit(DELIVERY_DONE)
+    return {'route_length': route_length}
 
 # ==========================================
 # Main Menu
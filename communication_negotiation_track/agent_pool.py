@@ -0,0 +1,83 @@
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+
+class AgentPool:
+    # Struct-of-arrays agent storage: one typed NumPy column per attribute
+    # (pool.fuel, pool.pos, ...), so per-step updates are column operations
+    # and 10^6 agents cost a few bytes each. pool[i] returns an AgentView for
+    # code written against per-agent objects or dicts.
+    def __init__(self, size: int, **columns):
+        self._size = size
+        self._columns: Dict[str, np.ndarray] = {}
+        for name, spec in columns.items():
+            self.add_column(name, spec)
+
+    def add_column(self, name: str, spec, fill=0):
+        # spec is either initial values (one per agent) or a dtype filled with `fill`
+        if isinstance(spec, (np.ndarray, list, tuple)):
+            column = np.asarray(spec)
+            if column.shape[:1] != (self._size,):
+                raise ValueError(f"column {name!r} has {len(column)} rows, pool has {self._size}")
+        else:
+            column = np.full(self._size, fill, dtype=spec)
+        self._columns[name] = column
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns.values())
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get('_columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index: int) -> 'AgentView':
+        if not -self._size <= index < self._size:
+            raise IndexError(index)
+        return AgentView(self, index % self._size)
+
+    def __iter__(self) -> Iterator['AgentView']:
+        return (AgentView(self, i) for i in range(self._size))
+
+
+class AgentView:
+    # One agent's row. Reads return Python scalars and writes go straight to
+    # the pool's columns; both view.fuel and view['fuel'] work.
+    __slots__ = ('_pool', '_index')
+
+    def __init__(self, pool: AgentPool, index: int):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_index', index)
+
+    def __getitem__(self, name: str):
+        return self._pool._columns[name][self._index].item()
+
+    def __setitem__(self, name: str, value):
+        self._pool._columns[name][self._index] = value
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value):
+        if name not in self._pool._columns:
+            raise AttributeError(name)
+        self[name] = value
+
+    def as_dict(self) -> dict:
+        return {name: self[name] for name in self._pool._columns}
+
+    def __repr__(self):
+        return f"AgentView({self._index}, {self.as_dict()})"
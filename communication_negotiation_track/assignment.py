@@ -0,0 +1,189 @@
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Optimal batch allocation for the task-division and cleaner scripts. The
+# rows of a cost matrix are agents, the columns are tasks / zones.
+
+
+def linear_assignment(cost) -> Tuple[np.ndarray, np.ndarray]:
+    # Rectangular linear assignment: match min(rows, cols) pairs, each row and
+    # column at most once, minimizing the total cost. Returns (rows, cols)
+    # sorted by row. Shortest augmenting paths with dual potentials (the
+    # Jonker-Volgenant scheme): one Dijkstra-like search per row of the
+    # smaller side, each step vectorized over all columns. O(n^2 m) worst case.
+    # np.inf marks forbidden pairs; ValueError if no complete matching exists.
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim != 2:
+        raise ValueError(f"cost matrix must be 2-D, got shape {cost.shape}")
+    if np.isnan(cost).any() or np.isneginf(cost).any():
+        raise ValueError("cost matrix contains NaN or -inf")
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    nr, nc = cost.shape
+    if nr == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    cost = np.ascontiguousarray(cost)
+
+    u = np.zeros(nr)
+    v = np.zeros(nc)
+    col4row = np.full(nr, -1, dtype=np.int64)
+    row4col = np.full(nc, -1, dtype=np.int64)
+    shortest = np.empty(nc)
+    path = np.empty(nc, dtype=np.int64)
+    remaining = np.empty(nc, dtype=bool)
+    reached = np.empty(nc, dtype=bool)
+
+    for cur_row in range(nr):
+        shortest.fill(np.inf)
+        path.fill(-1)
+        remaining.fill(True)
+        reached.fill(False)
+        visited = []
+        min_val = 0.0
+        i = cur_row
+        sink = -1
+        while sink < 0:
+            visited.append(i)
+            r = min_val + cost[i] - u[i] - v
+            better = remaining & (r < shortest)
+            path[better] = i
+            shortest[better] = r[better]
+            candidates = np.where(remaining, shortest, np.inf)
+            j = int(candidates.argmin())
+            min_val = candidates[j]
+            if min_val == np.inf:
+                raise ValueError("cost matrix is infeasible")
+            if row4col[j] >= 0:
+                # Among equally short columns prefer a free one: ends the search
+                free = np.flatnonzero((candidates == min_val) & (row4col < 0))
+                if free.size:
+                    j = int(free[0])
+            reached[j] = True
+            remaining[j] = False
+            if row4col[j] < 0:
+                sink = j
+            else:
+                i = int(row4col[j])
+
+        # Update the potentials so reduced costs stay non-negative
+        u[cur_row] += min_val
+        if len(visited) > 1:
+            rows = np.array(visited[1:])
+            u[rows] += min_val - shortest[col4row[rows]]
+        v[reached] -= min_val - shortest[reached]
+
+        # Augment along the path back to cur_row
+        j = sink
+        while True:
+            i = int(path[j])
+            row4col[j] = i
+            col4row[i], j = j, int(col4row[i])
+            if i == cur_row:
+                break
+
+    if transposed:
+        order = np.argsort(col4row)
+        return col4row[order], order.astype(np.int64)
+    return np.arange(nr, dtype=np.int64), col4row
+
+
+def assign_with_capacity(cost, capacity: Union[int, Sequence[int]]) -> np.ndarray:
+    # Min-cost flow with agent capacities: every column goes to exactly one
+    # row, row i taking at most capacity[i] columns. Successive shortest
+    # paths: each new column is routed to a row with room, possibly moving
+    # already placed columns between rows (row -> row arcs cost
+    # cost[k, j] - cost[i, j] for a column j held by i). Dijkstra runs over
+    # rows only, with potentials keeping the arc costs non-negative; rows with
+    # room keep potential 0, so the first one settled ends the search.
+    # Returns the row chosen for each column.
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim != 2:
+        raise ValueError(f"cost matrix must be 2-D, got shape {cost.shape}")
+    if np.isnan(cost).any() or np.isneginf(cost).any():
+        raise ValueError("cost matrix contains NaN or -inf")
+    num_rows, num_cols = cost.shape
+    caps = np.broadcast_to(np.asarray(capacity, dtype=np.int64), (num_rows,))
+    if np.minimum(caps, num_cols).sum() < num_cols:
+        raise ValueError(f"total capacity {int(np.minimum(caps, num_cols).sum())} < {num_cols} columns")
+
+    owner = np.full(num_cols, -1, dtype=np.int64)
+    room = caps.copy()
+    held = [[] for _ in range(num_rows)]
+    h = np.zeros(num_rows)
+    all_rows = np.arange(num_rows)
+    for col in range(num_cols):
+        dist = cost[:, col] - h
+        parent_row = np.full(num_rows, -1, dtype=np.int64)
+        parent_col = np.full(num_rows, -1, dtype=np.int64)
+        done = np.zeros(num_rows, dtype=bool)
+        settled = []
+        while True:
+            candidates = np.where(done, np.inf, dist)
+            i = int(candidates.argmin())
+            d = candidates[i]
+            if d == np.inf:
+                raise ValueError("cost matrix is infeasible")
+            if room[i] == 0:
+                # Among equally close rows prefer one with room: ends the search
+                free = np.flatnonzero((candidates == d) & (room > 0))
+                if free.size:
+                    i = int(free[0])
+            done[i] = True
+            settled.append(i)
+            if room[i] > 0:
+                break
+            cols = np.array(held[i])
+            moves = cost[:, cols] - cost[i, cols]
+            best = moves.argmin(axis=1)
+            via = d + moves[all_rows, best] + h[i] - h
+            better = ~done & (via < dist)
+            dist[better] = via[better]
+            parent_row[better] = i
+            parent_col[better] = cols[best[better]]
+
+        rows = np.array(settled)
+        h[rows] -= d - dist[rows]
+
+        # Shift columns one row along the path, then place the new one
+        k = i
+        room[k] -= 1
+        while parent_row[k] >= 0:
+            i, j = int(parent_row[k]), int(parent_col[k])
+            held[i].remove(j)
+            held[k].append(j)
+            owner[j] = k
+            k = i
+        held[k].append(col)
+        owner[col] = k
+    return owner
+
+
+def greedy_assignment(cost, capacity: Optional[Union[int, Sequence[int]]] = 1) -> np.ndarray:
+    # The scripts' existing rule, vectorized: walk (row, column) pairs in
+    # order of cost and take each one whose column is open and whose row has
+    # capacity left. Returns the row for each column, -1 if none had room.
+    cost = np.asarray(cost, dtype=np.float64)
+    num_rows, num_cols = cost.shape
+    left = np.broadcast_to(np.asarray(num_cols if capacity is None else capacity, dtype=np.int64),
+                           (num_rows,)).copy()
+    result = np.full(num_cols, -1, dtype=np.int64)
+    open_cols = num_cols
+    order = np.argsort(cost, axis=None, kind='stable')
+    for flat in order.tolist():
+        i, j = divmod(flat, num_cols)
+        if result[j] < 0 and left[i] > 0:
+            result[j] = i
+            left[i] -= 1
+            open_cols -= 1
+            if open_cols == 0 or not left.any():
+                break
+    return result
+
+
+def total_cost(cost, owners: np.ndarray) -> float:
+    # Sum of cost[owner, column] over assigned columns
+    cost = np.asarray(cost, dtype=np.float64)
+    cols = np.flatnonzero(owners >= 0)
+    return float(cost[owners[cols], cols].sum())
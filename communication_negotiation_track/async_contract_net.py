@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import math
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from advanced_communication_negotiation import CNPWorker
+
+# Contract Net with many CFPs in flight. The manager announces each task to
+# every worker, collects bids until the CFP's deadline (later bids are
+# dropped), awards the lowest bid and rejects the rest. Workers are
+# coroutines that answer after a simulated network + thinking delay and
+# update their load when an award arrives.
+
+
+class LatencyModel:
+    # Local stand-in for message latency: lognormal delays with the given
+    # median, plus a small chance of a straggler taking `slow_factor` times
+    # longer. Seeded, so runs are repeatable up to event-loop scheduling.
+    def __init__(self, median_ms: float = 5.0, sigma: float = 0.5, slow_rate: float = 0.02,
+                 slow_factor: float = 10.0, seed: int = 0):
+        self.mu = math.log(median_ms / 1e3)
+        self.sigma = sigma
+        self.slow_rate = slow_rate
+        self.slow_factor = slow_factor
+        self.rng = random.Random(seed)
+
+    def sample(self) -> float:
+        delay = self.rng.lognormvariate(self.mu, self.sigma)
+        if self.rng.random() < self.slow_rate:
+            delay *= self.slow_factor
+        return delay
+
+
+class AsyncCNPWorker(CNPWorker):
+    # A CNPWorker answering CFPs and awards over a simulated network. Bids
+    # price in the load at the time of bidding, so with concurrent CFPs a
+    # worker may win several tasks on the strength of one stale load.
+    __slots__ = ('latency', 'won', 'rejected')
+
+    def __init__(self, agent_id: int, skills: Dict[str, float], latency: LatencyModel):
+        super().__init__(agent_id, skills)
+        self.latency = latency
+        self.won = 0
+        self.rejected = 0
+
+    async def on_cfp(self, task_type: str, difficulty: int) -> float:
+        await asyncio.sleep(self.latency.sample())
+        return self.evaluate_cfp(task_type, difficulty)
+
+    async def on_award(self, cost: float):
+        await asyncio.sleep(self.latency.sample())
+        self.assign_task(cost)
+        self.won += 1
+
+    async def on_reject(self):
+        await asyncio.sleep(self.latency.sample())
+        self.rejected += 1
+
+
+class AsyncManager:
+    # Runs at most `concurrency` CFPs at a time. A CFP that gets no bid before
+    # its deadline is announced again, up to `retries` times. Award latency
+    # is measured from the first announcement until the winner has
+    # acknowledged the award; rejections are sent without waiting for them.
+    def __init__(self, workers: Sequence[AsyncCNPWorker], concurrency: int = 16, deadline: float = 0.02,
+                 retries: int = 2):
+        self.workers = list(workers)
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self.retries = retries
+        self.latencies: List[float] = []
+        self.awards: List[Tuple[int, int, float]] = []  # (task, worker id, cost)
+        self.unawarded: List[int] = []
+        self.bids_received = 0
+        self.bids_late = 0
+        self.reannounced = 0
+        self._background = set()
+
+    async def collect_bids(self, task_type: str, difficulty: int) -> List[Tuple[float, AsyncCNPWorker]]:
+        if not self.workers:
+            return []
+        pending = [asyncio.create_task(w.on_cfp(task_type, difficulty)) for w in self.workers]
+        await asyncio.wait(pending, timeout=self.deadline)
+        bids = []
+        for worker, bid in zip(self.workers, pending):
+            if bid.done():
+                bids.append((bid.result(), worker))
+            else:
+                bid.cancel()
+                self.bids_late += 1
+        self.bids_received += len(bids)
+        return bids
+
+    async def contract(self, task_id: int, task_type: str, difficulty: int, slots: asyncio.Semaphore):
+        async with slots:
+            t0 = time.perf_counter()
+            for _ in range(self.retries + 1):
+                bids = await self.collect_bids(task_type, difficulty)
+                if bids:
+                    break
+                self.reannounced += 1
+            else:
+                self.unawarded.append(task_id)
+                return
+            best_bid, winner = min(bids, key=lambda x: x[0])
+            for _, w in bids:
+                if w is not winner:
+                    reply = asyncio.create_task(w.on_reject())
+                    self._background.add(reply)
+                    reply.add_done_callback(self._background.discard)
+            await winner.on_award(best_bid)
+            self.latencies.append(time.perf_counter() - t0)
+            self.awards.append((task_id, winner.agent_id, best_bid))
+
+    async def run(self, tasks: Sequence[Tuple[str, int]]) -> Dict[str, float]:
+        slots = asyncio.Semaphore(self.concurrency)
+        t0 = time.perf_counter()
+        await asyncio.gather(*(self.contract(i, t, d, slots) for i, (t, d) in enumerate(tasks)))
+        elapsed = time.perf_counter() - t0
+        if self._background:
+            await asyncio.gather(*self._background)
+        latencies = np.array(self.latencies) * 1e3 if self.latencies else np.zeros(1)
+        return {
+            'tasks': len(tasks),
+            'awarded': len(self.awards),
+            'unawarded': len(self.unawarded),
+            'elapsed_s': elapsed,
+            'awards_per_s': len(self.awards) / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'late_bids': self.bids_late,
+            'reannounced': self.reannounced,
+            'total_cost': sum(cost for _, _, cost in self.awards),
+            'max_load': max((w.load for w in self.workers), default=0.0),
+        }
+
+
+def make_scenario(num_workers: int, num_tasks: int, seed: int = 0, latency: Optional[LatencyModel] = None
+                  ) -> Tuple[List[AsyncCNPWorker], List[Tuple[str, int]]]:
+    # Same skills and task mix as run_advanced_task_division's random extras
+    rng = random.Random(seed)
+    latency = latency or LatencyModel(seed=seed)
+    workers = [AsyncCNPWorker(i + 1, {'coding': rng.uniform(0.5, 1.5), 'testing': rng.uniform(0.5, 1.5)}, latency)
+               for i in range(num_workers)]
+    tasks = [(rng.choice(['coding', 'testing', 'design']), rng.randint(5, 20)) for _ in range(num_tasks)]
+    return workers, tasks
+
+
+def run_async_task_division(num_workers: int = 20, num_tasks: int = 500, concurrency: int = 16,
+                            deadline_ms: float = 20.0, median_ms: float = 5.0, retries: int = 2,
+                            seed: int = 0) -> Dict[str, float]:
+    workers, tasks = make_scenario(num_workers, num_tasks, seed, LatencyModel(median_ms, seed=seed))
+    manager = AsyncManager(workers, concurrency, deadline_ms / 1e3, retries)
+    return asyncio.run(manager.run(tasks))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asynchronous Contract Net throughput and latency")
+    parser.add_argument('--workers', type=int, default=20)
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64, 256])
+    parser.add_argument('--deadline-ms', type=float, default=20.0)
+    parser.add_argument('--median-ms', type=float, default=5.0)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'inflight':>8} {'awarded':>7} {'late':>6} {'re-cfp':>6} {'tasks/s':>9} {'p50_ms':>7} {'p99_ms':>7} "
+          f"{'cost':>9} {'max_load':>8}")
+    for c in args.concurrency:
+        r = run_async_task_division(args.workers, args.tasks, c, args.deadline_ms, args.median_ms,
+                                    args.retries, args.seed)
+        print(f"{c:>8} {r['awarded']:>7} {r['late_bids']:>6} {r['reannounced']:>6} {r['awards_per_s']:>9.1f} {r['p50_ms']:>7.1f} "
+              f"{r['p99_ms']:>7.1f} {r['total_cost']:>9.1f} {r['max_load']:>8.1f}")
@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+from grid_search import GridSearch, make_blocked
+
+Cell = Tuple[int, int]
+
+# Below this many queries the pool's startup and IPC cost more than the planning
+MIN_PARALLEL_BATCH = 32
+
+# Per worker process: the last grid attached, so each batch copies it in only once
+_worker_grid = {'name': None, 'core': None}
+
+
+def _plan_chunk(shm_name: str, grid_size: int, target: Cell, starts: Sequence[Cell]) -> List[List[Cell]]:
+    if _worker_grid['name'] != shm_name:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            core = GridSearch(grid_size, grid_size)
+            core.blocked[:] = shm.buf[:len(core.blocked)]
+        finally:
+            shm.close()
+        _worker_grid['name'] = shm_name
+        _worker_grid['core'] = core
+    core = _worker_grid['core']
+    return [core.astar(start, target) for start in starts]
+
+
+def plan_paths_batch(agents, target: Cell, obstacles, executor: Optional[Executor] = None,
+                     max_workers: Optional[int] = None, min_parallel: int = MIN_PARALLEL_BATCH) -> List[List[Cell]]:
+    # A* paths for many agents sharing one read-only obstacle grid, in agent order.
+    # The padded grid is placed in shared memory once; workers copy it on their
+    # first chunk and only receive start cells afterwards. Small batches, or
+    # agents using a non-A* search mode, plan serially via MazeAgent.plan_path.
+    # max_workers (default: CPU count) sizes the chunks and any pool created
+    # here; pass the size of `executor` along with it.
+    if not agents:
+        return []
+    workers = max_workers if max_workers is not None else os.cpu_count() or 1
+    if (len(agents) < min_parallel or workers < 2
+            or any(getattr(agent, 'search', 'astar') != 'astar' for agent in agents)):
+        return [agent.plan_path(target, obstacles) for agent in agents]
+
+    grid_size = agents[0].grid_size
+    blocked = make_blocked(grid_size, obstacles)
+    shm = shared_memory.SharedMemory(create=True, size=len(blocked))
+    own_executor = executor is None
+    try:
+        shm.buf[:len(blocked)] = blocked
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        starts = [agent.pos for agent in agents]
+        chunk = max(1, len(starts) // (workers * 4))
+        futures = [executor.submit(_plan_chunk, shm.name, grid_size, target, starts[i:i + chunk])
+                   for i in range(0, len(starts), chunk)]
+        paths = []
+        for future in futures:
+            paths.extend(future.result())
+        return paths
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+        shm.close()
+        shm.unlink()
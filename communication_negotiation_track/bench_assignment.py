@@ -0,0 +1,67 @@
+import argparse
+import time
+
+import numpy as np
+
+from assignment import assign_with_capacity, greedy_assignment, linear_assignment, total_cost
+
+# Greedy sorted-bid allocation (03 / 08) vs the optimal allocator on random
+# cost matrices: total cost, improvement and solve time, averaged over seeds.
+# 'zones' is one zone per cleaner (Manhattan distances on a grid); 'tasks' is
+# agents x 4*agents tasks with an even capacity per agent (skill x difficulty).
+
+
+def make_case(kind: str, n: int, rng: np.random.Generator):
+    if kind == 'zones':
+        side = max(10, int(np.sqrt(n) * 4))
+        agents = rng.integers(0, side, (n, 2))
+        zones = rng.integers(0, side, (n, 2))
+        cost = np.abs(agents[:, None, :] - zones[None, :, :]).sum(axis=2).astype(np.float64)
+        return cost, 1
+    num_tasks = 4 * n
+    skills = rng.uniform(0.5, 2.0, (n, 3))
+    types = rng.integers(0, 3, num_tasks)
+    difficulty = rng.integers(1, 11, num_tasks)
+    return skills[:, types] * difficulty, 4
+
+
+def run_case(kind: str, n: int, seeds):
+    greedy_cost, optimal_cost, greedy_s, optimal_s = 0.0, 0.0, 0.0, 0.0
+    for seed in seeds:
+        cost, capacity = make_case(kind, n, np.random.default_rng(seed))
+        t0 = time.perf_counter()
+        greedy = greedy_assignment(cost, capacity)
+        t1 = time.perf_counter()
+        if capacity == 1:
+            rows, cols = linear_assignment(cost)
+            optimal = np.full(cost.shape[1], -1, dtype=np.int64)
+            optimal[cols] = rows
+        else:
+            optimal = assign_with_capacity(cost, capacity)
+        t2 = time.perf_counter()
+        greedy_cost += total_cost(cost, greedy)
+        optimal_cost += total_cost(cost, optimal)
+        greedy_s += t1 - t0
+        optimal_s += t2 - t1
+    k = len(seeds)
+    return greedy_cost / k, optimal_cost / k, greedy_s / k, optimal_s / k
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch assignment benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500, 1000, 2000])
+    parser.add_argument('--kinds', nargs='+', choices=['zones', 'tasks'], default=['zones', 'tasks'])
+    parser.add_argument('--seeds', type=int, default=3)
+    args = parser.parse_args()
+
+    seeds = range(args.seeds)
+    print(f"{'kind':>6} {'agents':>6} {'cols':>6} {'greedy':>11} {'optimal':>11} {'saved':>7} "
+          f"{'greedy_s':>9} {'optimal_s':>9}")
+    for kind in args.kinds:
+        for n in args.sizes:
+            if kind == 'tasks' and n > 500:
+                continue  # 500 agents x 2000 tasks already takes ~10s
+            greedy, optimal, greedy_s, optimal_s = run_case(kind, n, seeds)
+            cols = n if kind == 'zones' else 4 * n
+            print(f"{kind:>6} {n:>6} {cols:>6} {greedy:>11.1f} {optimal:>11.1f} "
+                  f"{(greedy - optimal) / greedy:>7.1%} {greedy_s:>9.3f} {optimal_s:>9.3f}")
@@ -0,0 +1,56 @@
+import argparse
+import importlib
+import random
+import time
+
+from bench_mapf import make_instance
+from event_trace import tracer
+
+chat = importlib.import_module('04_chat_to_plan')
+
+# Per-tick propose/vote vs windowed cooperative planning (WHCA*) in
+# run_chat_to_plan on open square grids with distinct random starts and
+# goals, averaged over seeds: agents at their goal, ticks used, wait steps
+# (agent-ticks standing still short of the goal), agent-ticks sharing a cell,
+# and wall time per tick.
+
+
+def run_case(planner: str, size: int, num_agents: int, steps: int, seeds, window: int, replan_every: int):
+    reached, ticks, waits, collisions, elapsed = 0, 0, 0, 0, 0.0
+    for seed in seeds:
+        random.seed(seed)
+        _, starts, goals = make_instance(size, num_agents, 0.0, seed)
+        agents = [chat.NavAgent(i + 1, s, g) for i, (s, g) in enumerate(zip(starts, goals))]
+        t0 = time.perf_counter()
+        result = chat.run_chat_to_plan(agents, steps=steps, planner=planner, grid_size=size, window=window,
+                                       replan_every=replan_every)
+        elapsed += (time.perf_counter() - t0) / max(result['steps'], 1)
+        reached += result['reached']
+        ticks += result['steps']
+        waits += result['waits']
+        collisions += result['collisions']
+    n = len(seeds)
+    return reached / n, ticks / n, waits / n, collisions / n, elapsed / n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chat-to-plan benchmark: voting vs windowed planning")
+    parser.add_argument('--size', type=int, default=32)
+    parser.add_argument('--agents', type=int, nargs='+', default=[2, 20, 80])
+    parser.add_argument('--steps', type=int, nargs='+', default=[100, 400], help="run lengths (ticks)")
+    parser.add_argument('--window', type=int, default=8)
+    parser.add_argument('--replan-every', type=int, default=4)
+    parser.add_argument('--seeds', type=int, default=3)
+    args = parser.parse_args()
+    tracer.quiet()
+
+    seeds = range(args.seeds)
+    print(f"{'agents':>6} {'steps':>6} {'planner':>7} {'reached':>8} {'ticks':>7} {'waits':>8} {'collide':>8} "
+          f"{'ms/tick':>8}")
+    for k in args.agents:
+        for steps in args.steps:
+            for planner in ('vote', 'whca'):
+                reached, ticks, waits, collisions, per_tick = run_case(planner, args.size, k, steps, seeds,
+                                                                       args.window, args.replan_every)
+                print(f"{k:>6} {steps:>6} {planner:>7} {reached:>8.1f} {ticks:>7.1f} {waits:>8.1f} "
+                      f"{collisions:>8.1f} {1e3 * per_tick:>8.3f}")
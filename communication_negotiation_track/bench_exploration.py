@@ -0,0 +1,46 @@
+import argparse
+import random
+import time
+
+from advanced_communication_negotiation import run_advanced_maze, tracer
+
+# Random walk vs coordinated frontier exploration in run_advanced_maze:
+# steps until the treasure is first sensed and cells known at that point,
+# averaged over fixed seeds. Runs that never find it count as max_steps.
+
+def run_case(explore: str, grid_size: int, num_agents: int, density: float, seeds, max_steps: int):
+    found, steps, cells, elapsed = 0, 0, 0, 0.0
+    num_obstacles = int(grid_size * grid_size * density)
+    for seed in seeds:
+        random.seed(seed)
+        t0 = time.perf_counter()
+        result = run_advanced_maze(grid_size=grid_size, num_obstacles=num_obstacles, num_agents=num_agents,
+                                   max_steps=max_steps, use_grid=True, use_log=True, explore=explore)
+        elapsed += time.perf_counter() - t0
+        if result['found_step'] is not None:
+            found += 1
+            steps += result['found_step'] + 1
+        else:
+            steps += max_steps
+        cells += result['cells_known']
+    n = len(seeds)
+    return found / n, steps / n, cells / n, elapsed / n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maze exploration benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 32, 64])
+    parser.add_argument('--agents', type=int, nargs='+', default=[2, 8])
+    parser.add_argument('--density', type=float, default=0.2)
+    parser.add_argument('--seeds', type=int, default=20)
+    parser.add_argument('--max-steps', type=int, default=2000)
+    args = parser.parse_args()
+    tracer.quiet()
+
+    seeds = range(args.seeds)
+    print(f"{'size':>5} {'agents':>6} {'explore':>9} {'found':>6} {'steps':>8} {'cells':>8} {'time_s':>8}")
+    for n in args.sizes:
+        for k in args.agents:
+            for explore in ('random', 'frontier'):
+                rate, steps, cells, elapsed = run_case(explore, n, k, args.density, seeds, args.max_steps)
+                print(f"{n:>5} {k:>6} {explore:>9} {rate:>6.0%} {steps:>8.1f} {cells:>8.1f} {elapsed:>8.3f}")
@@ -0,0 +1,88 @@
+import argparse
+import time
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from conflict_based_search import CBSSolver
+from grid_search import Cell, get_search_core
+from safe_interval_planner import find_conflict, plan_prioritized
+
+# Multi-agent path finding on random 2D grids with distinct random starts and
+# goals: agents planned, conflicts left in the joint plan, sum of arrival
+# times and wall time, averaged over seeds.
+#   space_time  prioritized A* over (time, cell) with a reservation set, as
+#               in run_advanced_chat_to_plan (vertex reservations only, goals
+#               held until the horizon)
+#   sipp        prioritized safe interval planning (vertex + swap, no horizon)
+#   cbs         Conflict-Based Search with conflict prioritization and
+#               bypass: optimal, but all agents or none within --time-limit
+#   cbs_basic   CBS without either improvement
+
+
+def make_instance(size: int, num_agents: int, density: float, seed: int):
+    rng = np.random.default_rng(seed)
+    mask = rng.random((size, size)) < density
+    free = np.argwhere(~mask)
+    pick = rng.choice(len(free), 2 * num_agents, replace=False)
+    cells = [(int(r), int(c)) for r, c in free[pick]]
+    return mask, cells[:num_agents], cells[num_agents:]
+
+
+def plan_space_time(core, starts: Sequence[Cell], goals: Sequence[Cell], horizon: int) -> List[List[Tuple[int, Cell]]]:
+    reserved = set()
+    paths = []
+    for start, goal in zip(starts, goals):
+        path = core.astar_space_time(start, goal, reserved, horizon)
+        for t, cell in path:
+            reserved.add(core.state_id(t, cell))
+        if path:
+            for t in range(path[-1][0] + 1, horizon + 1):
+                reserved.add(core.state_id(t, goal))
+        paths.append(path)
+    return paths
+
+
+def run_case(method: str, size: int, num_agents: int, density: float, seeds, time_limit: float = 10.0):
+    planned, solved, conflicted, cost, elapsed = 0, 0, 0, 0, 0.0
+    for seed in seeds:
+        mask, starts, goals = make_instance(size, num_agents, density, seed)
+        core = get_search_core(size, size)
+        core.load_obstacles(mask)
+        t0 = time.perf_counter()
+        if method == 'space_time':
+            paths = plan_space_time(core, starts, goals, horizon=4 * size)
+        elif method == 'sipp':
+            paths = plan_prioritized(core, starts, goals)
+        else:
+            solver = CBSSolver(core, prioritize=method == 'cbs', bypass=method == 'cbs')
+            paths = solver.solve(starts, goals, time_limit=time_limit) or [[] for _ in starts]
+        elapsed += time.perf_counter() - t0
+        planned += sum(1 for p in paths if p)
+        solved += all(paths)
+        conflicted += find_conflict(paths) is not None
+        cost += sum(p[-1][0] for p in paths if p)
+    n = len(seeds)
+    return planned / n, solved / n, conflicted / n, cost / n, elapsed / n
+
+
+METHODS = ('space_time', 'sipp', 'cbs', 'cbs_basic')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-agent path finding benchmark")
+    parser.add_argument('--size', type=int, default=32)
+    parser.add_argument('--agents', type=int, nargs='+', default=[10, 20, 40, 80])
+    parser.add_argument('--density', type=float, default=0.1)
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--time-limit', type=float, default=10.0, help="per CBS instance, seconds")
+    args = parser.parse_args()
+
+    seeds = range(args.seeds)
+    print(f"{'agents':>6} {'method':>10} {'planned':>8} {'success':>8} {'conflict':>8} {'cost':>9} {'time_s':>8}")
+    for k in args.agents:
+        for method in args.methods:
+            planned, solved, conflicted, cost, elapsed = run_case(method, args.size, k, args.density, seeds,
+                                                                  args.time_limit)
+            print(f"{k:>6} {method:>10} {planned:>8.1f} {solved:>8.0%} {conflicted:>8.0%} {cost:>9.1f} "
+                  f"{elapsed:>8.3f}")
@@ -0,0 +1,54 @@
+import argparse
+import random
+import time
+
+from advanced_communication_negotiation import run_advanced_negotiation, tracer
+
+# 1-for-1 offers vs multi-unit bundle offers in run_advanced_negotiation:
+# rounds and messages until no pair of agents has a mutually beneficial
+# k-for-m swap left, averaged over fixed seeds. Runs still inefficient after
+# --max-rounds count as max-rounds.
+
+PROTOCOLS = {
+    'unit': {'protocol': 'unit'},
+    'unit x8': {'protocol': 'unit', 'offers_per_round': 8},
+    'bundle': {'protocol': 'bundle'},
+}
+
+
+def run_case(protocol: str, num_agents: int, num_resources: int, seeds, max_rounds: int):
+    efficient, rounds, messages, utility, elapsed = 0, 0, 0, 0.0, 0.0
+    for seed in seeds:
+        random.seed(seed)
+        t0 = time.perf_counter()
+        result = run_advanced_negotiation(num_agents=num_agents, rounds=max_rounds, num_resources=num_resources,
+                                          stop_when_efficient=True, **PROTOCOLS[protocol])
+        elapsed += time.perf_counter() - t0
+        if result['efficient_round'] is not None:
+            efficient += 1
+        rounds += result['rounds']
+        messages += result['messages']
+        utility += result['total_utility']
+    n = len(seeds)
+    return efficient / n, rounds / n, messages / n, utility / n, elapsed / n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Negotiation protocol benchmark")
+    parser.add_argument('--agents', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--resources', type=int, nargs='+', default=[3, 10, 30])
+    parser.add_argument('--protocols', nargs='+', choices=list(PROTOCOLS), default=list(PROTOCOLS))
+    parser.add_argument('--seeds', type=int, default=10)
+    parser.add_argument('--max-rounds', type=int, default=500)
+    args = parser.parse_args()
+    tracer.quiet()
+
+    seeds = range(args.seeds)
+    print(f"{'agents':>6} {'res':>4} {'protocol':>9} {'efficient':>9} {'rounds':>8} {'messages':>9} "
+          f"{'utility':>9} {'time_s':>8}")
+    for k in args.agents:
+        for r in args.resources:
+            for protocol in args.protocols:
+                rate, rounds, messages, utility, elapsed = run_case(protocol, k, r, seeds, args.max_rounds)
+                print(f"{k:>6} {r:>4} {protocol:>9} {rate:>9.0%} {rounds:>8.1f} {messages:>9.1f} "
+                      f"{utility:>9.2f} {elapsed:>8.3f}")
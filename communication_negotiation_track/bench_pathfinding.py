@@ -0,0 +1,68 @@
+import argparse
+import time
+
+import numpy as np
+
+from advanced_communication_negotiation import MazeAgent
+
+# Compare MazeAgent planners (A*, Jump Point Search, ALT landmarks) on open,
+# cluttered and walled grids: node expansions, wall time and path length from
+# corner to corner. Index build time (ALT) is reported separately.
+
+MAPS = ('open', 'clutter10', 'clutter25', 'walls')
+
+
+def make_obstacles(kind: str, grid_size: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = grid_size
+    if kind == 'open':
+        mask = np.zeros((n, n), dtype=bool)
+    elif kind.startswith('clutter'):
+        mask = rng.random((n, n)) < int(kind[len('clutter'):]) / 100
+    else:
+        # Long alternating walls with one gap each: a serpentine maze
+        mask = np.zeros((n, n), dtype=bool)
+        for k, r in enumerate(range(3, n - 1, 4)):
+            mask[r, :] = True
+            gap = int(rng.integers(1, n // 8)) if k % 2 else n - 2 - int(rng.integers(0, n // 8))
+            mask[r - 1:r + 2, gap - 1:gap + 2] = False
+    mask[0, 0] = mask[-1, -1] = False
+    return mask
+
+
+def time_planner(search: str, grid_size: int, obstacles: np.ndarray):
+    agent = MazeAgent(0, (0, 0), grid_size, search=search)
+    goal = (grid_size - 1, grid_size - 1)
+    build = 0.0
+    if search == 'alt':
+        t0 = time.perf_counter()
+        agent.plan_path(goal, obstacles)
+        build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    path = agent.plan_path(goal, obstacles)
+    return time.perf_counter() - t0, agent.expansions, len(path), build
+
+
+def run_benchmark(sizes, maps, planners, seed: int = 0):
+    print(f"{'size':>6} {'map':>10} {'planner':>8} {'expanded':>10} {'time_s':>9} {'length':>7}")
+    for n in sizes:
+        for kind in maps:
+            obstacles = make_obstacles(kind, n, seed)
+            lengths = set()
+            for search in planners:
+                elapsed, expanded, length, build = time_planner(search, n, obstacles)
+                lengths.add(length)
+                extra = f"  (index build {build:.3f}s)" if build else ""
+                print(f"{n:>6} {kind:>10} {search:>8} {expanded:>10} {elapsed:>9.3f} {length:>7}{extra}")
+            if len(lengths) != 1:
+                print(f"  MISMATCH: path lengths differ {sorted(lengths)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid planner benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[128, 512, 2048])
+    parser.add_argument('--maps', nargs='+', default=list(MAPS), choices=MAPS)
+    parser.add_argument('--planners', nargs='+', default=['astar', 'jps', 'alt'], choices=['astar', 'jps', 'alt'])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.maps, args.planners, args.seed)
@@ -0,0 +1,161 @@
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+import advanced_communication_negotiation as tasks
+from event_trace import QUIET
+
+# Benchmark harness for the run_advanced_* tasks. Each task is swept over the
+# scaling knobs it understands (agents, grid, items, rounds) with a fixed seed,
+# timed over warmup + repeats with the event tracer at --trace-level (quiet by
+# default) and any remaining stdout silenced, and written to JSON.
+# Passing --baseline compares against an earlier JSON file: a case regresses
+# when its median time grows past the tolerance or its result dict changes.
+
+# task name -> (function, {knob: keyword argument}, fixed keyword arguments)
+TASKS = {
+    'maze': (tasks.run_advanced_maze,
+             {'agents': 'num_agents', 'grid': 'grid_size', 'rounds': 'max_steps'},
+             {'use_grid': True, 'use_log': True, 'navigate': True}),
+    'negotiation': (tasks.run_advanced_negotiation,
+                    {'agents': 'num_agents', 'items': 'num_resources', 'rounds': 'rounds'}, {}),
+    'market': (tasks.run_advanced_market, {'agents': 'num_agents', 'items': 'num_goods', 'rounds': 'rounds'}, {}),
+    'task_division': (tasks.run_advanced_task_division, {'agents': 'num_workers', 'items': 'num_tasks'}, {}),
+    'chat_to_plan': (tasks.run_advanced_chat_to_plan, {'grid': 'grid_len'}, {}),
+    'auction': (tasks.run_advanced_auction, {'agents': 'num_bidders'}, {}),
+    'disaster_relief': (tasks.run_advanced_disaster_relief,
+                        {'agents': 'num_agents', 'rounds': 'steps', 'grid': 'line_length'}, {}),
+    'messenger': (tasks.run_advanced_messenger, {'agents': 'chain_length'}, {}),
+    'cleaners': (tasks.run_advanced_cleaners, {'agents': 'num_agents', 'items': 'num_zones'}, {}),
+    'language': (tasks.run_advanced_language, {'rounds': 'iterations', 'items': 'num_objects'}, {}),
+    'delivery': (tasks.run_advanced_delivery, {'items': 'num_deliveries', 'grid': 'area'}, {}),
+}
+
+
+def build_cases(names, knobs):
+    # One case per combination of the knob values a task actually uses
+    for name in names:
+        func, mapping, fixed = TASKS[name]
+        used = [k for k in ('agents', 'grid', 'items', 'rounds') if k in mapping]
+        for values in itertools.product(*(knobs[k] for k in used)):
+            params = dict(fixed)
+            params.update({mapping[k]: v for k, v in zip(used, values)})
+            if name == 'maze':
+                params['num_obstacles'] = params['grid_size'] * params['grid_size'] // 5
+            yield name, func, params
+
+
+def time_case(func, params, seed: int, warmup: int, repeats: int):
+    times = []
+    result = None
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(warmup + repeats):
+            random.seed(seed)
+            t0 = time.perf_counter()
+            out = func(**params)
+            elapsed = time.perf_counter() - t0
+            if i >= warmup:
+                times.append(elapsed)
+                result = out
+    return times, result
+
+
+def case_key(case):
+    return case['task'] + ' ' + json.dumps(case['params'], sort_keys=True)
+
+
+def _stable(result):
+    # Timings reported inside a task's result ('..._ms') vary run to run
+    if isinstance(result, dict):
+        return {k: v for k, v in result.items() if not k.endswith('_ms')}
+    return result
+
+
+def compare(results, baseline, tolerance: float, min_delta: float):
+    # Returns the regressed cases as (case, reason) pairs
+    old = {case_key(case): case for case in baseline['results']}
+    regressions = []
+    for case in results:
+        ref = old.get(case_key(case))
+        if ref is None:
+            continue
+        slower = case['median_s'] - ref['median_s']
+        if slower > min_delta and case['median_s'] > ref['median_s'] * (1 + tolerance):
+            regressions.append((case, f"median {ref['median_s'] * 1e3:.2f}ms -> {case['median_s'] * 1e3:.2f}ms"))
+        if _stable(case['result']) != _stable(ref['result']):
+            regressions.append((case, f"result {ref['result']} -> {case['result']}"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the advanced communication/negotiation tasks")
+    parser.add_argument('--tasks', nargs='+', choices=list(TASKS), default=list(TASKS))
+    parser.add_argument('--agents', type=int, nargs='+', default=[2, 16])
+    parser.add_argument('--grid', type=int, nargs='+', default=[10, 32])
+    parser.add_argument('--items', type=int, nargs='+', default=[5, 50])
+    parser.add_argument('--rounds', type=int, nargs='+', default=[20, 100])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--out', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against a JSON file written by --out")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown of the median")
+    parser.add_argument('--min-delta', type=float, default=0.001, help="ignore slowdowns below this many seconds")
+    parser.add_argument('--trace-level', type=int, default=QUIET, help="event tracer verbosity while timing")
+    args = parser.parse_args()
+    tasks.tracer.set_level(args.trace_level)
+
+    knobs = {'agents': args.agents, 'grid': args.grid, 'items': args.items, 'rounds': args.rounds}
+    results = []
+    print(f"{'task':<16} {'params':<60} {'min_ms':>9} {'median_ms':>10}")
+    for name, func, params in build_cases(args.tasks, knobs):
+        times, result = time_case(func, params, args.seed, args.warmup, args.repeats)
+        case = {
+            'task': name,
+            'params': params,
+            'min_s': min(times),
+            'median_s': statistics.median(times),
+            'mean_s': statistics.fmean(times),
+            'result': result,
+        }
+        # Round-trip so results compare equal to ones loaded back from JSON
+        case['result'] = json.loads(json.dumps(result))
+        results.append(case)
+        shown = ', '.join(f"{k}={v}" for k, v in params.items() if not isinstance(v, bool))
+        print(f"{name:<16} {shown:<60} {case['min_s'] * 1e3:>9.2f} {case['median_s'] * 1e3:>10.2f}")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'warmup': args.warmup,
+            'repeats': args.repeats,
+            'trace_level': args.trace_level,
+        },
+        'results': results,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        for case, reason in regressions:
+            print(f"REGRESSION {case['task']} {case['params']}: {reason}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import collections
+import heapq
+import itertools
+import time
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from grid_search import Cell, GridSearch, get_search_core
+
+# Conflict-Based Search (Sharon et al.) for optimal multi-agent path finding
+# on 4-connected grids, minimizing the sum of arrival times. The high level
+# searches a tree of constraint sets; each node re-plans only the agent its
+# new constraint applies to and shares every other path with its parent.
+# Improvements from ICBS (Boyarski et al.):
+#   - conflict prioritization: cardinal conflicts (both agents' costs must
+#     rise, judged from MDDs) are split first, then semi-cardinal ones
+#   - bypass: a child path that costs the same as its parent's but has
+#     fewer conflicts replaces the parent's path instead of branching
+# Paths are lists of flat cell indices, one per timestep; agents stay at
+# their goal after arriving.
+
+Conflict = Tuple[int, int, int, int, int]  # (agent a, agent b, cell, other cell or -1, time)
+Constraint = Tuple[int, int, int]  # (cell, next cell or -1, time)
+
+
+def goal_distances(core: GridSearch, goal: int) -> List[int]:
+    # BFS distance to `goal` from every cell (-1 where unreachable): an exact
+    # heuristic for the unconstrained problem
+    W, blocked = core.width, core.blocked
+    dist = [-1] * core.cells
+    dist[goal] = 0
+    queue = collections.deque([goal])
+    while queue:
+        i = queue.popleft()
+        d = dist[i] + 1
+        for j in (i + W, i - W, i + 1, i - 1):
+            if not blocked[j] and dist[j] < 0:
+                dist[j] = d
+                queue.append(j)
+    return dist
+
+
+class LowLevel:
+    # Space-time A* for one agent under its constraints: vertex (cell, -1, t)
+    # and edge (cell, next, t) = may not move cell -> next between t and t + 1
+    def __init__(self, core: GridSearch):
+        self.core = core
+        self.expansions = 0
+
+    def plan(self, start: int, goal: int, h: List[int], constraints: FrozenSet[Constraint]) -> Optional[List[int]]:
+        if h[start] < 0:
+            return None
+        W, n, blocked = self.core.width, self.core.cells, self.core.blocked
+        # May only stop at the goal after its last vertex constraint there
+        last_goal = max((t for c, nxt, t in constraints if c == goal and nxt < 0), default=-1)
+        latest = max((t for _, _, t in constraints), default=0)
+        limit = latest + len(h) + 1
+        parent = {start: -1}
+        heap = [(h[start], 0, start)]
+        while heap:
+            f, neg_t, state = heapq.heappop(heap)
+            t, cell = divmod(state, n)
+            if cell == goal and t > last_goal:
+                path = []
+                while state >= 0:
+                    path.append(state % n)
+                    state = parent[state]
+                path.reverse()
+                return path
+            if t >= limit:
+                continue
+            self.expansions += 1
+            base = (t + 1) * n
+            for nxt in (cell, cell + W, cell - W, cell + 1, cell - 1):
+                if blocked[nxt] or h[nxt] < 0:
+                    continue
+                s = base + nxt
+                if s in parent:
+                    continue
+                if constraints and ((nxt, -1, t + 1) in constraints or (cell, nxt, t) in constraints):
+                    continue
+                parent[s] = state
+                heapq.heappush(heap, (t + 1 + h[nxt], -(t + 1), s))
+        return None
+
+    def mdd(self, start: int, goal: int, h: List[int], constraints: FrozenSet[Constraint],
+            cost: int) -> List[FrozenSet[int]]:
+        # Cells each optimal (length `cost`) path can occupy at each timestep
+        W, blocked = self.core.width, self.core.blocked
+        layers = [{start}]
+        for t in range(cost):
+            left = cost - t - 1
+            layer = set()
+            for cell in layers[-1]:
+                for nxt in (cell, cell + W, cell - W, cell + 1, cell - 1):
+                    if blocked[nxt] or h[nxt] < 0 or h[nxt] > left:
+                        continue
+                    if constraints and ((nxt, -1, t + 1) in constraints or (cell, nxt, t) in constraints):
+                        continue
+                    layer.add(nxt)
+            layers.append(layer)
+        # Keep only cells that still reach the goal at `cost`
+        keep = [frozenset()] * (cost + 1)
+        keep[cost] = frozenset({goal}) & frozenset(layers[cost])
+        for t in range(cost - 1, -1, -1):
+            nxt_layer = keep[t + 1]
+            keep[t] = frozenset(cell for cell in layers[t]
+                                if any(m in nxt_layer and not (constraints and (cell, m, t) in constraints)
+                                       for m in (cell, cell + W, cell - W, cell + 1, cell - 1)))
+        return keep
+
+
+def _at(path: List[int], t: int) -> int:
+    return path[t] if t < len(path) else path[-1]
+
+
+def find_conflicts(paths: Sequence[List[int]]) -> List[Conflict]:
+    # Every vertex (cell, -1) and swap (cell, other) conflict, earliest first
+    conflicts = []
+    end = max(len(p) for p in paths)
+    for t in range(end):
+        occupant: Dict[int, int] = {}
+        moving: Dict[Tuple[int, int], int] = {}
+        for k, path in enumerate(paths):
+            cell = _at(path, t)
+            other = occupant.get(cell)
+            if other is not None:
+                conflicts.append((other, k, cell, -1, t))
+            else:
+                occupant[cell] = k
+            if t + 1 < end:
+                nxt = _at(path, t + 1)
+                if nxt != cell:
+                    other = moving.get((nxt, cell))
+                    if other is not None:
+                        # other moves nxt -> cell while k moves cell -> nxt
+                        conflicts.append((other, k, nxt, cell, t))
+                    moving[(cell, nxt)] = k
+    return conflicts
+
+
+class Node:
+    __slots__ = ('constraints', 'paths', 'cost', 'conflicts', 'mdds')
+
+    def __init__(self, constraints, paths, mdds):
+        self.constraints: List[FrozenSet[Constraint]] = constraints
+        self.paths: List[List[int]] = paths
+        self.mdds: List[Optional[List[FrozenSet[int]]]] = mdds
+        self.refresh()
+
+    def refresh(self):
+        self.cost = sum(len(p) - 1 for p in self.paths)
+        self.conflicts = find_conflicts(self.paths)
+
+
+class CBSSolver:
+    # solve(starts, goals) -> [(t, cell), ...] per agent, collision-free and
+    # optimal in sum of arrival times, or None if the node or time budget
+    # runs out (or there is no solution).
+    def __init__(self, core: GridSearch, prioritize: bool = True, bypass: bool = True):
+        self.core = core
+        self.prioritize = prioritize
+        self.bypass = bypass
+        self.low = LowLevel(core)
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+
+    def _mdd(self, node: Node, agent: int) -> List[FrozenSet[int]]:
+        if node.mdds[agent] is None:
+            node.mdds[agent] = self.low.mdd(self.starts[agent], self.goals[agent], self.h[agent],
+                                            node.constraints[agent], len(node.paths[agent]) - 1)
+        return node.mdds[agent]
+
+    def _vertex_cardinal(self, node: Node, agent: int, cell: int, t: int) -> bool:
+        # Every optimal path of the agent is at `cell` at time t (after
+        # arriving it sits at its goal)
+        mdd = self._mdd(node, agent)
+        return t >= len(mdd) - 1 or mdd[t] == {cell}
+
+    def _edge_cardinal(self, node: Node, agent: int, frm: int, to: int, t: int) -> bool:
+        # Every optimal path of the agent moves frm -> to at time t
+        mdd = self._mdd(node, agent)
+        return t + 1 < len(mdd) and mdd[t] == {frm} and mdd[t + 1] == {to}
+
+    def _choose(self, node: Node) -> Conflict:
+        if not self.prioritize:
+            return node.conflicts[0]
+        best, best_rank = node.conflicts[0], -1
+        for conflict in node.conflicts:
+            a, b, cell, other, t = conflict
+            if other < 0:
+                rank = self._vertex_cardinal(node, a, cell, t) + self._vertex_cardinal(node, b, cell, t)
+            else:
+                # a moves cell -> other, b moves other -> cell
+                rank = self._edge_cardinal(node, a, cell, other, t) + self._edge_cardinal(node, b, other, cell, t)
+            if rank > best_rank:
+                best, best_rank = conflict, rank
+                if rank == 2:
+                    break
+        return best
+
+    def _child(self, node: Node, agent: int, constraint: Constraint) -> Optional[Node]:
+        constraints = list(node.constraints)
+        constraints[agent] = node.constraints[agent] | {constraint}
+        path = self.low.plan(self.starts[agent], self.goals[agent], self.h[agent], constraints[agent])
+        if path is None:
+            return None
+        paths = list(node.paths)
+        paths[agent] = path
+        mdds = list(node.mdds)
+        mdds[agent] = None
+        self.nodes_generated += 1
+        return Node(constraints, paths, mdds)
+
+    def solve(self, starts: Sequence[Cell], goals: Sequence[Cell], max_nodes: int = 100000,
+              time_limit: Optional[float] = None) -> Optional[List[List[Tuple[int, Cell]]]]:
+        core = self.core
+        self.starts = [core.index(c) for c in starts]
+        self.goals = [core.index(c) for c in goals]
+        if len(set(self.starts)) < len(self.starts) or len(set(self.goals)) < len(self.goals):
+            return None
+        self.h = [goal_distances(core, g) for g in self.goals]
+        self.nodes_expanded = self.nodes_generated = 0
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+        empty = frozenset()
+        paths = []
+        for s, g, h in zip(self.starts, self.goals, self.h):
+            path = self.low.plan(s, g, h, empty)
+            if path is None:
+                return None
+            paths.append(path)
+        root = Node([empty] * len(paths), paths, [None] * len(paths))
+        seq = itertools.count()
+        open_list = [(root.cost, len(root.conflicts), next(seq), root)]
+        while open_list:
+            if self.nodes_expanded >= max_nodes or (deadline is not None and time.perf_counter() > deadline):
+                return None
+            _, _, _, node = heapq.heappop(open_list)
+            if not node.conflicts:
+                return [[(t, core.cell(i)) for t, i in enumerate(p)] for p in node.paths]
+            self.nodes_expanded += 1
+            a, b, cell, other, t = self._choose(node)
+            if other < 0:
+                branches = ((a, (cell, -1, t)), (b, (cell, -1, t)))
+            else:
+                branches = ((a, (cell, other, t)), (b, (other, cell, t)))
+            children = []
+            bypassed = False
+            for agent, constraint in branches:
+                child = self._child(node, agent, constraint)
+                if child is None:
+                    continue
+                if self.bypass and child.cost == node.cost and len(child.conflicts) < len(node.conflicts):
+                    # Same cost, fewer conflicts: adopt the path and retry this node
+                    node.paths[agent] = child.paths[agent]
+                    node.mdds[agent] = child.mdds[agent]
+                    node.refresh()
+                    heapq.heappush(open_list, (node.cost, len(node.conflicts), next(seq), node))
+                    bypassed = True
+                    break
+                children.append(child)
+            if bypassed:
+                continue
+            for child in children:
+                heapq.heappush(open_list, (child.cost, len(child.conflicts), next(seq), child))
+        return None
+
+
+def solve_agents(agents, rows: int, cols: int, obstacles=(), **kwargs) -> Optional[Dict[int, List[Tuple[int, Cell]]]]:
+    # Joint plan for NavAgent-style objects (agent_id, pos, goal) on a
+    # rows x cols grid: {agent_id: [(t, cell), ...]} or None
+    core = get_search_core(rows, cols)
+    core.load_obstacles(obstacles)
+    paths = CBSSolver(core).solve([a.pos for a in agents], [a.goal for a in agents], **kwargs)
+    if paths is None:
+        return None
+    return {a.agent_id: p for a, p in zip(agents, paths)}
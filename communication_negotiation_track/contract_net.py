@@ -0,0 +1,79 @@
+import heapq
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Skill multiplier for a task type a worker has no entry for (CNPWorker.evaluate_cfp)
+DEFAULT_SKILL = 2.0
+LOAD_PENALTY = 0.5
+
+_F64 = struct.Struct('<d')
+_I64 = struct.Struct('<q')
+
+
+class BidIndex:
+    # Finds the Contract Net winner without broadcasting the CFP. A worker's
+    # bid is difficulty * skill + LOAD_PENALTY * load, so for each announced
+    # (task type, difficulty) one min-heap holds every worker keyed on that
+    # bid, ties broken by worker index as min() over the broadcast would.
+    # Loads only grow, so after an award the winner's entries merely
+    # underestimate its bid; they are repaired lazily when they reach the top
+    # of a heap.
+    # Cost: the first announcement of each distinct (type, difficulty) builds
+    # a heap in O(workers) time and memory, and each award leaves one stale
+    # entry in every heap, so an award costs O(H log workers) amortized for H
+    # heaps. That is cheap when difficulties come from a small set (integers
+    # 5..20 in run_advanced_task_division); with arbitrary float
+    # difficulties H grows with the number of tasks and broadcasting the CFP
+    # is no slower.
+    #
+    # Heap items are ints: the IEEE-754 bits of the (positive) bid, which
+    # order like the floats themselves, shifted above the worker index.
+    def __init__(self, skills: Sequence[Dict[str, float]], task_types: Sequence[str]):
+        self.task_types = list(task_types)
+        self.type_index = {t: i for i, t in enumerate(self.task_types)}
+        self.skills = np.array([[s.get(t, DEFAULT_SKILL) for t in self.task_types] for s in skills],
+                               dtype=np.float64).reshape(len(skills), len(self.task_types))
+        self.loads = np.zeros(len(skills))
+        self._skill_rows = self.skills.tolist()
+        self._loads = [0.0] * len(skills)
+        self.idx_bits = max(1, len(skills) - 1).bit_length()
+        self._mask = (1 << self.idx_bits) - 1
+        self.heaps: Dict[Tuple[str, float], List[int]] = {}
+        self.repairs = 0
+
+    def _key(self, bid: float, worker: int) -> int:
+        return (_I64.unpack(_F64.pack(bid))[0] << self.idx_bits) | worker
+
+    def _build(self, task_type: str, difficulty: float) -> List[int]:
+        t = self.type_index[task_type]
+        bids = difficulty * self.skills[:, t] + self.loads * LOAD_PENALTY
+        bits = bids.view(np.int64).tolist()
+        heap = [(b << self.idx_bits) | i for i, b in enumerate(bits)]
+        heapq.heapify(heap)
+        self.heaps[(task_type, difficulty)] = heap
+        return heap
+
+    def best(self, task_type: str, difficulty: float) -> Tuple[int, float]:
+        # (worker index, bid) of the lowest bid, exactly as evaluate_cfp computes it
+        heap = self.heaps.get((task_type, difficulty))
+        if heap is None:
+            heap = self._build(task_type, difficulty)
+        t = self.type_index[task_type]
+        mask, shift = self._mask, self.idx_bits
+        rows, loads = self._skill_rows, self._loads
+        pack, unpack, replace = _F64.pack, _I64.unpack, heapq.heapreplace
+        while True:
+            top = heap[0]
+            worker = top & mask
+            bid = (difficulty * rows[worker][t]) + (loads[worker] * LOAD_PENALTY)
+            key = (unpack(pack(bid))[0] << shift) | worker
+            if key == top:
+                return worker, bid
+            replace(heap, key)
+            self.repairs += 1
+
+    def add_load(self, worker: int, amount: float):
+        self._loads[worker] += amount
+        self.loads[worker] = self._loads[worker]
@@ -0,0 +1,235 @@
+import argparse
+import heapq
+import random
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from advanced_communication_negotiation import CNPWorker
+from contract_net import DEFAULT_SKILL
+
+# Tasks with dependencies, scheduled in time across CNPWorkers. A task of
+# difficulty d and type t takes d * skill multiplier on a worker (the bid of
+# an idle CNPWorker), can start once all its predecessors have finished,
+# and each worker runs one task at a time.
+
+TASK_TYPES = ('coding', 'testing', 'design')
+
+
+class TaskGraph:
+    # n tasks (type index, difficulty) and dependency edges u -> v, stored as
+    # CSR successor lists plus in-degrees
+    def __init__(self, types: Sequence[int], difficulty: Sequence[float], edges: Sequence[Tuple[int, int]],
+                 type_names: Sequence[str] = TASK_TYPES):
+        self.types = np.asarray(types, dtype=np.int64)
+        self.difficulty = np.asarray(difficulty, dtype=np.float64)
+        self.type_names = list(type_names)
+        self.n = len(self.types)
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        order = np.argsort(edges[:, 0], kind='stable')
+        self.src, self.dst = edges[order, 0], edges[order, 1]
+        self.offsets = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.src, minlength=self.n), out=self.offsets[1:])
+        self.indegree = np.bincount(self.dst, minlength=self.n)
+
+    def successors(self, task: int) -> np.ndarray:
+        return self.dst[self.offsets[task]:self.offsets[task + 1]]
+
+    def topological_order(self) -> List[int]:
+        # Kahn's algorithm; ValueError on a cycle
+        indegree = self.indegree.tolist()
+        succ = self._successor_lists()
+        order = [i for i in range(self.n) if indegree[i] == 0]
+        for u in order:
+            for v in succ[u]:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    order.append(v)
+        if len(order) < self.n:
+            raise ValueError("task graph has a cycle")
+        return order
+
+    def _successor_lists(self) -> List[List[int]]:
+        dst, offsets = self.dst.tolist(), self.offsets.tolist()
+        return [dst[offsets[i]:offsets[i + 1]] for i in range(self.n)]
+
+
+def random_dag(num_tasks: int, max_parents: int = 3, window: int = 100, seed: int = 0) -> TaskGraph:
+    # Each task depends on up to max_parents of the `window` tasks before it,
+    # so edges always point forward and chains stay long
+    rng = np.random.default_rng(seed)
+    types = rng.integers(0, len(TASK_TYPES), num_tasks)
+    difficulty = rng.integers(5, 21, num_tasks)
+    counts = rng.integers(0, max_parents + 1, num_tasks)
+    counts[0] = 0
+    child = np.repeat(np.arange(num_tasks), counts)
+    span = np.minimum(child, window)
+    parent = child - 1 - (rng.random(len(child)) * span).astype(np.int64)
+    edges = np.unique(np.stack([parent, child], axis=1), axis=0)
+    return TaskGraph(types, difficulty, edges)
+
+
+def duration_matrix(graph: TaskGraph, workers: Sequence[CNPWorker]) -> np.ndarray:
+    # (tasks, workers) run times: difficulty * skill multiplier
+    skills = np.array([[w.skills.get(t, DEFAULT_SKILL) for t in graph.type_names] for w in workers])
+    return graph.difficulty[:, None] * skills[:, graph.types].T
+
+
+def upward_rank(graph: TaskGraph, durations: np.ndarray) -> np.ndarray:
+    # Critical-path length from each task to the end of the graph, using the
+    # mean run time over workers
+    mean = durations.mean(axis=1).tolist()
+    succ = graph._successor_lists()
+    rank = [0.0] * graph.n
+    for u in reversed(graph.topological_order()):
+        rank[u] = mean[u] + max((rank[v] for v in succ[u]), default=0.0)
+    return np.array(rank)
+
+
+class Schedule:
+    # Per-task worker and [start, finish) times, plus per-worker timelines
+    def __init__(self, num_tasks: int, num_workers: int):
+        self.worker = np.full(num_tasks, -1, dtype=np.int64)
+        self.start = np.zeros(num_tasks)
+        self.finish = np.zeros(num_tasks)
+        self.timelines: List[List[Tuple[int, float, float]]] = [[] for _ in range(num_workers)]
+
+    def place(self, task: int, worker: int, start: float, finish: float):
+        self.worker[task] = worker
+        self.start[task] = start
+        self.finish[task] = finish
+        self.timelines[worker].append((task, start, finish))
+
+    @property
+    def makespan(self) -> float:
+        return float(self.finish.max()) if len(self.finish) else 0.0
+
+    def utilization(self) -> float:
+        # Busy time over workers x makespan
+        span = self.makespan
+        busy = float((self.finish - self.start).sum())
+        return busy / (span * len(self.timelines)) if span > 0 else 0.0
+
+    def check(self, graph: TaskGraph):
+        # Dependencies respected and no worker runs two tasks at once
+        if (self.start[graph.dst] < self.finish[graph.src] - 1e-9).any():
+            raise AssertionError("a task starts before one of its predecessors finishes")
+        for timeline in self.timelines:
+            for (_, _, f), (_, s, _) in zip(timeline, timeline[1:]):
+                if s < f - 1e-9:
+                    raise AssertionError("overlapping tasks on one worker")
+
+
+def schedule_critical_path(graph: TaskGraph, workers: Sequence[CNPWorker]) -> Schedule:
+    # List scheduling: among ready tasks take the one with the longest path
+    # to the end (heap on -rank) and put it on the worker where it finishes
+    # earliest. O(n log n + n * workers), the worker choice vectorized.
+    durations = duration_matrix(graph, workers)
+    rank = upward_rank(graph, durations).tolist()
+    succ = graph._successor_lists()
+    indegree = graph.indegree.tolist()
+    ready_at = [0.0] * graph.n
+    free = np.zeros(len(workers))
+    schedule = Schedule(graph.n, len(workers))
+    heap = [(-rank[i], i) for i in range(graph.n) if indegree[i] == 0]
+    heapq.heapify(heap)
+    while heap:
+        _, u = heapq.heappop(heap)
+        finish = np.maximum(free, ready_at[u]) + durations[u]
+        w = int(finish.argmin())
+        end = float(finish[w])
+        schedule.place(u, w, end - float(durations[u, w]), end)
+        free[w] = end
+        for v in succ[u]:
+            if end > ready_at[v]:
+                ready_at[v] = end
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                heapq.heappush(heap, (-rank[v], v))
+    return schedule
+
+
+def schedule_greedy_award(graph: TaskGraph, workers: Sequence[CNPWorker]) -> Schedule:
+    # The current Contract Net rule: tasks announced in topological order,
+    # each awarded to the lowest bid difficulty * skill + 0.5 * load, then
+    # run on that worker as soon as it and the task's predecessors allow.
+    # load sums awarded run times: adding whole bids (CNPWorker.assign_task)
+    # compounds by 1.5x per award and overflows on large graphs.
+    durations = duration_matrix(graph, workers)
+    succ = graph._successor_lists()
+    load = np.zeros(len(workers))
+    free = np.zeros(len(workers))
+    ready_at = [0.0] * graph.n
+    schedule = Schedule(graph.n, len(workers))
+    for u in graph.topological_order():
+        bids = durations[u] + load * 0.5
+        w = int(bids.argmin())
+        load[w] += durations[u, w]
+        start = max(float(free[w]), ready_at[u])
+        end = start + float(durations[u, w])
+        schedule.place(u, w, start, end)
+        free[w] = end
+        for v in succ[u]:
+            if end > ready_at[v]:
+                ready_at[v] = end
+    return schedule
+
+
+def critical_path_bound(graph: TaskGraph, workers: Sequence[CNPWorker]) -> float:
+    # Lower bound on any makespan: the longest chain at each task's fastest
+    # run time, or total fastest work spread evenly over all workers
+    durations = duration_matrix(graph, workers)
+    fastest = durations.min(axis=1).tolist()
+    succ = graph._successor_lists()
+    longest = [0.0] * graph.n
+    for u in reversed(graph.topological_order()):
+        longest[u] = fastest[u] + max((longest[v] for v in succ[u]), default=0.0)
+    return max(max(longest, default=0.0), sum(fastest) / len(workers))
+
+
+def make_workers(num_workers: int, seed: int = 0) -> List[CNPWorker]:
+    # The fixed trio from run_advanced_task_division, then random specialists
+    rng = random.Random(seed)
+    workers = [
+        CNPWorker(1, {'coding': 0.5, 'testing': 1.5}),
+        CNPWorker(2, {'coding': 1.5, 'testing': 0.5}),
+        CNPWorker(3, {'coding': 1.0, 'testing': 1.0})
+    ][:num_workers]
+    for i in range(len(workers), num_workers):
+        workers.append(CNPWorker(i + 1, {'coding': rng.uniform(0.5, 1.5), 'testing': rng.uniform(0.5, 1.5)}))
+    return workers
+
+
+def compare(num_tasks: int, num_workers: int, max_parents: int = 3, window: int = 100,
+            seed: int = 0) -> Dict[str, Dict[str, float]]:
+    graph = random_dag(num_tasks, max_parents, window, seed)
+    workers = make_workers(num_workers, seed)
+    results = {'bound': {'makespan': critical_path_bound(graph, workers)}}
+    for name, scheduler in (('greedy', schedule_greedy_award), ('critical_path', schedule_critical_path)):
+        t0 = time.perf_counter()
+        schedule = scheduler(graph, workers)
+        elapsed = time.perf_counter() - t0
+        schedule.check(graph)
+        results[name] = {'makespan': schedule.makespan, 'utilization': schedule.utilization(),
+                         'schedule_s': elapsed}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DAG task scheduling: greedy award vs critical-path list scheduling")
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--max-parents', type=int, default=3)
+    parser.add_argument('--window', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} {'workers':>7} {'bound':>10} {'greedy':>10} {'util':>6} {'cp':>10} {'util':>6} "
+          f"{'greedy_s':>8} {'cp_s':>8}")
+    for n in args.tasks:
+        for k in args.workers:
+            r = compare(n, k, args.max_parents, args.window, args.seed)
+            g, c = r['greedy'], r['critical_path']
+            print(f"{n:>7} {k:>7} {r['bound']['makespan']:>10.1f} {g['makespan']:>10.1f} {g['utilization']:>6.1%} "
+                  f"{c['makespan']:>10.1f} {c['utilization']:>6.1%} {g['schedule_s']:>8.2f} {c['schedule_s']:>8.2f}")
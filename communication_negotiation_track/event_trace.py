@@ -0,0 +1,134 @@
+import csv
+import json
+import string
+import sys
+from typing import Any, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+# Verbosity levels: an event is recorded when its level <= the tracer's level
+QUIET = 0
+SUMMARY = 1   # task headers and results
+STEP = 2      # per-step / per-round progress
+DETAIL = 3    # per-agent, per-bid, per-move chatter
+
+Record = Tuple[int, 'EventType', tuple]
+
+
+class EventType:
+    # A named event with a str.format template. Arguments are passed
+    # positionally in the order the template's fields first appear and are
+    # only formatted when a sink renders text.
+    __slots__ = ('name', 'template', 'level', 'fields')
+
+    def __init__(self, name: str, template: str, level: int = DETAIL):
+        self.name = name
+        self.template = template
+        self.level = level
+        fields = []
+        for _, field, _, _ in string.Formatter().parse(template):
+            if field is not None and field not in fields:
+                fields.append(field)
+        self.fields = tuple(fields)
+
+    def as_dict(self, args: Sequence[Any]) -> dict:
+        return dict(zip(self.fields, args))
+
+    def format(self, args: Sequence[Any]) -> str:
+        return self.template.format(**self.as_dict(args))
+
+    def __repr__(self):
+        return f"EventType({self.name!r})"
+
+
+class ConsoleSink:
+    # Formats and prints each event; the stream is looked up per write so
+    # contextlib.redirect_stdout keeps working
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def write(self, seq: int, event: EventType, args: tuple):
+        print(event.format(args), file=self.stream or sys.stdout)
+
+
+class RingBuffer:
+    # Keeps the last `capacity` raw records in a preallocated list; nothing
+    # is formatted until render() is called
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._records: List[Optional[Record]] = [None] * capacity
+        self._count = 0
+
+    def write(self, seq: int, event: EventType, args: tuple):
+        self._records[self._count % self.capacity] = (seq, event, args)
+        self._count += 1
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def records(self) -> Iterator[Record]:
+        # Oldest first
+        start = max(0, self._count - self.capacity)
+        for i in range(start, self._count):
+            yield self._records[i % self.capacity]
+
+    def render(self) -> List[str]:
+        return [event.format(args) for _, event, args in self.records()]
+
+    def clear(self):
+        self._records = [None] * self.capacity
+        self._count = 0
+
+
+class JsonlSink:
+    # One JSON object per event: {"seq", "event", <template fields>}
+    def __init__(self, fp: TextIO):
+        self.fp = fp
+
+    def write(self, seq: int, event: EventType, args: tuple):
+        record = {'seq': seq, 'event': event.name}
+        record.update(event.as_dict(args))
+        self.fp.write(json.dumps(record, default=str))
+        self.fp.write('\n')
+
+
+class CsvSink:
+    # Rows of seq, event name, then the raw arguments in field order
+    def __init__(self, fp: TextIO):
+        self._writer = csv.writer(fp)
+
+    def write(self, seq: int, event: EventType, args: tuple):
+        self._writer.writerow((seq, event.name) + tuple(args))
+
+
+class Tracer:
+    # Fans events out to sinks. Below an event's level emit() returns
+    # after one comparison; hot loops whose arguments are costly to compute
+    # should check enabled() first.
+    def __init__(self, *sinks, level: int = DETAIL):
+        self.sinks = list(sinks)
+        self.level = level
+        self._seq = 0
+
+    def enabled(self, level: int) -> bool:
+        return level <= self.level
+
+    def emit(self, event: EventType, *args):
+        if event.level > self.level:
+            return
+        self._seq += 1
+        for sink in self.sinks:
+            sink.write(self._seq, event, args)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def set_level(self, level: int):
+        self.level = level
+
+    def quiet(self):
+        self.level = QUIET
+
+
+# Shared by every simulation in the package (the numbered scripts and the
+# run_advanced_* tasks), so one quiet() or set_level() silences them all.
+# Add a RingBuffer / JsonlSink to record events instead of printing them.
+tracer = Tracer(ConsoleSink())
@@ -0,0 +1,107 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from occupancy_grid import EMPTY, TREASURE, UNKNOWN
+
+Cell = Tuple[int, int]
+
+
+def frontier_mask(cells: np.ndarray) -> np.ndarray:
+    # Known free cells with at least one unknown 4-neighbor
+    unknown = cells == UNKNOWN
+    near_unknown = np.zeros_like(unknown)
+    near_unknown[1:] |= unknown[:-1]
+    near_unknown[:-1] |= unknown[1:]
+    near_unknown[:, 1:] |= unknown[:, :-1]
+    near_unknown[:, :-1] |= unknown[:, 1:]
+    return ((cells == EMPTY) | (cells == TREASURE)) & near_unknown
+
+
+def voronoi_bfs(passable: np.ndarray, sources: Sequence[Cell]) -> Tuple[np.ndarray, np.ndarray]:
+    # Multi-source BFS over passable cells, one wavefront per array pass. Returns
+    # flat padded (dist, owner) arrays: distance to the nearest source and that
+    # source's index (-1 where unreachable). Layout matches grid_search.make_blocked.
+    n = passable.shape[0]
+    W = n + 2
+    free = np.pad(passable, 1, constant_values=False).ravel()
+    dist = np.full(free.shape, -1, dtype=np.int32)
+    owner = np.full(free.shape, -1, dtype=np.int32)
+    offsets = np.array([W, -W, 1, -1])
+
+    idx = np.array([(r + 1) * W + c + 1 for r, c in sources], dtype=np.int64)
+    frontier, first = np.unique(idx, return_index=True)
+    dist[frontier] = 0
+    owner[frontier] = first
+    d = 0
+    while len(frontier):
+        d += 1
+        cand = (frontier[:, None] + offsets).ravel()
+        labels = np.repeat(owner[frontier], len(offsets))
+        ok = free[cand] & (dist[cand] < 0)
+        cand, first = np.unique(cand[ok], return_index=True)
+        dist[cand] = d
+        owner[cand] = labels[ok][first]
+        frontier = cand
+    return dist, owner
+
+
+def _first_step(dist: np.ndarray, owner: np.ndarray, label: int, target: int, W: int) -> int:
+    # Walk back down the distance field from target to the cell next to the source
+    i = target
+    while dist[i] > 1:
+        for d in (W, -W, 1, -1):
+            j = i + d
+            if dist[j] == dist[i] - 1 and owner[j] == label:
+                i = j
+                break
+    return i
+
+
+class FrontierExplorer:
+    # Coordinated frontier exploration. A labelled multi-source BFS from all
+    # agents partitions the known free space; each agent heads for the nearest
+    # frontier cell inside its own region, so targets are distinct by
+    # construction. Agents whose region has no frontier fall back to the nearest
+    # frontier cell nobody else has claimed.
+    def __init__(self, grid_size: int):
+        self.grid_size = grid_size
+        self.targets: List[Optional[Cell]] = []
+
+    def next_moves(self, cells: np.ndarray, positions: Sequence[Cell]) -> List[Optional[Cell]]:
+        W = self.grid_size + 2
+        passable = (cells == EMPTY) | (cells == TREASURE)
+        for r, c in positions:
+            passable[r, c] = True
+        frontier = np.flatnonzero(np.pad(frontier_mask(cells), 1, constant_values=False).ravel())
+
+        dist, owner = voronoi_bfs(passable, positions)
+        reachable = frontier[owner[frontier] >= 0]
+        # Nearest frontier cell per region: sort by (owner, dist) and keep the first of each owner
+        order = np.lexsort((dist[reachable], owner[reachable]))
+        labels, first = np.unique(owner[reachable][order], return_index=True)
+        chosen = {int(label): int(reachable[order][k]) for label, k in zip(labels, first)}
+
+        moves: List[Optional[Cell]] = []
+        self.targets = []
+        claimed = set(chosen.values())
+        for k, pos in enumerate(positions):
+            target = chosen.get(k)
+            field, field_owner, label = dist, owner, k
+            if target is None and len(frontier):
+                field, field_owner = voronoi_bfs(passable, [pos])
+                label = 0
+                options = frontier[field[frontier] >= 0]
+                if len(options):
+                    unclaimed = options[~np.isin(options, list(claimed))]
+                    pool = unclaimed if len(unclaimed) else options
+                    target = int(pool[np.argmin(field[pool])])
+                    claimed.add(target)
+            if target is None or field[target] == 0:
+                moves.append(None)
+                self.targets.append(None)
+                continue
+            step = _first_step(field, field_owner, label, target, W)
+            moves.append((step // W - 1, step % W - 1))
+            self.targets.append((target // W - 1, target % W - 1))
+        return moves
@@ -0,0 +1,335 @@
+import heapq
+import itertools
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+Cell = Tuple[int, int]
+
+
+def make_blocked(grid_size: int, obstacles) -> bytearray:
+    # Flat row-major grid padded with a one-cell wall border, so scans never
+    # bounds-check: cell (r, c) lives at (r + 1) * (grid_size + 2) + c + 1.
+    # `obstacles` is an iterable of cells or a boolean (grid_size, grid_size) mask.
+    width = grid_size + 2
+    if isinstance(obstacles, np.ndarray):
+        padded = np.pad(obstacles.astype(np.uint8), 1, constant_values=1)
+        return bytearray(padded.tobytes())
+    blocked = bytearray(width * width)
+    blocked[:width] = b'\x01' * width
+    blocked[-width:] = b'\x01' * width
+    blocked[::width] = b'\x01' * width
+    blocked[width - 1::width] = b'\x01' * width
+    for r, c in obstacles:
+        blocked[(r + 1) * width + c + 1] = 1
+    return blocked
+
+
+def _unflatten(i: int, width: int) -> Cell:
+    r, c = divmod(i, width)
+    return (r - 1, c - 1)
+
+
+def jump_point_search(blocked: bytearray, grid_size: int, start: Cell, goal: Cell) -> Tuple[List[Cell], int]:
+    # Jump Point Search for 4-connected uniform grids. Canonical shortest paths
+    # move horizontally first and only turn from vertical to horizontal at a
+    # forced neighbor, so horizontal scans probe each column they cross and
+    # vertical scans stop only at forced turns or the goal.
+    # Returns (path excluding start, expanded jump points); same length as A*.
+    W = grid_size + 2
+    s = (start[0] + 1) * W + start[1] + 1
+    g = (goal[0] + 1) * W + goal[1] + 1
+    if blocked[g]:
+        return [], 0
+    if s == g:
+        return [], 0
+    gr, gc = divmod(g, W)
+
+    def jump_v(i, d):
+        while True:
+            i += d
+            if blocked[i]:
+                return -1
+            if i == g:
+                return i
+            if (not blocked[i + 1] and blocked[i - d + 1]) or (not blocked[i - 1] and blocked[i - d - 1]):
+                return i
+
+    def jump_h(i, d):
+        while True:
+            i += d
+            if blocked[i]:
+                return -1
+            if i == g or jump_v(i, W) >= 0 or jump_v(i, -W) >= 0:
+                return i
+
+    # Search states are (cell, incoming direction); direction 0 marks the start
+    start_state = (s, 0)
+    cost_so_far = {start_state: 0}
+    came_from = {start_state: None}
+    tie = itertools.count()
+    frontier = [(0, 0, next(tie), start_state)]
+    expansions = 0
+    reached = None
+
+    while frontier:
+        f, h, _, state = heapq.heappop(frontier)
+        i, d = state
+        if i == g:
+            reached = state
+            break
+        base = cost_so_far[state]
+        if f - h > base:
+            continue  # Stale entry, already expanded at a lower cost
+        expansions += 1
+
+        if d == 0:
+            successors = [(jump_h(i, 1), 1), (jump_h(i, -1), -1), (jump_v(i, W), W), (jump_v(i, -W), -W)]
+        elif d == 1 or d == -1:
+            successors = [(jump_h(i, d), d), (jump_v(i, W), W), (jump_v(i, -W), -W)]
+        else:
+            successors = [(jump_v(i, d), d)]
+            for side in (1, -1):
+                if not blocked[i + side] and blocked[i - d + side]:
+                    successors.append((jump_h(i, side), side))
+
+        r, c = divmod(i, W)
+        for j, nd in successors:
+            if j < 0:
+                continue
+            jr, jc = divmod(j, W)
+            new_cost = base + abs(jr - r) + abs(jc - c)
+            nxt = (j, nd)
+            if nxt not in cost_so_far or new_cost < cost_so_far[nxt]:
+                cost_so_far[nxt] = new_cost
+                came_from[nxt] = state
+                h = abs(jr - gr) + abs(jc - gc)
+                heapq.heappush(frontier, (new_cost + h, h, next(tie), nxt))
+
+    if reached is None:
+        return [], expansions
+
+    # Expand the jump points back into unit steps
+    jumps = []
+    state = reached
+    while state is not None:
+        jumps.append(state[0])
+        state = came_from[state]
+    jumps.reverse()
+    path = []
+    for a, b in zip(jumps, jumps[1:]):
+        step = (1 if b > a else -1) if abs(b - a) < W else (W if b > a else -W)
+        for k in range(a + step, b + step, step):
+            path.append(_unflatten(k, W))
+    return path, expansions
+
+
+class GridSearch:
+    # Reusable A* core over a padded flat grid (see make_blocked for the layout).
+    # Cost, parent, seen and closed buffers are allocated once and invalidated in
+    # O(1) per query by bumping a generation stamp; heap entries are single ints
+    # packing (f, h, index), so a query allocates no per-node tuples or dicts.
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.width = cols + 2
+        self.cells = (rows + 2) * self.width
+        self.blocked = bytearray(self.cells)
+        self._blocked_view = np.frombuffer(self.blocked, dtype=np.uint8).reshape(rows + 2, self.width)
+        self._blocked_view[[0, -1], :] = 1
+        self._blocked_view[:, [0, -1]] = 1
+        self.g = array('i')
+        self.parent = array('i')
+        self.seen = array('I')
+        self.closed = array('I')
+        self.generation = 0
+        self.expansions = 0
+        self._ensure(self.cells)
+
+    def _ensure(self, size: int):
+        # Grow buffers (space-time searches need cells * (horizon + 1) slots)
+        extra = size - len(self.g)
+        if extra > 0:
+            zeros = bytes(4 * extra)
+            for buf in (self.g, self.parent, self.seen, self.closed):
+                buf.frombytes(zeros)
+
+    def _next_generation(self) -> int:
+        self.generation += 1
+        if self.generation == 0xFFFFFFFF:
+            # Stamp wrapped: clear once, then keep counting from 1
+            for buf in (self.seen, self.closed):
+                buf[:] = array('I', bytes(4 * len(buf)))
+            self.generation = 1
+        return self.generation
+
+    def index(self, cell: Cell) -> int:
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def cell(self, i: int) -> Cell:
+        return _unflatten(i, self.width)
+
+    def load_obstacles(self, obstacles):
+        # Overwrite the interior with a set of cells or a boolean (rows, cols) mask
+        interior = self._blocked_view[1:-1, 1:-1]
+        if isinstance(obstacles, np.ndarray):
+            interior[...] = obstacles
+            return
+        interior[...] = 0
+        blocked, width = self.blocked, self.width
+        for r, c in obstacles:
+            blocked[(r + 1) * width + c + 1] = 1
+
+    def astar(self, start: Cell, goal: Cell, heuristic: Optional[memoryview] = None) -> List[Cell]:
+        # Shortest 4-connected path from start (exclusive) to goal, [] if unreachable.
+        # `heuristic` optionally gives an admissible per-index bound (e.g. from a
+        # LandmarkIndex); values at or above h_cap mark cells that cannot reach the goal.
+        W = self.width
+        gen = self._next_generation()
+        g_cost, parent, seen, closed, blocked = self.g, self.parent, self.seen, self.closed, self.blocked
+        s = self.index(start)
+        t = self.index(goal)
+        self.expansions = 0
+        if blocked[t] or s == t:
+            return []
+        tr, tc = divmod(t, W)
+        idx_bits = self.cells.bit_length()
+        h_bits = (self.rows + self.cols).bit_length() if heuristic is None else self.cells.bit_length()
+        h_cap = 1 << h_bits
+        idx_mask = (1 << idx_bits) - 1
+
+        sr, sc = divmod(s, W)
+        h = abs(sr - tr) + abs(sc - tc) if heuristic is None else heuristic[s]
+        if h >= h_cap:
+            return []
+        seen[s] = gen
+        g_cost[s] = 0
+        parent[s] = -1
+        heap = [(((h << h_bits) | h) << idx_bits) | s]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        offsets = (W, -W, 1, -1)
+        reached = False
+
+        while heap:
+            i = heappop(heap) & idx_mask
+            if closed[i] == gen:
+                continue
+            if i == t:
+                reached = True
+                break
+            closed[i] = gen
+            self.expansions += 1
+            gi = g_cost[i] + 1
+            for d in offsets:
+                j = i + d
+                if blocked[j] or closed[j] == gen:
+                    continue
+                if seen[j] != gen or gi < g_cost[j]:
+                    if heuristic is None:
+                        jr, jc = divmod(j, W)
+                        h = abs(jr - tr) + abs(jc - tc)
+                    else:
+                        h = heuristic[j]
+                        if h >= h_cap:
+                            continue
+                    seen[j] = gen
+                    g_cost[j] = gi
+                    parent[j] = i
+                    heappush(heap, ((((gi + h) << h_bits) | h) << idx_bits) | j)
+
+        if not reached:
+            return []
+        path = []
+        i = t
+        while i != s:
+            path.append(_unflatten(i, W))
+            i = parent[i]
+        path.reverse()
+        return path
+
+    def state_id(self, time: int, cell: Cell) -> int:
+        # Flat id of a (time, cell) space-time state, used for reservations
+        return time * self.cells + self.index(cell)
+
+    def astar_space_time(self, start: Cell, goal: Cell, reserved: Set[int], horizon: int,
+                         min_arrival: int = 0) -> List[Tuple[int, Cell]]:
+        # A* over (time, cell) with 4 moves plus wait, avoiding reserved state ids.
+        # Returns [(t, cell), ...] from t=0 up to arriving at goal no earlier than
+        # min_arrival and no later than horizon, or [] if impossible.
+        W, n = self.width, self.cells
+        self._ensure(n * (horizon + 1))
+        gen = self._next_generation()
+        parent, seen, blocked = self.parent, self.seen, self.blocked
+        s = self.index(start)
+        t_idx = self.index(goal)
+        self.expansions = 0
+        if blocked[t_idx]:
+            return []
+        tr, tc = divmod(t_idx, W)
+        state_bits = (n * (horizon + 1)).bit_length()
+        h_bits = (self.rows + self.cols).bit_length()
+        state_mask = (1 << state_bits) - 1
+
+        sr, sc = divmod(s, W)
+        h = abs(sr - tr) + abs(sc - tc)
+        seen[s] = gen
+        parent[s] = -1
+        heap = [(((h << h_bits) | h) << state_bits) | s]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        moves = (0, W, -W, 1, -1)
+        found = -1
+
+        while heap:
+            state = heappop(heap) & state_mask
+            time, i = divmod(state, n)
+            if i == t_idx and time >= min_arrival:
+                found = state
+                break
+            if time == horizon:
+                continue
+            self.expansions += 1
+            base = state + n
+            for d in moves:
+                j = i + d
+                nxt = base + d
+                # Cost equals time, so the first visit of a state is optimal
+                if blocked[j] or seen[nxt] == gen or nxt in reserved:
+                    continue
+                seen[nxt] = gen
+                parent[nxt] = state
+                jr, jc = divmod(j, W)
+                h = abs(jr - tr) + abs(jc - tc)
+                heappush(heap, ((((time + 1 + h) << h_bits) | h) << state_bits) | nxt)
+
+        if found < 0:
+            return []
+        path = []
+        state = found
+        while state != -1:
+            time, i = divmod(state, n)
+            path.append((time, _unflatten(i, W)))
+            state = parent[state]
+        path.reverse()
+        return path
+
+
+_search_cores: Dict[Tuple[int, int], GridSearch] = {}
+
+
+def get_search_core(rows: int, cols: int) -> GridSearch:
+    # One shared core per grid shape, so many agents reuse the same buffers
+    core = _search_cores.get((rows, cols))
+    if core is None:
+        core = _search_cores[(rows, cols)] = GridSearch(rows, cols)
+    return core
+
+
+def is_unit_path(path: Iterable[Cell], start: Cell) -> bool:
+    # Sanity check used by benchmarks: every step is a unit 4-connected move
+    prev = start
+    for cell in path:
+        if abs(cell[0] - prev[0]) + abs(cell[1] - prev[1]) != 1:
+            return False
+        prev = cell
+    return True
@@ -0,0 +1,223 @@
+import collections
+import heapq
+import itertools
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from grid_search import make_blocked
+
+Cell = Tuple[int, int]
+ClusterId = Tuple[int, int]
+
+# Entrances at least this wide get a transition at each end instead of one in the middle
+WIDE_ENTRANCE = 6
+
+
+class HierarchicalPlanner:
+    # HPA* (Botea et al.): the grid is split into cluster_size x cluster_size
+    # clusters. Entrances along shared cluster borders become abstract nodes,
+    # linked by unit inter-cluster edges and by cached intra-cluster distances.
+    # Long queries search the small abstract graph and refine one leg at a time.
+    def __init__(self, grid_size: int, obstacles=(), cluster_size: int = 16):
+        self.grid_size = grid_size
+        self.cluster_size = cluster_size
+        self.clusters_per_side = (grid_size + cluster_size - 1) // cluster_size
+        self.width = grid_size + 2
+        self.blocked = make_blocked(grid_size, obstacles)
+        # (cluster_a, cluster_b) -> [(cell_in_a, cell_in_b), ...], a < b
+        self.transitions: Dict[Tuple[ClusterId, ClusterId], List[Tuple[Cell, Cell]]] = {}
+        self.inter: Dict[Cell, Set[Cell]] = collections.defaultdict(set)
+        # Per-cluster entrance-to-entrance distances, computed on first use; None = stale
+        self.intra: Dict[ClusterId, Optional[Dict[Cell, Dict[Cell, int]]]] = {}
+        self.expansions = 0
+        self.intra_builds = 0
+
+        n = self.clusters_per_side
+        for i in range(n):
+            for j in range(n):
+                if j + 1 < n:
+                    self._build_transitions((i, j), (i, j + 1))
+                if i + 1 < n:
+                    self._build_transitions((i, j), (i + 1, j))
+
+    def _is_free(self, cell: Cell) -> bool:
+        return not self.blocked[(cell[0] + 1) * self.width + cell[1] + 1]
+
+    def cluster_of(self, cell: Cell) -> ClusterId:
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def _bounds(self, cid: ClusterId) -> Tuple[int, int, int, int]:
+        cs = self.cluster_size
+        return (cid[0] * cs, min((cid[0] + 1) * cs, self.grid_size),
+                cid[1] * cs, min((cid[1] + 1) * cs, self.grid_size))
+
+    def _build_transitions(self, a: ClusterId, b: ClusterId):
+        for x, y in self.transitions.pop((a, b), []):
+            self.inter[x].discard(y)
+            self.inter[y].discard(x)
+
+        r0, r1, c0, c1 = self._bounds(a)
+        if b[1] > a[1]:
+            pairs = [((r, c1 - 1), (r, c1)) for r in range(r0, r1)]
+        else:
+            pairs = [((r1 - 1, c), (r1, c)) for c in range(c0, c1)]
+
+        found = []
+        run = []
+        for x, y in pairs + [(None, None)]:
+            if x is not None and self._is_free(x) and self._is_free(y):
+                run.append((x, y))
+                continue
+            if run:
+                if len(run) >= WIDE_ENTRANCE:
+                    found.extend((run[0], run[-1]))
+                else:
+                    found.append(run[len(run) // 2])
+                run = []
+
+        self.transitions[(a, b)] = found
+        for x, y in found:
+            self.inter[x].add(y)
+            self.inter[y].add(x)
+        self.intra[a] = None
+        self.intra[b] = None
+
+    def _cluster_neighbors(self, cid: ClusterId) -> List[ClusterId]:
+        i, j = cid
+        n = self.clusters_per_side
+        return [(ni, nj) for ni, nj in ((i-1, j), (i+1, j), (i, j-1), (i, j+1)) if 0 <= ni < n and 0 <= nj < n]
+
+    def _entrances(self, cid: ClusterId) -> Set[Cell]:
+        nodes = set()
+        for other in self._cluster_neighbors(cid):
+            key = (cid, other) if cid < other else (other, cid)
+            for x, y in self.transitions.get(key, ()):
+                nodes.add(x if self.cluster_of(x) == cid else y)
+        return nodes
+
+    def _bfs(self, source: Cell, cid: ClusterId, goal: Optional[Cell] = None):
+        # Breadth-first search confined to one cluster; returns (dist, parent)
+        r0, r1, c0, c1 = self._bounds(cid)
+        dist = {source: 0}
+        parent = {source: None}
+        queue = collections.deque([source])
+        while queue:
+            cur = queue.popleft()
+            if cur == goal:
+                break
+            r, c = cur
+            for nxt in ((r+1, c), (r-1, c), (r, c+1), (r, c-1)):
+                if (r0 <= nxt[0] < r1 and c0 <= nxt[1] < c1 and nxt not in dist and self._is_free(nxt)):
+                    dist[nxt] = dist[cur] + 1
+                    parent[nxt] = cur
+                    queue.append(nxt)
+        return dist, parent
+
+    def _intra_edges(self, cid: ClusterId) -> Dict[Cell, Dict[Cell, int]]:
+        edges = self.intra.get(cid)
+        if edges is None:
+            nodes = self._entrances(cid)
+            edges = {}
+            for node in nodes:
+                dist, _ = self._bfs(node, cid)
+                edges[node] = {other: dist[other] for other in nodes if other != node and other in dist}
+            self.intra[cid] = edges
+            self.intra_builds += 1
+        return edges
+
+    def precompute(self):
+        # Eagerly build every cluster's distance table (otherwise done on demand)
+        for i in range(self.clusters_per_side):
+            for j in range(self.clusters_per_side):
+                self._intra_edges((i, j))
+
+    def update_obstacles(self, cells: Iterable[Cell], blocked: bool = True):
+        # Only clusters containing changed cells (and the borders they share) are rebuilt
+        touched = set()
+        width = self.width
+        for r, c in cells:
+            i = (r + 1) * width + c + 1
+            if bool(self.blocked[i]) != blocked:
+                self.blocked[i] = 1 if blocked else 0
+                touched.add(self.cluster_of((r, c)))
+        for cid in touched:
+            for other in self._cluster_neighbors(cid):
+                self._build_transitions(*((cid, other) if cid < other else (other, cid)))
+        return touched
+
+    def _abstract_path(self, start: Cell, goal: Cell) -> List[Cell]:
+        if not self._is_free(goal):
+            return []
+        start_cid = self.cluster_of(start)
+        goal_cid = self.cluster_of(goal)
+
+        # Temporary edges from start/goal into their clusters' entrances
+        start_dist, _ = self._bfs(start, start_cid)
+        start_links = {n: start_dist[n] for n in self._intra_edges(start_cid) if n in start_dist}
+        if start_cid == goal_cid and goal in start_dist:
+            start_links[goal] = start_dist[goal]
+        goal_dist, _ = self._bfs(goal, goal_cid)
+        goal_links = {n: goal_dist[n] for n in self._intra_edges(goal_cid) if n in goal_dist}
+
+        gr, gc = goal
+        tie = itertools.count()
+        frontier = [(0, 0, next(tie), start)]
+        cost_so_far = {start: 0}
+        came_from = {start: None}
+        self.expansions = 0
+        while frontier:
+            f, h, _, node = heapq.heappop(frontier)
+            if node == goal:
+                break
+            base = cost_so_far[node]
+            if f - h > base:
+                continue
+            self.expansions += 1
+
+            if node == start:
+                edges = list(start_links.items())
+            else:
+                edges = list(self._intra_edges(self.cluster_of(node)).get(node, {}).items())
+                if node in goal_links:
+                    edges.append((goal, goal_links[node]))
+            edges.extend((other, 1) for other in self.inter.get(node, ()))
+
+            for nxt, cost in edges:
+                new_cost = base + cost
+                if nxt not in cost_so_far or new_cost < cost_so_far[nxt]:
+                    cost_so_far[nxt] = new_cost
+                    came_from[nxt] = node
+                    h = abs(nxt[0] - gr) + abs(nxt[1] - gc)
+                    heapq.heappush(frontier, (new_cost + h, h, next(tie), nxt))
+
+        if goal not in came_from:
+            return []
+        path = []
+        node = goal
+        while node is not None:
+            path.append(node)
+            node = came_from[node]
+        path.reverse()
+        return path
+
+    def iter_legs(self, start: Cell, goal: Cell) -> Iterator[List[Cell]]:
+        # Abstract search up front, then each leg refined into unit steps only
+        # when the caller asks for it
+        abstract = self._abstract_path(start, goal)
+        for a, b in zip(abstract, abstract[1:]):
+            if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1:
+                yield [b]
+                continue
+            _, parent = self._bfs(a, self.cluster_of(a), goal=b)
+            leg = []
+            node = b
+            while node != a:
+                leg.append(node)
+                node = parent[node]
+            leg.reverse()
+            yield leg
+
+    def find_path(self, start: Cell, goal: Cell) -> List[Cell]:
+        path = []
+        for leg in self.iter_legs(start, goal):
+            path.extend(leg)
+        return path
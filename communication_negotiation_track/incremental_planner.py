@@ -0,0 +1,120 @@
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+INF = float('inf')
+
+Cell = Tuple[int, int]
+
+
+class DStarLite:
+    # D* Lite (Koenig & Likhachev) on a 4-connected grid with unit costs.
+    # Searches backwards from the goal so the agent can move and the map can
+    # change without discarding the search tree; unknown cells count as free.
+    def __init__(self, grid_size: int, goal: Cell, obstacles: Iterable[Cell] = ()):
+        self.grid_size = grid_size
+        self.goal = goal
+        self.blocked = set(obstacles)
+        self.g: Dict[Cell, float] = {}
+        self.rhs: Dict[Cell, float] = {goal: 0}
+        self.km = 0
+        self.start = None
+        self.expansions = 0
+        self._queue = []
+        self._open: Dict[Cell, Tuple[float, float]] = {}
+        self._push(goal, (self._h(goal), 0))
+
+    def _h(self, cell: Cell) -> int:
+        if self.start is None:
+            return 0
+        return abs(cell[0] - self.start[0]) + abs(cell[1] - self.start[1])
+
+    def _neighbors(self, cell: Cell) -> List[Cell]:
+        r, c = cell
+        n = self.grid_size
+        return [(nr, nc) for nr, nc in ((r+1, c), (r-1, c), (r, c+1), (r, c-1))
+                if 0 <= nr < n and 0 <= nc < n]
+
+    def _cost(self, a: Cell, b: Cell) -> float:
+        if a in self.blocked or b in self.blocked:
+            return INF
+        return 1
+
+    def _key(self, cell: Cell) -> Tuple[float, float]:
+        m = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (m + self._h(cell) + self.km, m)
+
+    def _push(self, cell: Cell, key: Tuple[float, float]):
+        # Lazy deletion: stale heap entries are skipped when their key no longer matches
+        self._open[cell] = key
+        heapq.heappush(self._queue, (key, cell))
+
+    def _top_key(self) -> Tuple[float, float]:
+        while self._queue:
+            key, cell = self._queue[0]
+            if self._open.get(cell) == key:
+                return key
+            heapq.heappop(self._queue)
+        return (INF, INF)
+
+    def _update_vertex(self, cell: Cell):
+        if cell != self.goal:
+            g = self.g
+            self.rhs[cell] = min((self._cost(cell, s) + g.get(s, INF) for s in self._neighbors(cell)), default=INF)
+        self._open.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._push(cell, self._key(cell))
+
+    def _compute_shortest_path(self):
+        start = self.start
+        while (self._top_key() < self._key(start)
+               or self.rhs.get(start, INF) != self.g.get(start, INF)):
+            k_old, u = heapq.heappop(self._queue)
+            del self._open[u]
+            self.expansions += 1
+
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u, k_new)
+            elif self.g.get(u, INF) > self.rhs.get(u, INF):
+                self.g[u] = self.rhs[u]
+                for s in self._neighbors(u):
+                    self._update_vertex(s)
+            else:
+                self.g[u] = INF
+                self._update_vertex(u)
+                for s in self._neighbors(u):
+                    self._update_vertex(s)
+
+    def update_obstacles(self, cells: Iterable[Cell], blocked: bool = True):
+        # Repair only the vertices whose edge costs changed
+        changed = [cell for cell in cells if (cell in self.blocked) != blocked]
+        if not changed:
+            return
+        for cell in changed:
+            if blocked:
+                self.blocked.add(cell)
+            else:
+                self.blocked.discard(cell)
+        for cell in changed:
+            self._update_vertex(cell)
+            for s in self._neighbors(cell):
+                self._update_vertex(s)
+
+    def plan(self, start: Cell) -> List[Cell]:
+        # Path from `start` (exclusive) to the goal, or [] if unreachable
+        if self.start is not None and start != self.start:
+            # Keys already queued stay valid lower bounds once shifted by the distance moved
+            self.km += abs(start[0] - self.start[0]) + abs(start[1] - self.start[1])
+        self.start = start
+        self._compute_shortest_path()
+
+        if self.g.get(start, INF) == INF:
+            return []
+        path = []
+        curr = start
+        while curr != self.goal:
+            curr = min(self._neighbors(curr), key=lambda s: self._cost(curr, s) + self.g.get(s, INF))
+            if self.g.get(curr, INF) == INF:
+                return []
+            path.append(curr)
+        return path
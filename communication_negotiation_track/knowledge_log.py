@@ -0,0 +1,57 @@
+import struct
+from typing import Any, Dict, Iterable, List, Tuple
+
+Cell = Tuple[int, int]
+
+# Wire size of one observation: sequence number, flattened cell index, cell code
+ENTRY_FORMAT = '<IIb'
+ENTRY_BYTES = struct.calcsize(ENTRY_FORMAT)
+
+
+class KnowledgeLog:
+    # Shared append-only log of cell observations. The version is the number of
+    # entries; agents remember the last version they pulled and only fetch the
+    # tail, so a step costs O(new observations) instead of O(map).
+    def __init__(self):
+        self.entries: List[Tuple[int, Cell, Any]] = []  # (author, cell, value), index == seq
+        self._cells: Dict[Cell, Any] = {}
+        self.history: List[Dict[str, int]] = []
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.published_entries = 0
+        self.pulled_entries = 0
+
+    @property
+    def version(self) -> int:
+        return len(self.entries)
+
+    def publish(self, author: int, observations: Iterable[Tuple[Cell, Any]]) -> int:
+        # Append observations the log doesn't already hold; returns how many were new
+        added = 0
+        cells = self._cells
+        for cell, value in observations:
+            if cells.get(cell) != value:
+                cells[cell] = value
+                self.entries.append((author, cell, value))
+                added += 1
+        self.published_entries += added
+        return added
+
+    def pull(self, reader: int, since: int) -> Tuple[List[Tuple[Cell, Any]], int]:
+        # Entries after `since` written by other agents, plus the new version to remember
+        tail = [(cell, value) for author, cell, value in self.entries[since:] if author != reader]
+        self.pulled_entries += len(tail)
+        return tail, self.version
+
+    def end_step(self) -> Dict[str, int]:
+        stats = {
+            'version': self.version,
+            'entries_published': self.published_entries,
+            'entries_pulled': self.pulled_entries,
+            'bytes_published': self.published_entries * ENTRY_BYTES,
+            'bytes_pulled': self.pulled_entries * ENTRY_BYTES,
+        }
+        self.history.append(stats)
+        self._reset_counters()
+        return stats
@@ -0,0 +1,112 @@
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from grid_search import make_blocked
+
+Cell = Tuple[int, int]
+
+# Distance used for cells a landmark cannot reach; large enough that the
+# triangle bound prunes them, small enough to stay a plain int32
+UNREACHABLE = 1 << 28
+
+
+def bfs_field(blocked: bytearray, grid_size: int, source: Cell) -> np.ndarray:
+    # Unit-cost distance from `source` to every cell of the padded flat grid,
+    # expanded one wavefront at a time with array ops
+    W = grid_size + 2
+    free = np.frombuffer(blocked, dtype=np.uint8) == 0
+    dist = np.full(len(blocked), UNREACHABLE, dtype=np.int32)
+    offsets = np.array([1, -1, W, -W])
+    s = (source[0] + 1) * W + source[1] + 1
+    dist[s] = 0
+    frontier = np.array([s])
+    d = 0
+    while len(frontier):
+        d += 1
+        nxt = (frontier[:, None] + offsets).ravel()
+        nxt = nxt[free[nxt] & (dist[nxt] == UNREACHABLE)]
+        nxt = np.unique(nxt)
+        dist[nxt] = d
+        frontier = nxt
+    return dist
+
+
+class LandmarkIndex:
+    # ALT (A*, Landmarks, Triangle inequality): BFS distance fields from K
+    # landmarks give the admissible bound h(i) = max_k |d_k(goal) - d_k(i)|.
+    # Adding walls only lengthens distances, so stale fields stay admissible and
+    # are refreshed a few at a time; removing walls refreshes them immediately.
+    def __init__(self, grid_size: int, obstacles=(), num_landmarks: int = 8, seed: int = 0):
+        self.grid_size = grid_size
+        self.blocked = make_blocked(grid_size, obstacles)
+        self.landmarks: List[Cell] = []
+        self.fields = np.empty((0, len(self.blocked)), dtype=np.int32)
+        self.stale = set()
+        self.builds = 0
+        self._goal = None
+        self._heuristic = None
+        self._select(num_landmarks, seed)
+
+    def _select(self, num_landmarks: int, seed: int):
+        # Farthest-point selection: each landmark maximizes its distance to the previous ones
+        W = self.grid_size + 2
+        free = np.flatnonzero(np.frombuffer(self.blocked, dtype=np.uint8) == 0)
+        if not len(free):
+            return
+        rng = np.random.default_rng(seed)
+        fields = []
+        nearest = None
+        pick = int(rng.choice(free))
+        for _ in range(num_landmarks):
+            cell = (pick // W - 1, pick % W - 1)
+            field = bfs_field(self.blocked, self.grid_size, cell)
+            self.builds += 1
+            self.landmarks.append(cell)
+            fields.append(field)
+            nearest = field if nearest is None else np.minimum(nearest, field)
+            candidates = np.where(nearest[free] < UNREACHABLE, nearest[free], -1)
+            pick = int(free[np.argmax(candidates)])
+        self.fields = np.stack(fields)
+
+    def update_obstacles(self, cells: Iterable[Cell], blocked: bool = True):
+        W = self.grid_size + 2
+        changed = []
+        for r, c in cells:
+            i = (r + 1) * W + c + 1
+            if bool(self.blocked[i]) != blocked:
+                self.blocked[i] = 1 if blocked else 0
+                changed.append(i)
+        if not changed:
+            return
+        # Only fields that could route through a changed cell are affected
+        touched = np.any(self.fields[:, changed] < UNREACHABLE, axis=1) if blocked else np.ones(len(self.landmarks), bool)
+        self.stale.update(np.flatnonzero(touched).tolist())
+        self._goal = None
+        if not blocked:
+            self.refresh(len(self.landmarks))
+
+    def refresh(self, max_landmarks: int = 1):
+        for k in sorted(self.stale)[:max_landmarks]:
+            self.fields[k] = bfs_field(self.blocked, self.grid_size, self.landmarks[k])
+            self.stale.discard(k)
+            self.builds += 1
+            self._goal = None
+
+    def heuristic_to(self, goal: Cell) -> Optional[memoryview]:
+        # Flat per-cell lower bounds on the distance to `goal`, in padded indexing
+        if goal == self._goal:
+            return self._heuristic
+        W = self.grid_size + 2
+        g = (goal[0] + 1) * W + goal[1] + 1
+        goal_dist = self.fields[:, g:g + 1]
+        usable = goal_dist[:, 0] < UNREACHABLE
+        if not usable.any():
+            return None
+        h = np.abs(self.fields[usable] - goal_dist[usable]).max(axis=0).astype(np.int32)
+        # Never weaker than Manhattan distance
+        rows, cols = np.divmod(np.arange(len(h)), W)
+        np.maximum(h, np.abs(rows - g // W) + np.abs(cols - g % W), out=h)
+        self._goal = goal
+        self._heuristic = memoryview(h)
+        return self._heuristic
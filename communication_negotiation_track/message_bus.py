@@ -0,0 +1,109 @@
+import collections
+import heapq
+import itertools
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class MessageBus:
+    # In-process message bus with per-agent bounded inboxes and delivery latency.
+    # A send made during step t reaches inboxes at step t + latency: latency 0
+    # lands in the inbox immediately, later ones when tick() makes them due.
+    # A batched send is one envelope, so its size is counted once for all the
+    # messages it carries. Sizes are only measured when bytes_sent is read
+    # (end_step reads it unless count_bytes is off).
+    def __init__(self, latency: int = 1, inbox_size: int = 1024, count_bytes: bool = True):
+        if latency < 0:
+            raise ValueError("latency must be >= 0")
+        self.latency = latency
+        self.count_bytes = count_bytes
+        self.inbox_size = inbox_size
+        self.inboxes: Dict[Any, collections.deque] = {}
+        self.now = 0
+        self._pending = []
+        self._seq = itertools.count()
+        self.history: List[Dict[str, int]] = []
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.sent = 0
+        self.envelopes = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._bytes = 0
+        self._unsized: List[List[Dict[str, Any]]] = []
+
+    @property
+    def bytes_sent(self) -> int:
+        # JSON size of the envelopes sent this step, measured on first read
+        if self._unsized:
+            self._bytes += sum(len(json.dumps(m, default=str)) for m in self._unsized)
+            self._unsized.clear()
+        return self._bytes
+
+    def register(self, agent_id):
+        self.inboxes[agent_id] = collections.deque()
+
+    def send(self, sender, message: Dict[str, Any], recipients: Optional[Iterable] = None,
+             latency: Optional[int] = None):
+        self.send_batch(sender, [message], recipients, latency)
+
+    def send_batch(self, sender, messages: List[Dict[str, Any]], recipients: Optional[Iterable] = None,
+                   latency: Optional[int] = None):
+        # recipients=None broadcasts to every other registered agent
+        if not messages:
+            return
+        if recipients is None:
+            recipients = [a for a in self.inboxes if a != sender]
+        else:
+            recipients = list(recipients)
+        delay = self.latency if latency is None else latency
+        if delay < 0:
+            raise ValueError("latency must be >= 0")
+        self.sent += len(messages)
+        self.envelopes += 1
+        self._unsized.append(messages)
+        if delay == 0:
+            self._deliver(recipients, messages)
+        else:
+            heapq.heappush(self._pending, (self.now + delay, next(self._seq), recipients, messages))
+
+    def _deliver(self, recipients: List, messages: List[Dict[str, Any]]):
+        for agent_id in recipients:
+            inbox = self.inboxes[agent_id]
+            overflow = len(inbox) + len(messages) - self.inbox_size
+            if overflow > 0:
+                # Bounded inbox: the oldest messages are dropped first
+                for _ in range(min(overflow, len(inbox))):
+                    inbox.popleft()
+                self.dropped += overflow
+            inbox.extend(messages[-self.inbox_size:])
+            self.delivered += min(len(messages), self.inbox_size)
+
+    def tick(self):
+        # Advance one step and deliver everything that is now due
+        self.now += 1
+        while self._pending and self._pending[0][0] <= self.now:
+            _, _, recipients, messages = heapq.heappop(self._pending)
+            self._deliver(recipients, messages)
+
+    def drain(self, agent_id) -> List[Dict[str, Any]]:
+        inbox = self.inboxes[agent_id]
+        messages = list(inbox)
+        inbox.clear()
+        return messages
+
+    def end_step(self) -> Dict[str, int]:
+        stats = {
+            'step': self.now,
+            'messages_sent': self.sent,
+            'envelopes': self.envelopes,
+            'messages_delivered': self.delivered,
+            'messages_dropped': self.dropped,
+            'bytes_sent': self.bytes_sent if self.count_bytes else None,
+            'in_flight': sum(len(m) for _, _, _, m in self._pending),
+        }
+        self.history.append(stats)
+        self._reset_counters()
+        self.tick()
+        return stats
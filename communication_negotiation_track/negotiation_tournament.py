@@ -0,0 +1,220 @@
+import argparse
+import importlib
+import itertools
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from advanced_communication_negotiation import NegotiatorAgent
+
+# Round-robin tournament of bilateral negotiation strategies. Every ordered
+# pair of strategies plays the same seeded replicates (random holdings and
+# preferences); chunks of replicates run on a process pool and come back as
+# mergeable running statistics, so no transcript is ever kept. Gains are
+# measured with NegotiatorAgent's log utility whatever a strategy optimizes.
+
+basic = importlib.import_module('02_resource_negotiators')
+
+
+class Strategy(ABC):
+    name = 'strategy'
+
+    @abstractmethod
+    def propose(self, me: NegotiatorAgent, partner: NegotiatorAgent) -> Optional[np.ndarray]:
+        # Our change in holdings (+ received, - given), or None to pass
+        ...
+
+    @abstractmethod
+    def accept(self, me: NegotiatorAgent, incoming: np.ndarray) -> bool:
+        # Whether to take `incoming` (our change in holdings if we accept)
+        ...
+
+
+class GreedyStrategy(Strategy):
+    # propose_trade / calculate_utility from 02_resource_negotiators: give the
+    # least preferred resource we hold for the most preferred, judged with
+    # linear utility
+    name = 'greedy'
+
+    def _as_dict(self, me: NegotiatorAgent) -> dict:
+        return {'resources': me.resources, 'preferences': me.preferences}
+
+    def propose(self, me, partner):
+        offer = basic.propose_trade(self._as_dict(me), self._as_dict(partner))
+        if offer is None:
+            return None
+        delta = np.zeros_like(me.counts)
+        delta[me.index[offer['give']]] -= offer['amount']
+        delta[me.index[offer['want']]] += offer['amount']
+        return delta
+
+    def accept(self, me, incoming):
+        new = me.counts + incoming
+        if (new < 0).any():
+            return False
+        agent = self._as_dict(me)
+        return basic.calculate_utility(agent, dict(zip(me.names, new.tolist()))) > basic.calculate_utility(agent)
+
+
+class MarginalStrategy(Strategy):
+    # The 1-for-1 marginal-utility proposer from run_advanced_negotiation
+    name = 'marginal'
+
+    def propose(self, me, partner):
+        offers = me.best_offers(1)
+        if not offers:
+            return None
+        give, get, _ = offers[0]
+        delta = np.zeros_like(me.counts)
+        delta[give] -= 1
+        delta[get] += 1
+        return delta
+
+    def accept(self, me, incoming):
+        return me.bundle_gain(incoming) > 0
+
+
+class BundleStrategy(MarginalStrategy):
+    # Multi-unit Nash-bargaining bundles (NegotiatorAgent.propose_bundle)
+    name = 'bundle'
+
+    def propose(self, me, partner):
+        delta = me.propose_bundle(partner)
+        return delta if delta.any() else None
+
+
+STRATEGIES = {cls.name: cls for cls in (GreedyStrategy, MarginalStrategy, BundleStrategy)}
+
+
+class RunningStats:
+    # Count, mean and sum of squared deviations (Welford); chunks merge with
+    # Chan's parallel update, so aggregation never needs the raw samples
+    __slots__ = ('n', 'mean', 'm2')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x: float):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def merge(self, other: 'RunningStats'):
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        d = other.mean - self.mean
+        self.mean += d * other.n / n
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.n = n
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+
+METRICS = ('gain_a', 'gain_b', 'rounds', 'trades')
+
+
+def negotiate(strategy_a: Strategy, strategy_b: Strategy, seed: int, num_resources: int,
+              max_rounds: int) -> Tuple[float, float, int, int]:
+    # One seeded bilateral negotiation. Proposers alternate from a random
+    # first mover; it ends when both sides have passed or been refused in a
+    # row, or after max_rounds. Returns (gain_a, gain_b, rounds, trades).
+    rng = np.random.default_rng(seed)
+    names = [f'R{i}' for i in range(num_resources)]
+    agents = [NegotiatorAgent(i + 1, dict(zip(names, rng.integers(0, 11, num_resources).tolist())),
+                              dict(zip(names, rng.uniform(1.0, 5.0, num_resources).tolist())), names)
+              for i in range(2)]
+    strategies = (strategy_a, strategy_b)
+    start = [a.utility() for a in agents]
+    turn = int(rng.integers(2))
+    idle = 0
+    trades = 0
+    rounds = 0
+    while rounds < max_rounds and idle < 2:
+        rounds += 1
+        me, partner = agents[turn], agents[1 - turn]
+        delta = strategies[turn].propose(me, partner)
+        if delta is not None and strategies[1 - turn].accept(partner, -delta):
+            me.counts += delta
+            partner.counts -= delta
+            trades += 1
+            idle = 0
+        else:
+            idle += 1
+        turn = 1 - turn
+    return agents[0].utility() - start[0], agents[1].utility() - start[1], rounds, trades
+
+
+def play_chunk(name_a: str, name_b: str, seeds: Sequence[int], num_resources: int,
+               max_rounds: int) -> Tuple[str, str, Dict[str, RunningStats]]:
+    stats = {m: RunningStats() for m in METRICS}
+    strategy_a, strategy_b = STRATEGIES[name_a](), STRATEGIES[name_b]()
+    for seed in seeds:
+        for metric, value in zip(METRICS, negotiate(strategy_a, strategy_b, seed, num_resources, max_rounds)):
+            stats[metric].add(value)
+    return name_a, name_b, stats
+
+
+def run_tournament(names: List[str], replicates: int, num_resources: int = 3, max_rounds: int = 50,
+                   seed: int = 0, chunk: int = 250, max_workers: Optional[int] = None
+                   ) -> Dict[Tuple[str, str], Dict[str, RunningStats]]:
+    # Every ordered pair (including self-play) on the same replicate seeds.
+    # Results are merged as chunks finish.
+    totals = {(a, b): {m: RunningStats() for m in METRICS} for a, b in itertools.product(names, repeat=2)}
+    seeds = range(seed, seed + replicates)
+    jobs = [(a, b, seeds[i:i + chunk]) for a, b in totals for i in range(0, replicates, chunk)]
+    workers = max_workers or os.cpu_count() or 1
+    if workers < 2:
+        results = (play_chunk(a, b, s, num_resources, max_rounds) for a, b, s in jobs)
+        for name_a, name_b, stats in results:
+            for metric in METRICS:
+                totals[(name_a, name_b)][metric].merge(stats[metric])
+        return totals
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, a, b, s, num_resources, max_rounds) for a, b, s in jobs]
+        for future in as_completed(futures):
+            name_a, name_b, stats = future.result()
+            for metric in METRICS:
+                totals[(name_a, name_b)][metric].merge(stats[metric])
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round-robin negotiation strategy tournament")
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument('--replicates', type=int, default=2000)
+    parser.add_argument('--resources', type=int, default=3)
+    parser.add_argument('--max-rounds', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk', type=int, default=250)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    totals = run_tournament(args.strategies, args.replicates, args.resources, args.max_rounds,
+                            args.seed, args.chunk, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{'A':>9} {'B':>9} {'gain_a':>8} {'gain_b':>8} {'rounds':>7} {'trades':>7}")
+    overall = {name: RunningStats() for name in args.strategies}
+    for (a, b), stats in totals.items():
+        overall[a].merge(stats['gain_a'])
+        overall[b].merge(stats['gain_b'])
+        print(f"{a:>9} {b:>9} {stats['gain_a'].mean:>8.3f} {stats['gain_b'].mean:>8.3f} "
+              f"{stats['rounds'].mean:>7.1f} {stats['trades'].mean:>7.1f}")
+    print()
+    for name, stats in sorted(overall.items(), key=lambda item: -item[1].mean):
+        print(f"{name:>9}: mean gain {stats.mean:.3f} +- {stats.std / math.sqrt(max(1, stats.n)):.3f} "
+              f"over {stats.n} negotiations")
+    games = sum(s['rounds'].n for s in totals.values())
+    print(f"\n{games} negotiations in {elapsed:.2f}s")
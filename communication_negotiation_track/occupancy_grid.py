@@ -0,0 +1,102 @@
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+
+# Dense int8 cell codes. Known cells always compare greater than UNKNOWN,
+# so merging two consistent maps is a plain element-wise maximum.
+UNKNOWN = -1
+EMPTY = 0
+TREASURE = 1
+WALL = 2
+
+CELL_CODES = {'.': EMPTY, 'T': TREASURE, '#': WALL}
+CELL_SYMBOLS = {UNKNOWN: '?', EMPTY: '.', TREASURE: 'T', WALL: '#'}
+
+
+def make_world(grid_size: int, obstacles: Iterable[Tuple[int, int]], treasure: Tuple[int, int]) -> np.ndarray:
+    world = np.full((grid_size, grid_size), EMPTY, dtype=np.int8)
+    obstacles = list(obstacles)
+    if obstacles:
+        rows, cols = zip(*obstacles)
+        world[list(rows), list(cols)] = WALL
+    world[treasure] = TREASURE
+    return world
+
+
+class OccupancyGrid:
+    def __init__(self, grid_size: int):
+        self.grid_size = grid_size
+        self.cells = np.full((grid_size, grid_size), UNKNOWN, dtype=np.int8)
+        # Kept in sync with `cells` on every write so planners never rebuild it
+        self._walls = np.zeros((grid_size, grid_size), dtype=bool)
+        self.obstacle_mask = self._walls.view()
+        self.obstacle_mask.flags.writeable = False
+        # Walls discovered since the last take_fresh_walls(), for incremental replanning.
+        # Only tracked once someone asks for them, since it costs a pass per merge.
+        self.fresh_walls: List[Tuple[int, int]] = []
+        self.track_fresh = False
+
+    def window(self, pos: Tuple[int, int], radius: int = 1) -> Tuple[slice, slice]:
+        r, c = pos
+        return (slice(max(r - radius, 0), min(r + radius + 1, self.grid_size)),
+                slice(max(c - radius, 0), min(c + radius + 1, self.grid_size)))
+
+    def sense(self, world: np.ndarray, pos: Tuple[int, int], radius: int = 1) -> Optional[Tuple[int, int]]:
+        # Copy the (2*radius+1)^2 window of ground truth; returns treasure position if seen
+        area = self.window(pos, radius)
+        patch = world[area]
+        if self.track_fresh:
+            self._record_fresh(patch == WALL, self._walls[area], (area[0].start, area[1].start))
+        self.cells[area] = patch
+        np.equal(patch, WALL, out=self._walls[area])
+
+        hits = np.argwhere(patch == TREASURE)
+        if len(hits):
+            return (area[0].start + int(hits[0][0]), area[1].start + int(hits[0][1]))
+        return None
+
+    def merge(self, other: np.ndarray):
+        # Unknown (-1) never wins the maximum, so only known cells are taken
+        if self.track_fresh:
+            self._record_fresh(other == WALL, self._walls, (0, 0))
+        np.maximum(self.cells, other, out=self.cells)
+        np.equal(self.cells, WALL, out=self._walls)
+
+    def apply(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray):
+        # Scatter individual observations, e.g. entries pulled from a KnowledgeLog
+        walls = values == WALL
+        if self.track_fresh:
+            fresh = walls & ~self._walls[rows, cols]
+            if fresh.any():
+                self.fresh_walls.extend(zip(rows[fresh].tolist(), cols[fresh].tolist()))
+        self.cells[rows, cols] = values
+        self._walls[rows, cols] = walls
+
+    def _record_fresh(self, walls: np.ndarray, known_walls: np.ndarray, offset: Tuple[int, int]):
+        fresh = np.argwhere(walls & ~known_walls)
+        if len(fresh):
+            fresh += offset
+            self.fresh_walls.extend(map(tuple, fresh.tolist()))
+
+    def take_fresh_walls(self) -> List[Tuple[int, int]]:
+        self.track_fresh = True
+        fresh, self.fresh_walls = self.fresh_walls, []
+        return fresh
+
+    def is_blocked(self, pos: Tuple[int, int]) -> bool:
+        return bool(self._walls[pos])
+
+    def known_count(self) -> int:
+        return int(np.count_nonzero(self.cells != UNKNOWN))
+
+    def render(self) -> str:
+        # UNKNOWN (-1) indexes the last entry
+        lookup = np.array([CELL_SYMBOLS[code] for code in (EMPTY, TREASURE, WALL, UNKNOWN)])
+        return '\n'.join(''.join(row) for row in lookup[self.cells])
+
+
+def merge_all(grids: Iterable[OccupancyGrid], grid_size: int) -> np.ndarray:
+    # Union of several agents' knowledge without stacking them in memory
+    merged = np.full((grid_size, grid_size), UNKNOWN, dtype=np.int8)
+    for g in grids:
+        np.maximum(merged, g.cells, out=merged)
+    return merged
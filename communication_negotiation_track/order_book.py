@@ -0,0 +1,191 @@
+import heapq
+import itertools
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Smallest order quantity worth posting or filling
+MIN_QTY = 1e-6
+# Rounding dust below zero that settlement may clear to exactly zero
+SETTLE_EPS = 1e-9
+
+Fill = Tuple[int, int, float, float]  # (buyer, seller, base qty, price)
+
+
+class OrderBook:
+    # Limit orders for one good pair. Prices are units of `quote` per unit of
+    # `base`, quantities are in base units. Orders live for one clearing:
+    # a round's orders are loaded in batches (heapified once), clear() matches
+    # them in price-time priority and empties the book.
+    def __init__(self, base: int, quote: int):
+        self.base = base
+        self.quote = quote
+        self._bids: List[Tuple[float, int, int, float]] = []  # (-price, seq, agent, qty)
+        self._asks: List[Tuple[float, int, int, float]] = []  # (price, seq, agent, qty)
+        self._seq = itertools.count()
+
+    def add(self, buy: bool, agent: int, price: float, qty: float):
+        if buy:
+            heapq.heappush(self._bids, (-price, next(self._seq), agent, qty))
+        else:
+            heapq.heappush(self._asks, (price, next(self._seq), agent, qty))
+
+    def add_batch(self, buy: bool, agents, prices, qtys):
+        book = self._bids if buy else self._asks
+        sign = -1.0 if buy else 1.0
+        book.extend(zip((sign * p for p in prices), self._seq, agents, qtys))
+        heapq.heapify(book)
+
+    def __len__(self):
+        return len(self._bids) + len(self._asks)
+
+    def clear(self) -> List[Fill]:
+        # Match while the best bid meets the best ask; each fill trades at the
+        # midpoint of the two limits, so both sides do at least as well as asked
+        bids, asks = self._bids, self._asks
+        fills = []
+        while bids and asks and -bids[0][0] >= asks[0][0]:
+            neg_bid, bid_seq, buyer, bid_qty = bids[0]
+            ask, ask_seq, seller, ask_qty = asks[0]
+            qty = min(bid_qty, ask_qty)
+            fills.append((buyer, seller, qty, (ask - neg_bid) / 2))
+            if bid_qty - qty > MIN_QTY:
+                heapq.heapreplace(bids, (neg_bid, bid_seq, buyer, bid_qty - qty))
+            else:
+                heapq.heappop(bids)
+            if ask_qty - qty > MIN_QTY:
+                heapq.heapreplace(asks, (ask, ask_seq, seller, ask_qty - qty))
+            else:
+                heapq.heappop(asks)
+        bids.clear()
+        asks.clear()
+        return fills
+
+
+class Market:
+    # N agents trading R goods with log utility sum_r w_r * log(x_r + 1),
+    # stored as (N, R) weight and holding arrays. Each round every agent quotes
+    # up to orders_per_agent limit orders derived from its marginal utilities,
+    # the orders are batched into one OrderBook per good pair and cleared, and
+    # reference prices move with the quoted excess demand.
+    def __init__(self, weights: np.ndarray, holdings: np.ndarray, price_step: float = 0.2):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.holdings = np.asarray(holdings, dtype=np.float64).copy()
+        self.num_agents, self.num_goods = self.weights.shape
+        self.prices = np.ones(self.num_goods)
+        self.price_step = price_step
+        self.books: Dict[Tuple[int, int], OrderBook] = {}
+        self.history: List[Dict[str, float]] = []
+
+    def welfare(self) -> float:
+        return float((self.weights * np.log1p(self.holdings)).sum())
+
+    def dispersion(self) -> float:
+        # Mean over goods of the spread (std of log) of marginal utility per
+        # unit price across agents; 0 when every agent agrees with the prices
+        mu = self.weights / (self.holdings + 1)
+        return float(np.log(mu / self.prices).std(axis=0).mean())
+
+    def quote(self, orders_per_agent: int):
+        # Vectorized over agents. Each agent pairs its goods with the lowest
+        # marginal utility per unit price (to give) with those with the highest
+        # (to get). For "give g, get t" its reservation rate is its MRS
+        # mu_g / mu_t (units of t per g), below the reference rate p_g / p_t;
+        # it asks for the geometric mean of the two and offers the quantity
+        # that maximizes its utility at that rate:
+        #   q = (w_t L (x_g + 1) - w_g (x_t + 1)) / (L (w_t + w_g))
+        # Each good is given in at most one order, so orders never overspend.
+        H, W, p = self.holdings, self.weights, self.prices
+        mu = W / (H + 1)
+        k = min(orders_per_agent, self.num_goods // 2)
+        order = np.argsort(mu / p, axis=1)
+        gives = order[:, :k]
+        gets = order[:, ::-1][:, :k]
+        rows = np.arange(self.num_agents)[:, None]
+        mrs = mu[rows, gives] / mu[rows, gets]
+        ref = p[gives] / p[gets]
+        rate = np.sqrt(mrs * ref)
+        w_g, w_t = W[rows, gives], W[rows, gets]
+        qty = (w_t * rate * (H[rows, gives] + 1) - w_g * (H[rows, gets] + 1)) / (rate * (w_t + w_g))
+        qty = np.minimum(qty, H[rows, gives])
+        ok = (mrs < ref) & (qty > MIN_QTY)
+        agents = np.broadcast_to(rows, gives.shape)[ok]
+        return agents, gives[ok], gets[ok], rate[ok], qty[ok]
+
+    def step(self, orders_per_agent: int = 4) -> Dict[str, float]:
+        t0 = time.perf_counter()
+        agents, gives, gets, rate, qty = self.quote(orders_per_agent)
+
+        # Book (a, b) with a < b, priced in b per a. Giving a is an ask for a;
+        # giving b is a bid for a at 1 / rate, for qty * rate units of a.
+        sell_base = gives < gets
+        base = np.where(sell_base, gives, gets)
+        quote = np.where(sell_base, gets, gives)
+        price = np.where(sell_base, rate, 1.0 / rate)
+        base_qty = np.where(sell_base, qty, qty * rate)
+        key = base * self.num_goods + quote
+        order = np.argsort(key, kind='stable')
+        key, sell_base = key[order], sell_base[order]
+        agents, price, base_qty = agents[order], price[order], base_qty[order]
+        starts = np.flatnonzero(np.diff(key, prepend=-1))
+        ends = np.append(starts[1:], len(key))
+        t1 = time.perf_counter()
+
+        buyers, sellers, fill_qty, fill_price, fill_base, fill_quote = [], [], [], [], [], []
+        for s, e in zip(starts.tolist(), ends.tolist()):
+            a, b = divmod(int(key[s]), self.num_goods)
+            book = self.books.get((a, b))
+            if book is None:
+                book = self.books[(a, b)] = OrderBook(a, b)
+            side = sell_base[s:e]
+            for buy in (True, False):
+                mask = ~side if buy else side
+                if mask.any():
+                    book.add_batch(buy, agents[s:e][mask].tolist(), price[s:e][mask].tolist(),
+                                   base_qty[s:e][mask].tolist())
+            fills = book.clear()
+            if fills:
+                buyer, seller, q, px = zip(*fills)
+                buyers.extend(buyer)
+                sellers.extend(seller)
+                fill_qty.extend(q)
+                fill_price.extend(px)
+                fill_base.extend([a] * len(fills))
+                fill_quote.extend([b] * len(fills))
+        t2 = time.perf_counter()
+
+        # Settle every fill at once
+        if buyers:
+            buyers, sellers = np.array(buyers), np.array(sellers)
+            fill_qty, paid = np.array(fill_qty), np.array(fill_qty) * np.array(fill_price)
+            fill_base, fill_quote = np.array(fill_base), np.array(fill_quote)
+            H = self.holdings
+            np.add.at(H, (buyers, fill_base), fill_qty)
+            np.add.at(H, (buyers, fill_quote), -paid)
+            np.add.at(H, (sellers, fill_base), -fill_qty)
+            np.add.at(H, (sellers, fill_quote), paid)
+            # Orders never overspend (see quote), so anything negative beyond
+            # rounding dust is a settlement bug and must not be clamped away
+            H[(H < 0.0) & (H > -SETTLE_EPS)] = 0.0
+            assert (H >= 0.0).all(), "settlement left a negative holding"
+
+        # Tatonnement on the quoted (not filled) excess demand
+        demand = np.bincount(gets, weights=qty * rate, minlength=self.num_goods)
+        supply = np.bincount(gives, weights=qty, minlength=self.num_goods)
+        excess = (demand - supply) / (demand + supply + MIN_QTY)
+        self.prices *= np.exp(self.price_step * excess)
+        self.prices /= np.exp(np.log(self.prices).mean())
+        t3 = time.perf_counter()
+
+        stats = {
+            'orders': int(len(agents)),
+            'fills': int(len(buyers)),
+            'books': int(len(starts)),
+            'quote_ms': (t1 - t0) * 1e3,
+            'match_ms': (t2 - t1) * 1e3,
+            'round_ms': (t3 - t0) * 1e3,
+            'welfare': self.welfare(),
+        }
+        self.history.append(stats)
+        return stats
@@ -0,0 +1,208 @@
+import bisect
+import heapq
+import itertools
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from grid_search import Cell, GridSearch
+
+# Safe Interval Path Planning (Phillips & Likhachev) for prioritized
+# multi-agent planning on 4-connected grids. Instead of one reservation per
+# (time, cell), each cell keeps the sorted, merged intervals during which it
+# is occupied; the gaps between them are its safe intervals. The search
+# state is (cell, safe interval) with the earliest arrival time as cost, so
+# waiting costs nothing to represent and there is no time horizon.
+
+INF = float('inf')
+TimedPath = List[Tuple[int, Cell]]
+ALWAYS_SAFE = [(0, INF)]
+
+
+class ReservationTable:
+    # Occupied intervals per flat cell index (inclusive [lo, hi], hi may be
+    # INF for an agent parked at its goal) and reserved moves: (a, b) -> the
+    # times t at which some agent leaves a for b, arriving at t + 1.
+    def __init__(self):
+        self.occupied: Dict[int, List[List[float]]] = {}
+        self.moves: Dict[Tuple[int, int], Set[int]] = {}
+        self._safe: Dict[int, List[Tuple[float, float]]] = {}
+
+    def reserve_cell(self, cell: int, lo: int, hi: float):
+        spans = self.occupied.setdefault(cell, [])
+        self._safe.pop(cell, None)
+        k = bisect.bisect_left(spans, [lo, -INF])
+        # Merge with touching or overlapping neighbours
+        if k > 0 and spans[k - 1][1] >= lo - 1:
+            k -= 1
+            lo = spans[k][0]
+        end = k
+        while end < len(spans) and spans[end][0] <= hi + 1:
+            hi = max(hi, spans[end][1])
+            end += 1
+        spans[k:end] = [[lo, hi]]
+
+    def reserve_move(self, a: int, b: int, t: int):
+        self.moves.setdefault((a, b), set()).add(t)
+
+    def swap_blocked(self, a: int, b: int, t: int) -> bool:
+        # Leaving a for b at t collides head-on with someone leaving b for a at t
+        times = self.moves.get((b, a))
+        return times is not None and t in times
+
+    def safe_intervals(self, cell: int) -> List[Tuple[float, float]]:
+        # Cached until the cell is next reserved
+        safe = self._safe.get(cell)
+        if safe is not None:
+            return safe
+        spans = self.occupied.get(cell)
+        if not spans:
+            return ALWAYS_SAFE
+        safe = []
+        start = 0
+        for lo, hi in spans:
+            if lo > start:
+                safe.append((start, lo - 1))
+            start = hi + 1
+        if start < INF:
+            safe.append((start, INF))
+        self._safe[cell] = safe
+        return safe
+
+    def reserve_path(self, path: Sequence[Tuple[int, int]], park: bool = True):
+        # path is [(t, flat cell), ...] in unit steps; with park the last cell
+        # stays occupied forever
+        run_start = 0
+        for k, (t, cell) in enumerate(path):
+            last = k == len(path) - 1
+            if last or path[k + 1][1] != cell:
+                hi = INF if last and park else t
+                self.reserve_cell(cell, path[run_start][0], hi)
+                if not last:
+                    self.reserve_move(cell, path[k + 1][1], t)
+                run_start = k + 1
+
+
+class SafeIntervalPlanner:
+    # SIPP over a GridSearch core's padded grid (obstacles come from
+    # core.blocked). plan() finds the earliest-arriving path that avoids the
+    # table's vertex and swap reservations.
+    def __init__(self, core: GridSearch):
+        self.core = core
+        self.expansions = 0
+
+    def plan(self, start: Cell, goal: Cell, table: ReservationTable, park: bool = True,
+             max_expansions: Optional[int] = None) -> TimedPath:
+        # [(t, cell), ...] in unit steps from t=0, or [] if no path. With park
+        # the goal must be safe forever after arrival.
+        core = self.core
+        W, blocked = core.width, core.blocked
+        s, g = core.index(start), core.index(goal)
+        self.expansions = 0
+        if blocked[s] or blocked[g]:
+            return []
+        start_iv = table.safe_intervals(s)[0]
+        if start_iv[0] > 0:
+            return []
+        gr, gc = divmod(g, W)
+        moves = (W, -W, 1, -1)
+
+        # State key (cell, interval start); heap entries (f, -t, seq, t, cell, lo, hi)
+        best: Dict[Tuple[int, float], int] = {(s, 0): 0}
+        parent: Dict[Tuple[int, float], Optional[Tuple[int, float]]] = {(s, 0): None}
+        seq = itertools.count()
+        sr, sc = divmod(s, W)
+        heap = [(abs(sr - gr) + abs(sc - gc), 0, next(seq), 0, s, 0, start_iv[1])]
+        found = None
+        while heap:
+            _, _, _, t, cell, lo, hi = heapq.heappop(heap)
+            key = (cell, lo)
+            if best[key] < t:
+                continue
+            if cell == g and (hi == INF or not park):
+                found = key
+                break
+            self.expansions += 1
+            if max_expansions is not None and self.expansions > max_expansions:
+                break
+            for d in moves:
+                nb = cell + d
+                if blocked[nb]:
+                    continue
+                for nlo, nhi in table.safe_intervals(nb):
+                    if nlo > hi + 1:
+                        break
+                    if nhi < t + 1:
+                        continue
+                    # Wait in cell (safe until hi), then step so we arrive in [nlo, nhi]
+                    arrive = max(t + 1, nlo)
+                    while arrive <= nhi and arrive - 1 <= hi and table.swap_blocked(cell, nb, arrive - 1):
+                        arrive += 1
+                    if arrive > nhi or arrive - 1 > hi:
+                        continue
+                    nkey = (nb, nlo)
+                    if arrive < best.get(nkey, INF):
+                        best[nkey] = arrive
+                        parent[nkey] = key
+                        nr, nc = divmod(nb, W)
+                        h = abs(nr - gr) + abs(nc - gc)
+                        heapq.heappush(heap, (arrive + h, -arrive, next(seq), arrive, nb, nlo, nhi))
+
+        if found is None:
+            return []
+        # Arrival states back to the start, then expand the waits into unit steps
+        states = []
+        key = found
+        while key is not None:
+            states.append((best[key], key[0]))
+            key = parent[key]
+        states.reverse()
+        path = [(0, s)]
+        for arrive, cell in states[1:]:
+            t, prev = path[-1]
+            path.extend((w, prev) for w in range(t + 1, arrive))
+            path.append((arrive, cell))
+        return [(t, core.cell(i)) for t, i in path]
+
+
+def plan_prioritized(core: GridSearch, starts: Sequence[Cell], goals: Sequence[Cell],
+                     max_expansions: Optional[int] = None) -> List[TimedPath]:
+    # Agents plan in list order, each avoiding everyone before it; an agent
+    # with no path gets [] and reserves nothing
+    table = ReservationTable()
+    planner = SafeIntervalPlanner(core)
+    paths = []
+    for start, goal in zip(starts, goals):
+        path = planner.plan(start, goal, table, max_expansions=max_expansions)
+        if path:
+            table.reserve_path([(t, core.index(cell)) for t, cell in path])
+        paths.append(path)
+    return paths
+
+
+def find_conflict(paths: Sequence[TimedPath]) -> Optional[Tuple[str, int, int, int]]:
+    # First vertex or swap conflict between non-empty paths, agents staying at
+    # their last cell forever: (kind, time, agent a, agent b), or None
+    paths = [(k, p) for k, p in enumerate(paths) if p]
+    if not paths:
+        return None
+    end = max(p[-1][0] for _, p in paths)
+
+    def at(p, t):
+        return p[min(t, len(p) - 1)][1]
+
+    for t in range(end + 1):
+        seen = {}
+        for k, p in paths:
+            cell = at(p, t)
+            if cell in seen:
+                return ('vertex', t, seen[cell], k)
+            seen[cell] = k
+        if t == end:
+            break
+        moves = {}
+        for k, p in paths:
+            a, b = at(p, t), at(p, t + 1)
+            if a != b:
+                if (b, a) in moves:
+                    return ('swap', t, moves[(b, a)], k)
+                moves[(a, b)] = k
+    return None
@@ -0,0 +1,146 @@
+import heapq
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from conflict_based_search import goal_distances
+from grid_search import Cell, GridSearch
+
+# Windowed Hierarchical Cooperative A* (Silver 2005) for agents moving in
+# lockstep on a 4-connected grid. Every `replan_every` ticks (or after a
+# tick where a planned move had to be held back) all agents plan `window`
+# steps ahead, one after another in priority order, against a shared
+# space-time reservation table; beyond the window the true distance to the
+# goal stands in for the rest of the route. The table only ever covers one
+# window, so the cost of a tick does not grow with the length of the run.
+
+
+class WindowedPlanner:
+    def __init__(self, core: GridSearch, starts: Sequence[Cell], goals: Sequence[Cell], window: int = 8,
+                 replan_every: int = 4):
+        self.core = core
+        self.window = window
+        self.replan_every = max(1, min(replan_every, window))
+        self.pos = [core.index(c) for c in starts]
+        self.goals = [core.index(c) for c in goals]
+        self.h = [goal_distances(core, g) for g in self.goals]
+        self.order = list(range(len(self.pos)))
+        self.plans: List[List[int]] = [[p] for p in self.pos]
+        self.plan_start = 0
+        self.now = 0
+        self.need_replan = True
+        self.replans = 0
+        self.expansions = 0
+        self.held = 0
+
+    def positions(self) -> List[Cell]:
+        return [self.core.cell(p) for p in self.pos]
+
+    def done(self) -> bool:
+        return self.pos == self.goals
+
+    def _search(self, agent: int, reserved: Dict[int, Dict[int, int]], moves: Dict[int, Set[Tuple[int, int]]]
+                ) -> Optional[List[int]]:
+        # Space-time A* to depth `window`. Every step costs 1 except waiting
+        # on the goal; a state at full depth is scored g + distance to goal.
+        W, blocked = self.core.width, self.core.blocked
+        goal, h, now = self.goals[agent], self.h[agent], self.now
+        start = self.pos[agent]
+        if h[start] < 0:
+            return None
+        parent = {(0, start): None}
+        best = {(0, start): 0}
+        heap = [(h[start], 0, 0, start)]
+        while heap:
+            f, neg_d, g, cell = heapq.heappop(heap)
+            d = -neg_d
+            if g > best[(d, cell)]:
+                continue
+            if d == self.window:
+                path = []
+                key = (d, cell)
+                while key is not None:
+                    path.append(key[1])
+                    key = parent[key]
+                path.reverse()
+                return path
+            self.expansions += 1
+            t = now + d + 1
+            taken = reserved.get(t, {})
+            swaps = moves.get(now + d, ())
+            for nxt in (cell, cell + W, cell - W, cell + 1, cell - 1):
+                if blocked[nxt] or h[nxt] < 0:
+                    continue
+                owner = taken.get(nxt)
+                if owner is not None and owner != agent:
+                    continue
+                if nxt != cell and (nxt, cell) in swaps:
+                    continue
+                ng = g + (0 if cell == goal and nxt == goal else 1)
+                key = (d + 1, nxt)
+                if ng < best.get(key, ng + 1):
+                    best[key] = ng
+                    parent[key] = (d, cell)
+                    heapq.heappush(heap, (ng + h[nxt], -(d + 1), ng, nxt))
+        return None
+
+    def replan(self):
+        # Everyone may at least hold its cell for the next tick; then agents
+        # plan in priority order. An agent that finds no path is moved to the
+        # front and the round is tried once more before it simply waits.
+        self.replans += 1
+        for attempt in range(2):
+            reserved: Dict[int, Dict[int, int]] = {self.now + 1: {p: i for i, p in enumerate(self.pos)}}
+            moves: Dict[int, Set[Tuple[int, int]]] = {}
+            plans: Dict[int, List[int]] = {}
+            failed = None
+            for i in self.order:
+                path = self._search(i, reserved, moves)
+                if path is None:
+                    failed = i
+                    path = [self.pos[i]] * (self.window + 1)
+                plans[i] = path
+                for d in range(1, len(path)):
+                    reserved.setdefault(self.now + d, {})[path[d]] = i
+                    if path[d] != path[d - 1]:
+                        moves.setdefault(self.now + d - 1, set()).add((path[d - 1], path[d]))
+            if failed is None or attempt == 1:
+                break
+            self.order.remove(failed)
+            self.order.insert(0, failed)
+        self.plans = [plans[i] for i in range(len(self.pos))]
+        self.plan_start = self.now
+        self.need_replan = False
+
+    def step(self) -> List[bool]:
+        # Advance one tick; returns which agents moved. Planned moves that
+        # would still collide (an agent that could not plan holds its cell)
+        # are held back, which triggers a replan next tick.
+        if self.need_replan or self.now - self.plan_start >= self.replan_every:
+            self.replan()
+        k = self.now - self.plan_start + 1
+        wanted = {i: plan[min(k, len(plan) - 1)] for i, plan in enumerate(self.plans)}
+        moving = {i: c for i, c in wanted.items() if c != self.pos[i]}
+        rank = {i: r for r, i in enumerate(self.order)}
+        changed = True
+        while changed:
+            changed = False
+            staying = {self.pos[i] for i in range(len(self.pos)) if i not in moving}
+            mover_at = {self.pos[i]: i for i in moving}
+            claimed: Dict[int, int] = {}
+            for i in sorted(moving, key=rank.get):
+                c = moving[i]
+                o = mover_at.get(c)
+                swap = o is not None and moving[o] == self.pos[i]
+                if c in staying or c in claimed or swap:
+                    del moving[i]
+                    changed = True
+                    break
+                claimed[c] = i
+        if len(moving) < sum(1 for i, c in wanted.items() if c != self.pos[i]):
+            self.held += 1
+            self.need_replan = True
+        moved = [False] * len(self.pos)
+        for i, c in moving.items():
+            self.pos[i] = c
+            moved[i] = True
+        self.now += 1
+        return moved